@@ -0,0 +1 @@
+"""Data-layer benchmarks: synthetic scaled databases and timings of src/database.py (python -m BENCHMARKS)"""
@@ -0,0 +1,93 @@
+"""
+Data-layer benchmarks on synthetic SQLite databases
+
+    python -m BENCHMARKS                         # 100, 2 000 and 20 000 farms, compared to baseline.json
+    python -m BENCHMARKS --scales 100,2000 --repeat 10 --only farm
+    python -m BENCHMARKS --scales 100,2000 --update-baseline
+
+Exits with status 1 when a case issues more queries than in the baseline, or
+is slower / allocates more beyond the tolerance (and, for latency, beyond
+the baseline p95). Latencies depend on the machine: refresh the baseline on
+the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from BENCHMARKS.suite import compare, missing_cases, run_scale
+from BENCHMARKS.synthetic import GENERATOR_VERSION, cached_database
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark src/database.py on synthetic SQLite databases")
+    parser.add_argument("--scales", default="100,2000,20000", help="farm counts, comma separated")
+    parser.add_argument("--years", type=int, default=30, help="years of performances per farm")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per case and mode")
+    parser.add_argument("--only", default=None, help="run the cases whose name contains this text")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="tolerated p50/memory growth (1.0 = x2)")
+    options = parser.parse_args(argv)
+
+    for name in missing_cases():
+        print(f"warning: no benchmark case for database.{name}", file=sys.stderr)
+
+    from src import database
+    # Benchmark the queries, not the slow-query log writing them out
+    database._slow_queries._threshold_ms = 0
+
+    results = {
+        'meta': {
+            'time': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'machine': platform.machine(),
+            'years': options.years,
+            'seed': options.seed,
+            'repeat': options.repeat,
+            'generator': GENERATOR_VERSION
+        },
+        'results': {}
+    }
+    only = (lambda name: options.only in name) if options.only else None
+    with tempfile.TemporaryDirectory() as work_dir:
+        for farms in (int(scale) for scale in options.scales.split(",")):
+            source = cached_database(farms, options.years, options.seed)
+            results['results'][str(farms)] = run_scale(
+                source, farms, options.repeat, os.path.join(work_dir, f"bench_{farms}.db"), only, print
+            )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if options.update_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"Baseline written to {options.baseline}")
+        return 0
+
+    if not os.path.exists(options.baseline):
+        print(f"No baseline at {options.baseline}: run with --update-baseline to create it")
+        return 0
+    with open(options.baseline, encoding="utf-8") as baseline_file:
+        regressions = compare(json.load(baseline_file), results, options.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {options.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
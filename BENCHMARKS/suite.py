@@ -0,0 +1,333 @@
+"""Benchmark cases for every public function of src/database.py, their runner and the baseline comparison
+
+Each case is timed in two modes:
+
+- cold: the facade caches (reference tables, per-farm sections, schema
+  catalogue, table statistics) and the backend memos (column lists, unique
+  keys) are emptied before every call, as after an app start;
+- warm: the caches are primed by an untimed call, as for a user clicking
+  around an already loaded farm.
+
+For each mode the runner records p50/p95 latency, the database round trips of
+one call (see src/data/query_budget.py) and its peak Python allocation
+(tracemalloc).
+"""
+
+import asyncio
+import gc
+import inspect
+import itertools
+import shutil
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from BENCHMARKS.synthetic import farm_code, farm_uuid
+from src import database
+from src.data import sqlite_db
+from src.data.query_budget import track_queries
+
+MODES = ("cold", "warm")
+
+
+@dataclass
+class Case:
+    """
+    Un cas de benchmark
+
+    prepare(ctx) s'exécute hors chronométrage (lignes à supprimer, identifiants
+    uniques...) et retourne la fonction sans argument à chronométrer.
+    """
+    name: str
+    prepare: Callable[["Context"], Callable[[], Any]]
+
+
+class Context:
+    """Données partagées par les cas : farms échantillonnés, compteur d'identifiants, boucle asyncio"""
+
+    def __init__(self, farms: int):
+        self.farms = farms
+        self.uuid = farm_uuid(farms // 2)
+        self.code = farm_code(farms // 2)
+        self.batch = [farm_uuid(i) for i in range(0, farms, max(1, farms // 100))][:100]
+        self._ids = itertools.count()
+        self.loop = asyncio.new_event_loop()
+
+    def new_id(self, prefix: str) -> str:
+        """Identifiant unique pour les lignes écrites par les cas"""
+        return f"{prefix}-bench-{next(self._ids):08d}"
+
+    def run(self, coroutine: Any) -> Any:
+        """Exécute une coroutine de la façade async sur la boucle du contexte"""
+        return self.loop.run_until_complete(coroutine)
+
+
+def _person(ctx: Context) -> dict:
+    return {"uuid": ctx.new_id("person"), "first_name": "Bench", "last_name": "Person"}
+
+
+def _location(ctx: Context, uuid: str) -> dict:
+    return {"farm_uuid": uuid, "farm_code": "", "country": "France", "region": "Bretagne", "department": "29",
+            "municipality": "Brest", "map_reference": "B1", "arras_round_trip_distance_km": 1200.0}
+
+
+def _inserted_person(ctx: Context) -> dict:
+    """Insère (hors chronométrage) une personne que le cas supprimera"""
+    person = _person(ctx)
+    database.insert_record("persons", person)
+    return person
+
+
+def _transaction(ctx: Context) -> None:
+    filters = {"farm_uuid": ctx.uuid, "person_role_id": 1}
+    with database.transaction() as tx:
+        if tx.execute_query("farm_referents", columns="person_uuid", filters=filters):
+            tx.update_record("farm_referents", filters, {"person_uuid": "person-000000"})
+
+
+CASES: List[Case] = [
+    # Generic reads
+    Case("execute_rpc", lambda ctx: lambda: database.execute_rpc("get_table_stats")),
+    Case("get_table_stats", lambda ctx: lambda: database.get_table_stats()),
+    Case("get_table_stats[exact]", lambda ctx: lambda: database.get_table_stats(exact=True)),
+    Case("execute_query", lambda ctx: lambda: database.execute_query("farms", filters={"code": ctx.code})),
+    Case("execute_query[performances]", lambda ctx: lambda: database.execute_query(
+        "farm_actual_performances", filters={"farm_uuid": ctx.uuid}, order_by="year")),
+    Case("iter_query", lambda ctx: lambda: sum(1 for _ in database.iter_query(
+        "farm_actual_performances", filters={"farm_uuid": ctx.batch}))),
+    Case("query_frame", lambda ctx: lambda: database.query_frame(
+        "farm_actual_performances", filters={"farm_uuid": ctx.batch})),
+    Case("execute_keyset_page", lambda ctx: lambda: database.execute_keyset_page("farms", "uuid", after=ctx.uuid)),
+    # Farm pages
+    Case("get_all_farms", lambda ctx: database.get_all_farms),
+    Case("get_farm_by_code", lambda ctx: lambda: database.get_farm_by_code(ctx.code)),
+    Case("get_all_farm_data", lambda ctx: lambda: database.get_all_farm_data(ctx.uuid, view="farm_page")),
+    Case("get_farm_general_info", lambda ctx: lambda: database.get_farm_general_info(ctx.uuid)),
+    Case("get_farm_technical_details", lambda ctx: lambda: database.get_farm_technical_details(ctx.uuid)),
+    Case("get_farms_technical_details", lambda ctx: lambda: database.get_farms_technical_details(ctx.batch)),
+    Case("get_farm_contracts_admin", lambda ctx: lambda: database.get_farm_contracts_admin(ctx.uuid)),
+    Case("get_farm_performance_data", lambda ctx: lambda: database.get_farm_performance_data(ctx.uuid)),
+    Case("get_farms_actual_performances", lambda ctx: lambda: database.get_farms_actual_performances(
+        ctx.batch, 2005, 2015)),
+    Case("get_expiring_om_contracts", lambda ctx: lambda: database.get_expiring_om_contracts(
+        "2027-12-31", "2027-01-01")),
+    # Roles and reference tables
+    Case("get_farm_referents", lambda ctx: lambda: database.get_farm_referents(ctx.uuid)),
+    Case("get_farms_referents", lambda ctx: lambda: database.get_farms_referents(ctx.batch)),
+    Case("get_farm_companies", lambda ctx: lambda: database.get_farm_companies(ctx.uuid)),
+    Case("get_farms_companies", lambda ctx: lambda: database.get_farms_companies(ctx.batch)),
+    Case("get_reference_rows", lambda ctx: lambda: database.get_reference_rows("person_roles")),
+    Case("get_reference_by_id", lambda ctx: lambda: database.get_reference_by_id("company_roles", 5)),
+    Case("get_reference_by_name", lambda ctx: lambda: database.get_reference_by_name("farm_types", "Wind")),
+    # Writes
+    Case("update_record", lambda ctx: lambda: database.update_record(
+        "farms", {"uuid": ctx.uuid}, {"spv": "SPV bench"})),
+    Case("insert_record", lambda ctx: (lambda person: lambda: database.insert_record("persons", person))(
+        _person(ctx))),
+    Case("insert_many", lambda ctx: (lambda rows: lambda: database.insert_many("persons", rows))(
+        [_person(ctx) for _ in range(100)])),
+    Case("upsert", lambda ctx: lambda: database.upsert(
+        "farm_locations", [_location(ctx, uuid) for uuid in ctx.batch], on_conflict="farm_uuid")),
+    Case("upsert_one", lambda ctx: lambda: database.upsert_one("farm_locations", "farm_uuid",
+                                                               _location(ctx, ctx.uuid))),
+    Case("delete_record", lambda ctx: (lambda person: lambda: database.delete_record(
+        "persons", {"uuid": person['uuid']}))(_inserted_person(ctx))),
+    Case("transaction", lambda ctx: lambda: _transaction(ctx)),
+    # In-process counters
+    Case("get_query_metrics", lambda ctx: database.get_query_metrics),
+    Case("render_query_metrics", lambda ctx: database.render_query_metrics),
+    Case("get_farm_cache_stats", lambda ctx: database.get_farm_cache_stats),
+    # Async facade
+    Case("aexecute_rpc", lambda ctx: lambda: ctx.run(database.aexecute_rpc("get_table_stats"))),
+    Case("aexecute_query", lambda ctx: lambda: ctx.run(database.aexecute_query("farms", filters={"code": ctx.code}))),
+    Case("aget_all_farms", lambda ctx: lambda: ctx.run(database.aget_all_farms())),
+    Case("aget_farm_by_code", lambda ctx: lambda: ctx.run(database.aget_farm_by_code(ctx.code))),
+    Case("aget_all_farm_data", lambda ctx: lambda: ctx.run(database.aget_all_farm_data(ctx.uuid, view="farm_page"))),
+    Case("aget_farm_general_info", lambda ctx: lambda: ctx.run(database.aget_farm_general_info(ctx.uuid))),
+    Case("aget_farm_technical_details", lambda ctx: lambda: ctx.run(database.aget_farm_technical_details(ctx.uuid))),
+    Case("aget_farm_contracts_admin", lambda ctx: lambda: ctx.run(database.aget_farm_contracts_admin(ctx.uuid))),
+    Case("aget_farm_performance_data", lambda ctx: lambda: ctx.run(database.aget_farm_performance_data(ctx.uuid))),
+    Case("aget_farm_referents", lambda ctx: lambda: ctx.run(database.aget_farm_referents(ctx.uuid))),
+    Case("aget_farm_companies", lambda ctx: lambda: ctx.run(database.aget_farm_companies(ctx.uuid))),
+    Case("aupdate_record", lambda ctx: lambda: ctx.run(database.aupdate_record(
+        "farms", {"uuid": ctx.uuid}, {"spv": "SPV bench"}))),
+    Case("ainsert_record", lambda ctx: (lambda person: lambda: ctx.run(database.ainsert_record("persons", person)))(
+        _person(ctx))),
+    Case("adelete_record", lambda ctx: (lambda person: lambda: ctx.run(database.adelete_record(
+        "persons", {"uuid": person['uuid']})))(_inserted_person(ctx))),
+]
+
+
+def public_functions() -> List[str]:
+    """Fonctions publiques définies dans src/database.py"""
+    return sorted(
+        name for name, member in inspect.getmembers(database, inspect.isfunction)
+        if not name.startswith("_") and member.__module__ == database.__name__
+    )
+
+
+def missing_cases() -> List[str]:
+    """Fonctions publiques de la façade sans cas de benchmark"""
+    covered = {case.name.split("[")[0] for case in CASES}
+    return [name for name in public_functions() if name not in covered]
+
+
+def reset_caches() -> None:
+    """Vide les caches de la façade et les mémos du backend SQLite (démarrage à froid)"""
+    database._reference_cache.invalidate()
+    database._farm_cache.clear()
+    database._schema_catalog.invalidate()
+    database._table_stats.clear()
+    sqlite_db._table_columns.clear()
+    sqlite_db._unique_keys.clear()
+
+
+def use_database(path: str) -> None:
+    """Branche le backend SQLite sur une base (engines du profil, hooks de suivi des requêtes compris)"""
+    close_database()
+    sqlite_db._engine = sqlite_db._create_tuned_engine(path)
+    sqlite_db._read_engine = sqlite_db._create_tuned_engine(path, read_only=True)
+    reset_caches()
+
+
+def close_database() -> None:
+    """Ferme les engines du backend SQLite"""
+    for name in ("_engine", "_read_engine"):
+        engine = getattr(sqlite_db, name)
+        if engine is not None:
+            engine.dispose()
+            setattr(sqlite_db, name, None)
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    """Percentile (plus proche rang) d'une liste de durées"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(case: Case, ctx: Context, mode: str, repeat: int) -> dict:
+    """
+    Chronomètre un cas dans un mode
+
+    Returns:
+        {p50_ms, p95_ms, runs, queries, peak_kib}
+    """
+    durations = []
+    queries = 0
+    gc.collect()
+    for _ in range(repeat):
+        call = case.prepare(ctx)
+        if mode == "cold":
+            reset_caches()
+        else:
+            call()
+            call = case.prepare(ctx)
+        # Like timeit: no collection of earlier garbage inside the timed call
+        gc.disable()
+        try:
+            with track_queries(case.name) as tracker:
+                started = time.perf_counter()
+                call()
+                durations.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+        queries = max(queries, tracker.count)
+
+    call = case.prepare(ctx)
+    if mode == "cold":
+        reset_caches()
+    else:
+        call()
+        call = case.prepare(ctx)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(_percentile(durations, 0.95), 3),
+        'runs': repeat,
+        'queries': queries,
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+
+def run_scale(source: str, farms: int, repeat: int, work_path: str,
+              only: Optional[Callable[[str], bool]] = None,
+              progress: Optional[Callable[[str], None]] = None) -> Dict[str, Dict[str, dict]]:
+    """
+    Chronomètre tous les cas sur une copie de la base d'une échelle
+
+    Args:
+        source: Base synthétique (laissée intacte : les cas d'écriture travaillent sur une copie)
+        farms: Nombre de farms de la base
+        repeat: Appels chronométrés par cas et par mode
+        work_path: Copie de travail
+        only: Filtre sur les noms de cas
+        progress: Fonction recevant une ligne par cas mesuré
+
+    Returns:
+        Dict {cas: {mode: mesures}}
+    """
+    shutil.copyfile(source, work_path)
+    use_database(work_path)
+    ctx = Context(farms)
+    results: Dict[str, Dict[str, dict]] = {}
+    try:
+        for case in CASES:
+            if only and not only(case.name):
+                continue
+            results[case.name] = {mode: measure(case, ctx, mode, repeat) for mode in MODES}
+            if progress:
+                cold, warm = results[case.name]['cold'], results[case.name]['warm']
+                progress(f"{farms:>7} farms  {case.name:<32} cold p50 {cold['p50_ms']:>9.3f} ms "
+                         f"({cold['queries']} q)  warm p50 {warm['p50_ms']:>9.3f} ms ({warm['queries']} q)")
+    finally:
+        ctx.loop.close()
+        close_database()
+    return results
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 1.0, min_delta_ms: float = 1.0,
+            min_delta_kib: float = 256.0) -> List[str]:
+    """
+    Régressions de current par rapport à baseline
+
+    Un nombre de requêtes supérieur est toujours une régression ; une latence
+    médiane (p50, moins sensible au bruit que p95) l'est au-delà de
+    (1 + tolerance) fois la référence, de son p95 et d'un écart absolu minimal,
+    un pic mémoire au-delà de (1 + tolerance) fois la référence et d'un écart
+    absolu minimal. Les cas absents de la référence sont ignorés.
+
+    Args:
+        baseline: Résultats de référence {"results": {échelle: {cas: {mode: mesures}}}}
+        current: Résultats à contrôler, même format
+        tolerance: Dégradation relative tolérée (1.0 : deux fois la référence)
+        min_delta_ms: Écart de latence absolu ignoré
+        min_delta_kib: Écart de mémoire absolu ignoré
+
+    Returns:
+        Une ligne par régression
+    """
+    regressions = []
+    for scale, cases in current.get('results', {}).items():
+        for name, modes in cases.items():
+            for mode, now in modes.items():
+                before = baseline.get('results', {}).get(scale, {}).get(name, {}).get(mode)
+                if before is None:
+                    continue
+                label = f"{scale} farms {name} ({mode})"
+                if now['queries'] > before['queries']:
+                    regressions.append(f"{label}: {before['queries']} -> {now['queries']} queries")
+                if (now['p50_ms'] > max(before['p50_ms'] * (1 + tolerance), before['p95_ms'])
+                        and now['p50_ms'] - before['p50_ms'] > min_delta_ms):
+                    regressions.append(f"{label}: p50 {before['p50_ms']} -> {now['p50_ms']} ms")
+                if (now['peak_kib'] > before['peak_kib'] * (1 + tolerance)
+                        and now['peak_kib'] - before['peak_kib'] > min_delta_kib):
+                    regressions.append(f"{label}: peak {before['peak_kib']} -> {now['peak_kib']} KiB")
+    return regressions
@@ -0,0 +1,152 @@
+"""Synthetic windmanager databases at a chosen scale, for the data-layer benchmarks
+
+The schema is the mirror shared with the tests (src/data/schema.py); the rows are
+generated deterministically from a seed: every farm gets its 1:1 rows, turbines,
+substations, ice detection systems, referents, companies, `years` years of
+actual and target performances and a tariff per decade. The SQLite migrations
+(lookup indexes, ANALYZE) are applied like on an app start.
+"""
+
+import os
+import random
+import sqlite3
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+
+from src.data.migrations import migrate
+from src.data.schema import MIRROR_SCHEMA
+
+# Bump when the generated rows change, so cached databases are rebuilt
+GENERATOR_VERSION = 1
+
+PERSON_ROLES = [
+    "Technical Manager", "Key Account Manager", "Head of Technical Management",
+    "Electrical Manager", "Field Crew Manager", "Asset Manager"
+]
+COMPANY_ROLES = [
+    "OM Main Service Company", "OM Service Provider", "WTG Service Provider", "Substation Service Provider",
+    "Grid Operator", "Energy Trader", "Asset Manager", "Project Developer", "Legal Representative",
+    "Chartered Accountant", "Legal Auditor", "Bank Domiciliation", "Customer", "Co-developer", "Portfolio"
+]
+REGIONS = ["Hauts-de-France", "Grand Est", "Occitanie", "Bretagne", "Normandie", "Centre-Val de Loire"]
+FIRST_YEAR = 1995
+
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+
+def farm_uuid(index: int) -> str:
+    """UUID synthétique du farm n° index"""
+    return f"farm-{index:06d}"
+
+
+def farm_code(index: int) -> str:
+    """Code synthétique du farm n° index"""
+    return f"F{index:05d}"
+
+
+def _rows(farms: int, years: int, rng: random.Random) -> Dict[str, List[tuple]]:
+    """Lignes de chaque table, dans l'ordre des colonnes du schéma"""
+    persons = max(50, farms // 4)
+    companies = max(30, farms // 10)
+    rows: Dict[str, List[tuple]] = {
+        "farm_types": [(1, "Wind"), (2, "Solar")],
+        "person_roles": [(i + 1, name) for i, name in enumerate(PERSON_ROLES)],
+        "company_roles": [(i + 1, name) for i, name in enumerate(COMPANY_ROLES)],
+        "persons": [(f"person-{i:06d}", f"First{i}", f"Last{i}") for i in range(persons)],
+        "companies": [(f"company-{i:06d}", f"Company {i}") for i in range(companies)],
+        "ice_detection_systems": [(f"ice-{i:02d}", f"Ice system {i}") for i in range(10)],
+    }
+    for table in ("farms", "farm_statuses", "farm_locations", "farm_turbine_details", "substations",
+                  "wind_turbine_generators", "farm_ice_detection_systems", "farm_administrations",
+                  "farm_om_contracts", "farm_tcma_contracts", "farm_electrical_delegations",
+                  "farm_environmental_installations", "farm_financial_guarantees", "farm_substation_details",
+                  "farm_actual_performances", "farm_target_performances", "farm_tariffs",
+                  "farm_referents", "farm_company_roles"):
+        rows[table] = []
+
+    for i in range(farms):
+        uuid, code = farm_uuid(i), farm_code(i)
+        turbines = rng.randint(2, 12)
+        rows["farms"].append((uuid, code, f"Project {i}", f"SPV {i}", rng.choice((1, 2, None))))
+        rows["farm_statuses"].append((uuid, code, rng.choice(("Operational", "Construction", "Dismantled"))))
+        rows["farm_locations"].append((uuid, code, "France", rng.choice(REGIONS), f"Department {i % 95}",
+                                       f"Municipality {i}", f"M{i}", round(rng.uniform(10, 900), 1)))
+        rows["farm_turbine_details"].append((uuid, code, turbines))
+        rows["substations"] += [(f"sub-{i:06d}-{n}", uuid, f"Substation {n}") for n in range(rng.randint(1, 2))]
+        rows["wind_turbine_generators"] += [(f"wtg-{i:06d}-{n:02d}", uuid, f"T{n + 1}") for n in range(turbines)]
+        rows["farm_ice_detection_systems"] += [(uuid, f"ice-{n:02d}") for n in rng.sample(range(10), rng.randint(0, 2))]
+        rows["farm_administrations"].append((uuid, code, f"ACC-{i}", f"{rng.randrange(10 ** 13):014d}", f"FR{i}"))
+        rows["farm_om_contracts"].append((uuid, code, rng.choice(("Full service", "Basic")),
+                                          f"{rng.randint(2025, 2040)}-{rng.randint(1, 12):02d}-28"))
+        rows["farm_tcma_contracts"].append((uuid, code, rng.choice(("Active", "Expired"))))
+        rows["farm_electrical_delegations"].append((uuid, code, f"DT-{i}"))
+        rows["farm_environmental_installations"].append((uuid, code, f"AIP-{i}"))
+        rows["farm_financial_guarantees"].append((uuid, code, round(rng.uniform(1e4, 1e6), 2)))
+        rows["farm_substation_details"].append((uuid, code, rng.choice(("Indoor", "Outdoor"))))
+        for year in range(FIRST_YEAR, FIRST_YEAR + years):
+            target = round(turbines * rng.uniform(4000, 6000), 1)
+            rows["farm_target_performances"].append((uuid, code, year, target))
+            rows["farm_actual_performances"].append((uuid, code, year, round(target * rng.uniform(0.8, 1.1), 1)))
+        rows["farm_tariffs"] += [(uuid, code, f"{year}-01-01", round(rng.uniform(60, 95), 2))
+                                 for year in range(FIRST_YEAR, FIRST_YEAR + years, 10)]
+        rows["farm_referents"] += [
+            (uuid, code, role_id, f"person-{rng.randrange(persons):06d}" if rng.random() > 0.1 else None)
+            for role_id in range(1, len(PERSON_ROLES) + 1)
+        ]
+        rows["farm_company_roles"] += [
+            (uuid, code, role_id, f"company-{rng.randrange(companies):06d}")
+            for role_id in rng.sample(range(1, len(COMPANY_ROLES) + 1), 6)
+        ]
+    return rows
+
+
+def generate_database(path: str, farms: int, years: int = 30, seed: int = 0) -> str:
+    """
+    Crée une base SQLite synthétique
+
+    Args:
+        path: Fichier à créer (remplacé s'il existe)
+        farms: Nombre de farms
+        years: Années de performances par farm
+        seed: Graine du générateur (même graine, mêmes lignes)
+
+    Returns:
+        Le chemin de la base
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            for statement in MIRROR_SCHEMA:
+                conn.execute(statement)
+            for table, table_rows in _rows(farms, years, random.Random(seed)).items():
+                if table_rows:
+                    placeholders = ", ".join("?" * len(table_rows[0]))
+                    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", table_rows)
+    finally:
+        conn.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        migrate(engine)
+    finally:
+        engine.dispose()
+    return path
+
+
+def cached_database(farms: int, years: int = 30, seed: int = 0, cache_dir: Optional[str] = None) -> str:
+    """
+    Base synthétique de cette échelle, générée au premier usage puis réutilisée
+
+    Returns:
+        Le chemin de la base en cache (à copier avant d'y écrire)
+    """
+    cache_dir = cache_dir or _CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"farms_{farms}_years_{years}_seed_{seed}_v{GENERATOR_VERSION}.db")
+    if not os.path.exists(path):
+        generate_database(path + ".tmp", farms, years, seed)
+        os.replace(path + ".tmp", path)
+    return path
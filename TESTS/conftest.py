@@ -0,0 +1,66 @@
+"""
+Shared fixtures: a small, self-contained SQLite database on the mirrored
+windmanager schema (src/data/schema.py), so the data layer can be tested
+without DATA/windmanager.db.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.data.schema import MIRROR_SCHEMA
+
+DATA = [
+    "INSERT INTO farm_types VALUES (1, 'Wind'), (2, 'Solar')",
+    "INSERT INTO farms VALUES ('farm-1', 'F001', 'Alpha', 'SPV Alpha', 1),"
+    " ('farm-2', 'F002', 'Beta', 'SPV Beta', NULL)",
+    "INSERT INTO farm_statuses VALUES ('farm-1', 'F001', 'Operational')",
+    "INSERT INTO farm_locations VALUES ('farm-1', 'F001', 'France', 'Hauts-de-France', 'Pas-de-Calais',"
+    " 'Arras', 'A1', 42.5)",
+    "INSERT INTO farm_turbine_details VALUES ('farm-1', 'F001', 4)",
+    "INSERT INTO substations VALUES ('sub-1', 'farm-1', 'Sub A')",
+    "INSERT INTO wind_turbine_generators VALUES ('wtg-1', 'farm-1', 'T1'), ('wtg-2', 'farm-1', 'T2')",
+    "INSERT INTO ice_detection_systems VALUES ('ice-1', 'Labkotec'), ('ice-2', 'Fos4X')",
+    "INSERT INTO farm_ice_detection_systems VALUES ('farm-1', 'ice-1'), ('farm-1', 'ice-2'), ('farm-2', 'ice-2')",
+    "INSERT INTO farm_administrations VALUES ('farm-1', 'F001', 'ACC-1', '123', 'FR1')",
+    "INSERT INTO farm_om_contracts VALUES ('farm-1', 'F001', 'Full service', '2030-12-31')",
+    "INSERT INTO farm_actual_performances VALUES ('farm-1', 'F001', 2021, 9.5), ('farm-1', 'F001', 2020, 10.0)",
+    "INSERT INTO farm_target_performances VALUES ('farm-1', 'F001', 2020, 11.0)",
+    "INSERT INTO farm_tariffs VALUES ('farm-1', 'F001', '2025-01-01', 82.0), ('farm-1', 'F001', '2015-01-01', 78.0)",
+    "INSERT INTO person_roles VALUES (1, 'Technical Manager'), (2, 'Key Account Manager'), (3, 'Asset Manager')",
+    "INSERT INTO persons VALUES ('p-1', 'Jane', 'Doe'), ('p-2', 'John', 'Smith')",
+    "INSERT INTO farm_referents VALUES ('farm-1', 'F001', 1, 'p-1'), ('farm-1', 'F001', 2, 'p-2'),"
+    " ('farm-1', 'F001', 3, NULL), ('farm-2', 'F002', 1, 'p-2')",
+    "INSERT INTO company_roles VALUES (1, 'Grid Operator'), (2, 'Energy Trader')",
+    "INSERT INTO companies VALUES ('c-1', 'Enedis'), ('c-2', 'Trader SA')",
+    "INSERT INTO farm_company_roles VALUES ('farm-1', 'F001', 1, 'c-1'), ('farm-1', 'F001', 2, 'c-2'),"
+    " ('farm-2', 'F002', 1, 'c-1')",
+]
+
+
+@pytest.fixture
+def sqlite_test_db(tmp_path, monkeypatch):
+    """Point the SQLite backend at a freshly seeded temporary database."""
+    from src import database
+    from src.data import sqlite_db
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'windmanager_test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    with engine.begin() as conn:
+        for statement in MIRROR_SCHEMA + DATA:
+            conn.execute(text(statement))
+
+    monkeypatch.setattr(sqlite_db, "_engine", engine)
+    monkeypatch.setattr(sqlite_db, "_table_columns", {})
+    monkeypatch.setattr(sqlite_db, "_unique_keys", {})
+    database._reference_cache.invalidate()
+    database._farm_cache.clear()
+    database._schema_catalog.invalidate()
+    database._table_stats.clear()
+    yield engine
+    database._reference_cache.invalidate()
+    database._farm_cache.clear()
+    database._schema_catalog.invalidate()
+    database._table_stats.clear()
+    engine.dispose()
@@ -0,0 +1,133 @@
+"""Tests for the asyncio facade on top of the thread-offloaded SQLite backend."""
+
+import asyncio
+
+
+class TestAsyncFacade:
+    """Async functions return the same data as their sync counterparts."""
+
+    def test_query_and_farm_lookup(self, sqlite_test_db):
+        """aexecute_query / aget_farm_by_code mirror the sync facade."""
+        from src.database import aexecute_query, aget_all_farms, aget_farm_by_code, execute_query
+        assert asyncio.run(aexecute_query("farms", order_by="code")) == execute_query("farms", order_by="code")
+        assert [farm['code'] for farm in asyncio.run(aget_all_farms())] == ['F001', 'F002']
+        assert asyncio.run(aget_farm_by_code("F002"))['uuid'] == 'farm-2'
+        assert asyncio.run(aget_farm_by_code("F999")) is None
+
+    def test_all_farm_data_matches_sync(self, sqlite_test_db):
+        """The bundled async load equals the sync one."""
+        from src import database
+        async_data = asyncio.run(database.aget_all_farm_data("farm-1"))
+        database._farm_cache.clear()
+        assert async_data == database.get_all_farm_data("farm-1")
+
+    def test_section_fallback_gathers_reads(self, sqlite_test_db, monkeypatch):
+        """Without a bundle, the four sections are loaded with gathered reads."""
+        from src import database
+
+        async def no_bundle(farm_uuid, columns=None):
+            return None
+
+        monkeypatch.setattr(database.adb, "get_farm_bundle", no_bundle)
+        async_data = asyncio.run(database.aget_all_farm_data("farm-1"))
+        database._farm_cache.clear()
+        sync_data = database.get_all_farm_data("farm-1")
+        assert async_data == sync_data
+        assert [system['name'] for system in async_data['technical_details']['ice_systems']] == ['Labkotec', 'Fos4X']
+
+    def test_write_invalidates_cache(self, sqlite_test_db):
+        """Async writes share the sync cache invalidation."""
+        from src.database import aget_farm_contracts_admin, aupdate_record
+        before = asyncio.run(aget_farm_contracts_admin("farm-1"))
+        assert before['administrations']['account_number'] == 'ACC-1'
+        assert asyncio.run(aupdate_record(
+            "farm_administrations", {"farm_uuid": "farm-1"}, {"account_number": "ACC-2"}
+        ))
+        after = asyncio.run(aget_farm_contracts_admin("farm-1"))
+        assert after['administrations']['account_number'] == 'ACC-2'
+
+    def test_referents(self, sqlite_test_db):
+        """Role resolution goes through the async backend."""
+        from src.database import aget_farm_companies, aget_farm_referents
+        referents = asyncio.run(aget_farm_referents("farm-1"))
+        assert referents['Technical Manager']['last_name'] == 'Doe'
+        assert referents['Asset Manager'] == {}
+        assert asyncio.run(aget_farm_companies("farm-2")) == {'Grid Operator': {'uuid': 'c-1', 'name': 'Enedis'}}
+
+
+class TestAsyncSupabaseClient:
+    """The async Supabase client is bound to the event loop that created it."""
+
+    def test_one_client_per_loop(self, monkeypatch):
+        """Each asyncio.run gets its own client; a loop reuses its client."""
+        from types import SimpleNamespace
+
+        from src.data import async_supabase_db
+
+        created = []
+
+        async def fake_create_client(url, key):
+            client = SimpleNamespace(postgrest=SimpleNamespace(
+                session=SimpleNamespace(event_hooks={'request': [], 'response': []})
+            ))
+            created.append(client)
+            return client
+
+        monkeypatch.setattr(async_supabase_db, "acreate_client", fake_create_client)
+        monkeypatch.setattr(async_supabase_db, "get_supabase_credentials", lambda: ("http://localhost", "key"))
+
+        async def connect_twice():
+            first = await async_supabase_db.init_supabase_connection()
+            assert await async_supabase_db.init_supabase_connection() is first
+            return first
+
+        first = asyncio.run(connect_twice())
+        second = asyncio.run(connect_twice())
+        assert first is not second
+        assert created == [first, second]
+
+    def test_long_in_lists_are_split(self, monkeypatch):
+        """A long IN list is read in batches of db_in_batch_size values, merged in query order."""
+        from types import SimpleNamespace
+
+        from config import settings
+        from src.data import async_supabase_db, supabase_db
+
+        rows = [{"id": index} for index in range(30)]
+        in_lists = []
+
+        class Select:
+            def __init__(self):
+                self.rows, self.order_by, self.bounds = rows, [], (0, 999)
+
+            def in_(self, column, values):
+                in_lists.append(len(values))
+                self.rows = [row for row in self.rows if row[column] in values]
+                return self
+
+            def order(self, column):
+                self.order_by.append(column)
+                return self
+
+            def range(self, start, end):
+                self.bounds = (start, end)
+                return self
+
+            async def execute(self):
+                ordered = sorted(self.rows, key=lambda row: [row[column] for column in self.order_by])
+                return SimpleNamespace(data=ordered[self.bounds[0]:self.bounds[1] + 1], count=None)
+
+        client = SimpleNamespace(table=lambda name: SimpleNamespace(select=lambda columns, count=None: Select()))
+
+        async def fake_connection():
+            return client
+
+        monkeypatch.setattr(async_supabase_db, "init_supabase_connection", fake_connection)
+        monkeypatch.setattr(supabase_db, "_row_keys", {"farms": ["id"]})
+        monkeypatch.setitem(settings, "db_in_batch_size", 4)
+
+        result = asyncio.run(async_supabase_db.execute_query(
+            "farms", filters={"id": list(range(20, 2, -1))}, order_by="id", limit=5, offset=2
+        ))
+        assert [row["id"] for row in result] == [5, 6, 7, 8, 9]
+        assert max(in_lists) == 4 and len(in_lists) == 5
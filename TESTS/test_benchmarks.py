@@ -0,0 +1,81 @@
+"""
+Tests for the benchmark suite (BENCHMARKS/): synthetic database generator,
+coverage of the facade and baseline comparison.
+"""
+
+import sqlite3
+
+from BENCHMARKS.suite import compare, missing_cases, run_scale
+from BENCHMARKS.synthetic import generate_database
+
+
+def _results(queries=2, p50=10.0, peak=100.0):
+    """A one-case result set in the suite's JSON format."""
+    return {"results": {"100": {"get_farm_by_code": {"cold": {
+        "p50_ms": p50, "p95_ms": p50, "runs": 5, "queries": queries, "peak_kib": peak
+    }}}}}
+
+
+class TestSyntheticDatabase:
+    """Tests for generate_database."""
+
+    def test_scale_and_indexes(self, tmp_path):
+        """Every farm gets its rows, and the lookup indexes are created."""
+        path = generate_database(str(tmp_path / "bench.db"), farms=20, years=5)
+        conn = sqlite3.connect(path)
+        try:
+            def count(table):
+                return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+            assert count("farms") == 20
+            assert count("farm_actual_performances") == 20 * 5
+            assert count("farm_referents") == 20 * 6
+            assert count("farm_locations") == 20
+            assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        finally:
+            conn.close()
+
+    def test_deterministic(self, tmp_path):
+        """The same seed generates the same rows."""
+        dumps = []
+        for name in ("a.db", "b.db"):
+            conn = sqlite3.connect(generate_database(str(tmp_path / name), farms=5, years=2, seed=7))
+            dumps.append(conn.execute("SELECT * FROM farm_om_contracts ORDER BY farm_uuid").fetchall())
+            conn.close()
+        assert dumps[0] == dumps[1]
+
+
+class TestSuite:
+    """Tests for the cases and the comparison."""
+
+    def test_every_public_function_has_a_case(self):
+        """A new public facade function must come with its benchmark case."""
+        assert missing_cases() == []
+
+    def test_run_scale_measures_queries(self, tmp_path):
+        """Cold runs pay the caches, warm runs are served from them."""
+        source = generate_database(str(tmp_path / "bench.db"), farms=10, years=2)
+        results = run_scale(source, 10, repeat=2, work_path=str(tmp_path / "work.db"),
+                            only=lambda name: name in ("get_all_farm_data", "get_reference_rows"))
+
+        assert set(results) == {"get_all_farm_data", "get_reference_rows"}
+        assert results["get_reference_rows"]["cold"]["queries"] == 1
+        assert results["get_reference_rows"]["warm"]["queries"] == 0
+        assert results["get_all_farm_data"]["warm"]["queries"] == 0
+        assert results["get_all_farm_data"]["cold"]["p50_ms"] > 0
+
+    def test_compare(self):
+        """More queries always regress; latency and memory only beyond the tolerance and the noise floor."""
+        baseline = _results()
+        assert compare(baseline, _results()) == []
+        assert compare(baseline, _results(queries=3)) == ["100 farms get_farm_by_code (cold): 2 -> 3 queries"]
+        assert compare(baseline, _results(p50=19.0)) == []
+        assert compare(baseline, _results(p50=25.0)) == ["100 farms get_farm_by_code (cold): p50 10.0 -> 25.0 ms"]
+        noisy = _results()
+        noisy['results']['100']['get_farm_by_code']['cold']['p95_ms'] = 30.0
+        assert compare(noisy, _results(p50=25.0)) == []
+        assert compare(baseline, _results(peak=1000.0)) == [
+            "100 farms get_farm_by_code (cold): peak 100.0 -> 1000.0 KiB"
+        ]
+        assert compare({"results": {}}, _results(queries=9)) == []
@@ -0,0 +1,126 @@
+"""Tests for bulk inserts and upserts."""
+
+from unittest.mock import MagicMock
+
+
+class TestSQLiteBulkWrites:
+    """executemany-backed insert_many/upsert through the facade."""
+
+    def test_insert_many(self, sqlite_test_db):
+        """All rows are inserted; rows may omit columns."""
+        from src.database import execute_query, insert_many
+        rows = [{"uuid": f"p-{i}", "first_name": f"N{i}", "last_name": "Bulk"} for i in range(10, 20)]
+        rows.append({"uuid": "p-99", "last_name": "Partial"})
+        assert insert_many("persons", rows) == 11
+        assert len(execute_query("persons", filters={"last_name": "Bulk"})) == 10
+        assert execute_query("persons", filters={"uuid": "p-99"})[0]["first_name"] is None
+
+    def test_insert_many_is_atomic(self, sqlite_test_db):
+        """A failing row rolls back the whole batch."""
+        from src.database import execute_query, insert_many
+        rows = [{"uuid": "p-10", "last_name": "New"}, {"uuid": "p-1", "last_name": "Duplicate"}]
+        assert insert_many("persons", rows) is None
+        assert execute_query("persons", filters={"uuid": "p-10"}) == []
+
+    def test_upsert(self, sqlite_test_db):
+        """Conflicting rows are updated, new rows inserted."""
+        from src.database import execute_query, upsert
+        rows = [{"uuid": "p-1", "first_name": "Janet", "last_name": "Doe"},
+                {"uuid": "p-3", "first_name": "Ann", "last_name": "Lee"}]
+        assert upsert("persons", rows, on_conflict="uuid") == 2
+        names = {row["uuid"]: row["first_name"] for row in execute_query("persons")}
+        assert names == {"p-1": "Janet", "p-2": "John", "p-3": "Ann"}
+
+    def test_upsert_invalidates_reference_cache(self, sqlite_test_db):
+        """Bulk writes invalidate the caches like single writes."""
+        from src.database import get_reference_by_id, upsert
+        assert get_reference_by_id("farm_types", 1)["type_title"] == "Wind"
+        upsert("farm_types", [{"id": 1, "type_title": "Onshore wind"}])
+        assert get_reference_by_id("farm_types", 1)["type_title"] == "Onshore wind"
+
+    def test_upsert_statement(self):
+        """Conflict columns are excluded from the update list."""
+        from src.data.sqlite_db import _insert_statement
+        statement = _insert_statement("farm_locations", ("farm_uuid", "region"), upsert=True, on_conflict="farm_uuid")
+        assert str(statement) == ("INSERT INTO farm_locations (farm_uuid, region) VALUES (:farm_uuid, :region)"
+                                  " ON CONFLICT (farm_uuid) DO UPDATE SET region = excluded.region")
+
+
+class TestSupabaseBulkWrites:
+    """Chunked POSTs on Supabase."""
+
+    def test_batches(self, monkeypatch):
+        """Rows are sent in db_write_batch_size chunks with merge-duplicates."""
+        from config import settings
+        from src.data import supabase_db
+        client = MagicMock()
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+        monkeypatch.setitem(settings, "db_write_batch_size", 2)
+
+        rows = [{"uuid": str(i)} for i in range(5)]
+        assert supabase_db.upsert("persons", rows, on_conflict="uuid") == 5
+        batches = [call.args[0] for call in client.table.return_value.upsert.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert client.table.return_value.upsert.call_args.kwargs["on_conflict"] == "uuid"
+
+        assert supabase_db.insert_many("persons", rows) == 5
+        assert client.table.return_value.insert.call_count == 3
+
+    def test_upsert_one_without_unique_key(self, monkeypatch):
+        """Without a unique constraint on the key, the row is updated, or inserted when missing."""
+        from postgrest.exceptions import APIError
+        from src.data import supabase_db
+        client = MagicMock()
+        table = client.table.return_value
+        table.upsert.return_value.execute.side_effect = APIError({"code": "42P10", "message": "no unique key"})
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+        data = {"farm_uuid": "farm-1", "region": "Normandie"}
+
+        table.update.return_value.eq.return_value.execute.return_value.data = [data]
+        assert supabase_db.upsert_one("farm_locations", "farm_uuid", data) == data
+        table.update.return_value.eq.assert_called_with("farm_uuid", "farm-1")
+        table.insert.assert_not_called()
+
+        table.update.return_value.eq.return_value.execute.return_value.data = []
+        table.insert.return_value.execute.return_value.data = [data]
+        assert supabase_db.upsert_one("farm_locations", "farm_uuid", data) == data
+        table.insert.assert_called_once()
+
+        table.upsert.return_value.execute.side_effect = APIError({"code": "42501", "message": "denied"})
+        assert supabase_db.upsert_one("farm_locations", "farm_uuid", data) is None
+
+
+class TestUpsertOne:
+    """Single-statement saves for the 1:1 farm tables."""
+
+    def test_update_then_insert_without_unique_index(self, sqlite_test_db):
+        """Without a unique key the row is updated, or inserted when missing."""
+        from src.database import execute_query, upsert_one
+        row = upsert_one("farm_locations", "farm_uuid", {"farm_uuid": "farm-1", "region": "Normandie"})
+        assert row["region"] == "Normandie" and row["municipality"] == "Arras"
+        row = upsert_one("farm_locations", "farm_uuid", {"farm_uuid": "farm-2", "farm_code": "F002", "region": "Bretagne"})
+        assert row["farm_code"] == "F002"
+        assert len(execute_query("farm_locations")) == 2
+
+    def test_on_conflict_with_unique_index(self, sqlite_test_db):
+        """With a unique index on the key, ON CONFLICT DO UPDATE is used."""
+        from sqlalchemy import text
+        from src.data import sqlite_db
+        from src.database import execute_query, upsert_one
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("CREATE UNIQUE INDEX ux_farm_statuses_farm ON farm_statuses (farm_uuid)"))
+        with sqlite_test_db.connect() as conn:
+            assert sqlite_db._has_unique_key(conn, "farm_statuses", ("farm_uuid",))
+
+        row = upsert_one("farm_statuses", "farm_uuid", {"farm_uuid": "farm-1", "farm_status": "Dismantled"})
+        assert row == {"farm_uuid": "farm-1", "farm_code": "F001", "farm_status": "Dismantled"}
+        upsert_one("farm_statuses", "farm_uuid", {"farm_uuid": "farm-2", "farm_status": "Construction"})
+        assert [r["farm_status"] for r in execute_query("farm_statuses", order_by="farm_uuid")] == \
+            ["Dismantled", "Construction"]
+
+    def test_invalidates_section(self, sqlite_test_db):
+        """The farm's cached general_info is refreshed after an upsert."""
+        from src.database import get_farm_general_info, upsert_one
+        assert get_farm_general_info("farm-1")["location"]["region"] == "Hauts-de-France"
+        upsert_one("farm_locations", "farm_uuid", {"farm_uuid": "farm-1", "region": "Grand Est"})
+        assert get_farm_general_info("farm-1")["location"]["region"] == "Grand Est"
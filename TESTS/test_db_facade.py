@@ -80,6 +80,157 @@ class TestDatabaseFacade:
             assert 'location' in info or info.get('farm') is None
 
 
+class TestFarmBundle:
+    """Tests for the single round-trip farm bundle loader."""
+
+    def test_bundle_matches_section_loaders(self, sqlite_test_db):
+        """get_all_farm_data returns the same shape as the per-section loaders."""
+        from src import database
+        bundled = database.get_all_farm_data("farm-1")
+
+        assert bundled['general_info'] == database.get_farm_general_info("farm-1")
+        assert bundled['contracts_admin'] == database.get_farm_contracts_admin("farm-1")
+        assert bundled['performance_data'] == database.get_farm_performance_data("farm-1")
+
+        technical = database.get_farm_technical_details("farm-1")
+        assert bundled['technical_details']['wtg_list'] == technical['wtg_list']
+        assert sorted(s['uuid'] for s in bundled['technical_details']['ice_systems']) == ['ice-1', 'ice-2']
+
+    def test_bundle_orders_performance_tables(self, sqlite_test_db):
+        """Performance rows come back ordered like the sequential loaders."""
+        from src.database import get_all_farm_data
+        performance = get_all_farm_data("farm-1")['performance_data']
+        assert [p['year'] for p in performance['actual_performances']] == [2020, 2021]
+        assert [t['tariff_start_date'] for t in performance['tariffs']] == ['2015-01-01', '2025-01-01']
+
+    def test_bundle_is_one_statement(self, sqlite_test_db):
+        """The SQLite bundle runs as a single statement once columns are known."""
+        from sqlalchemy import event
+        from src.data.sqlite_db import get_farm_bundle
+
+        get_farm_bundle("farm-1")  # warm the column cache
+        statements = []
+        event.listen(sqlite_test_db, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        get_farm_bundle("farm-2")
+        assert len(statements) == 1
+
+    def test_bundle_unknown_farm(self, sqlite_test_db):
+        """An unknown farm yields only an empty 'farm' entry."""
+        from src.database import get_all_farm_data
+        data = get_all_farm_data("missing")
+        assert data['general_info'] == {'farm': None}
+        assert data['performance_data']['tariffs'] == []
+
+
+class TestTechnicalDetails:
+    """Tests for technical details and the IN-based ice-detection lookup."""
+
+    def test_execute_query_in_filter(self, sqlite_test_db):
+        """A list filter value is translated into an IN clause."""
+        from src.database import execute_query
+        rows = execute_query("farms", filters={"uuid": ["farm-1", "farm-2", "missing"]}, order_by="code")
+        assert [row['code'] for row in rows] == ['F001', 'F002']
+
+    def test_get_farm_technical_details(self, sqlite_test_db):
+        """Ice systems are resolved through their farm links."""
+        from src.database import get_farm_technical_details
+        details = get_farm_technical_details("farm-1")
+        assert details['turbine_details']['turbine_count'] == 4
+        assert len(details['wtg_list']) == 2
+        assert [s['uuid'] for s in details['ice_systems']] == ['ice-1', 'ice-2']
+
+    def test_get_farms_technical_details_constant_queries(self, sqlite_test_db):
+        """A list of farms is loaded in a constant number of statements."""
+        from sqlalchemy import event
+        from src.database import _schema_catalog, get_farms_technical_details
+
+        _schema_catalog.tables()  # loaded once per process, not per call
+        statements = []
+        event.listen(sqlite_test_db, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        details = get_farms_technical_details(["farm-1", "farm-2"])
+
+        assert len(statements) == 5
+        assert [s['uuid'] for s in details['farm-2']['ice_systems']] == ['ice-2']
+        assert details['farm-2']['turbine_details'] is None
+
+
+class TestReferents:
+    """Tests for batched referent resolution."""
+
+    def test_get_farm_referents(self, sqlite_test_db):
+        """All roles of a farm are resolved, unassigned persons map to {}."""
+        from src.database import get_farm_referents
+        referents = get_farm_referents("farm-1")
+        assert referents["Technical Manager"]["last_name"] == "Doe"
+        assert referents["Key Account Manager"]["first_name"] == "John"
+        assert referents["Asset Manager"] == {}
+        assert "Electrical Manager" not in referents
+
+    def test_get_farms_referents(self, sqlite_test_db):
+        """Several farms are resolved at once, unknown farms map to {}."""
+        from src.database import get_farms_referents
+        referents = get_farms_referents(["farm-1", "farm-2", "missing"])
+        assert referents["farm-2"]["Technical Manager"]["uuid"] == "p-2"
+        assert len(referents["farm-1"]) == 3
+        assert referents["missing"] == {}
+
+
+class TestCompanies:
+    """Tests for batched company-role resolution."""
+
+    def test_get_farm_companies(self, sqlite_test_db):
+        """All company roles of a farm are resolved in one call."""
+        from src.database import get_farm_companies
+        companies = get_farm_companies("farm-1")
+        assert companies["Grid Operator"]["name"] == "Enedis"
+        assert companies["Energy Trader"]["name"] == "Trader SA"
+
+    def test_get_farms_companies(self, sqlite_test_db):
+        """The portfolio variant resolves several farms at once."""
+        from src.database import get_farms_companies
+        companies = get_farms_companies(["farm-1", "farm-2"])
+        assert set(companies["farm-2"]) == {"Grid Operator"}
+        assert len(companies["farm-1"]) == 2
+
+
+class TestReferenceCache:
+    """Tests for the process-wide reference-data cache."""
+
+    def test_lookups_load_table_once(self):
+        """A table is loaded once and served by id and by name."""
+        from src.data.reference_cache import ReferenceCache
+        loader = MagicMock(return_value=[{'id': 1, 'role_name': 'Grid Operator'}])
+        cache = ReferenceCache(loader)
+
+        assert cache.get_by_name("company_roles", "Grid Operator")['id'] == 1
+        assert cache.get_by_id("company_roles", 1)['role_name'] == 'Grid Operator'
+        assert cache.get_by_id("company_roles", 2) is None
+        loader.assert_called_once_with("company_roles")
+
+    def test_failed_load_is_not_cached(self):
+        """A loader error (None) is retried on the next access."""
+        from src.data.reference_cache import ReferenceCache
+        loader = MagicMock(side_effect=[None, [{'id': 1, 'type_title': 'Wind'}]])
+        cache = ReferenceCache(loader)
+        assert cache.rows("farm_types") == []
+        assert cache.rows("farm_types") == [{'id': 1, 'type_title': 'Wind'}]
+
+    def test_rejects_non_reference_tables(self):
+        """Only declared lookup tables can be cached."""
+        from src.data.reference_cache import ReferenceCache
+        with pytest.raises(KeyError):
+            ReferenceCache(MagicMock()).rows("farms")
+
+    def test_facade_write_refreshes_cache(self, sqlite_test_db):
+        """Writing to a reference table through the facade refreshes it."""
+        from src.database import get_reference_by_name, insert_record
+        assert get_reference_by_name("farm_types", "Hybrid") is None
+        insert_record("farm_types", {"id": 3, "type_title": "Hybrid"})
+        assert get_reference_by_name("farm_types", "Hybrid")['id'] == 3
+
+
 class TestStateModule:
     """Tests for the state management module."""
 
@@ -0,0 +1,58 @@
+"""Tests for the bounded parallel fan-out of independent reads."""
+
+import contextvars
+import time
+
+from src.data.fanout import run_parallel
+
+
+def test_latency_is_the_slowest_read():
+    """Independent reads overlap instead of adding up."""
+    def slow(value):
+        return lambda: (time.sleep(0.2), value)[1]
+
+    start = time.monotonic()
+    results = run_parallel({"a": slow(1), "b": slow(2), "c": slow(3)}, width=3, timeout=5)
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert time.monotonic() - start < 0.5
+
+
+def test_timeout_and_errors_become_none():
+    """A read past its timeout or raising is reported as None."""
+    def boom():
+        raise RuntimeError("backend down")
+
+    results = run_parallel(
+        {"slow": lambda: time.sleep(1) or "late", "boom": boom, "ok": lambda: "ok"},
+        width=3, timeout=0.2
+    )
+    assert results == {"slow": None, "boom": None, "ok": "ok"}
+
+
+def test_width_one_runs_sequentially():
+    """A width of 1 keeps the calls in the caller's thread."""
+    import threading
+    caller = threading.get_ident()
+    results = run_parallel({"a": threading.get_ident, "b": threading.get_ident}, width=1, timeout=1)
+    assert set(results.values()) == {caller}
+
+
+def test_context_is_propagated():
+    """Workers see the caller's context variables."""
+    marker = contextvars.ContextVar("marker", default=None)
+    marker.set("callback")
+    results = run_parallel({"a": marker.get, "b": marker.get}, width=2, timeout=1)
+    assert results == {"a": "callback", "b": "callback"}
+
+
+def test_facade_sections_with_fanout(sqlite_test_db, monkeypatch):
+    """Fanned-out section loaders return the same data as sequential ones."""
+    from config import settings
+    from src import database
+
+    sequential = database._load(database._contracts_admin_reads("farm-1"))
+    monkeypatch.setattr(settings, "db_fanout_width", 4)
+    assert database._load(database._contracts_admin_reads("farm-1")) == sequential
+    performance, complete = database._load(database._performance_data_reads("farm-1"))
+    assert complete
+    assert [p['year'] for p in performance['actual_performances']] == [2020, 2021]
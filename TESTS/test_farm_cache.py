@@ -0,0 +1,133 @@
+"""Tests for the per-farm LRU section cache."""
+
+import pytest
+
+from src.data.farm_cache import FarmCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestFarmCache:
+    """Unit tests for FarmCache."""
+
+    def test_get_returns_copies(self, clock):
+        """Cached values cannot be mutated through a returned copy."""
+        cache = FarmCache(max_bytes=10_000, ttl=60, negative_ttl=5, clock=clock)
+        cache.put("farm-1", "general_info", {"farm": {"code": "F001"}})
+        hit, value = cache.get("farm-1", "general_info")
+        value["farm"]["code"] = "changed"
+        assert hit is True
+        assert cache.get("farm-1", "general_info")[1]["farm"]["code"] == "F001"
+
+    def test_ttl_and_negative_ttl(self, clock):
+        """Sections of a missing farm expire sooner; a missing optional 1:1 row keeps the full TTL."""
+        cache = FarmCache(max_bytes=10_000, ttl=60, negative_ttl=5, clock=clock)
+        cache.put("farm-1", "contracts_admin", {"om_contracts": {"a": 1}, "tcma_contracts": None})
+        cache.put("farm-1", "general_info", {"farm": {"uuid": "farm-1"}, "status": None, "location": None})
+        cache.put("farm-1", "technical_details", {"turbine_details": None, "substations": [{"uuid": "sub-1"}]})
+        cache.put("farm-2", "contracts_admin", {"om_contracts": None, "tcma_contracts": None})
+        cache.put("farm-2", "general_info", {"farm": None})
+        cache.put("farm-2", "performance_data", {"actual_performances": [], "tariffs": []})
+
+        clock.now = 10
+        for section in ("contracts_admin", "general_info", "technical_details"):
+            assert cache.get("farm-1", section)[0] is True
+        for section in ("contracts_admin", "general_info", "performance_data"):
+            assert cache.get("farm-2", section)[0] is False
+
+        clock.now = 61
+        assert cache.get("farm-1", "contracts_admin")[0] is False
+
+    def test_evicts_least_recently_used_by_size(self, clock):
+        """The byte bound evicts the least recently used entries first."""
+        cache = FarmCache(max_bytes=100, ttl=60, negative_ttl=5, clock=clock)
+        payload = {"rows": "x" * 30}
+        cache.put("farm-1", "performance_data", payload)
+        cache.put("farm-2", "performance_data", payload)
+        cache.get("farm-1", "performance_data")
+        cache.put("farm-3", "performance_data", payload)
+
+        assert cache.get("farm-2", "performance_data")[0] is False
+        assert cache.get("farm-1", "performance_data")[0] is True
+        assert cache.stats()["bytes"] <= 100
+
+    def test_invalidate_write_is_precise(self, clock):
+        """A write filtered on one farm only drops that farm's affected sections."""
+        cache = FarmCache(max_bytes=10_000, ttl=60, negative_ttl=5, clock=clock)
+        for farm_uuid in ("farm-1", "farm-2"):
+            cache.put(farm_uuid, "general_info", {"farm": {}})
+            cache.put(farm_uuid, "contracts_admin", {"administrations": {}})
+
+        cache.invalidate_write("farm_locations", {"farm_uuid": "farm-1"}, {"region": "x"})
+
+        assert cache.get("farm-1", "general_info")[0] is False
+        assert cache.get("farm-1", "contracts_admin")[0] is True
+        assert cache.get("farm-2", "general_info")[0] is True
+
+    def test_invalidate_write_shared_table(self, clock):
+        """A write to a shared lookup table drops the section for every farm."""
+        cache = FarmCache(max_bytes=10_000, ttl=60, negative_ttl=5, clock=clock)
+        cache.put("farm-1", "general_info", {"farm": {}})
+        cache.put("farm-2", "general_info", {"farm": {}})
+        cache.invalidate_write("farm_types", {"id": 1}, {"type_title": "Wind"})
+        assert cache.stats()["entries"] == 0
+
+
+class TestFacadeCaching:
+    """The facade serves repeated farm loads from the cache."""
+
+    def test_repeated_load_hits_cache(self, sqlite_test_db):
+        """A second get_all_farm_data does not touch the database."""
+        from sqlalchemy import event
+        from src.database import get_all_farm_data
+
+        first = get_all_farm_data("farm-1")
+        statements = []
+        event.listen(sqlite_test_db, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        assert get_all_farm_data("farm-1") == first
+        assert statements == []
+
+    def test_write_invalidates_farm(self, sqlite_test_db):
+        """Updating a farm-scoped table refreshes the cached section."""
+        from src.database import get_farm_general_info, update_record
+        assert get_farm_general_info("farm-1")['location']['region'] == 'Hauts-de-France'
+        update_record("farm_locations", {"farm_uuid": "farm-1"}, {"region": "Normandie"})
+        assert get_farm_general_info("farm-1")['location']['region'] == 'Normandie'
+
+    def test_failed_read_is_not_cached(self, sqlite_test_db, monkeypatch):
+        """A section with a failed read is served once, then reloaded instead of cached empty."""
+        import asyncio
+
+        from src import database
+
+        execute_query = database.db.execute_query
+        failing = {"farm_tariffs"}
+
+        def flaky_query(table, *args, **kwargs):
+            if table in failing:
+                failing.discard(table)
+                return None
+            return execute_query(table, *args, **kwargs)
+
+        monkeypatch.setattr(database.db, "execute_query", flaky_query)
+        assert database.get_farm_performance_data("farm-1")['tariffs'] == []
+        assert len(database.get_farm_performance_data("farm-1")['tariffs']) == 2
+
+        database._farm_cache.clear()
+        failing.add("farm_tariffs")
+        assert asyncio.run(database.aget_farm_performance_data("farm-1"))['tariffs'] == []
+        assert len(asyncio.run(database.aget_farm_performance_data("farm-1"))['tariffs']) == 2
@@ -0,0 +1,100 @@
+"""Tests for the filter expression model and its backend translations."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.data.filters import any_of, between, gte, ilike, in_, is_null, like, lt, neq, not_null
+
+
+class TestSQLiteFilters:
+    """Filters translated to parameterized SQL and run against SQLite."""
+
+    def test_build_where_parameterizes_values(self):
+        """Every operand is bound as a parameter, never inlined."""
+        from src.data.sqlite_db import _build_where
+        clauses, params = _build_where({"year": between(2015, 2020), "code": neq("F001")}, "param")
+        assert clauses == ["year BETWEEN :param_0 AND :param_1", "code <> :param_2"]
+        assert params == {"param_0": 2015, "param_1": 2020, "param_2": "F001"}
+
+    def test_range_filters(self, sqlite_test_db):
+        """gte/lt select a half-open window."""
+        from src.database import execute_query
+        rows = execute_query("farm_actual_performances", filters={"year": gte(2021)})
+        assert [row['year'] for row in rows] == [2021]
+        rows = execute_query("farm_tariffs", filters={"tariff_start_date": lt("2020-01-01")})
+        assert [row['price'] for row in rows] == [78.0]
+
+    def test_null_filters(self, sqlite_test_db):
+        """is_null / not_null map to IS NULL / IS NOT NULL."""
+        from src.database import execute_query
+        assert [r['code'] for r in execute_query("farms", filters={"farm_type_id": is_null()})] == ['F002']
+        assert [r['code'] for r in execute_query("farms", filters={"farm_type_id": not_null()})] == ['F001']
+
+    def test_like_is_case_sensitive_and_ilike_is_not(self, sqlite_test_db):
+        """like keeps case, ilike ignores it."""
+        from src.database import execute_query
+        assert execute_query("farms", filters={"project": like("al%")}) == []
+        assert len(execute_query("farms", filters={"project": like("Al_ha")})) == 1
+        assert len(execute_query("farms", filters={"project": ilike("al%")})) == 1
+
+    def test_or_groups(self, sqlite_test_db):
+        """any_of combines its groups with OR, other entries with AND."""
+        from src.database import execute_query
+        rows = execute_query("farms", filters={
+            "or": any_of({"code": "F002"}, {"project": "Alpha", "spv": "SPV Alpha"})
+        }, order_by="code")
+        assert [row['code'] for row in rows] == ['F001', 'F002']
+
+    def test_windowed_performances(self, sqlite_test_db):
+        """The date-window loader only returns years inside the window."""
+        from src.database import get_farms_actual_performances
+        performances = get_farms_actual_performances(["farm-1", "farm-2"], year_from=2021)
+        assert [row['year'] for row in performances["farm-1"]] == [2021]
+        assert performances["farm-2"] == []
+
+    def test_expiring_contracts(self, sqlite_test_db):
+        """Contract-expiry scans use an inclusive date range."""
+        from src.database import get_expiring_om_contracts
+        assert len(get_expiring_om_contracts("2030-12-31")) == 1
+        assert get_expiring_om_contracts("2030-12-31", end_from="2031-01-01") == []
+
+
+class TestPostgrestFilters:
+    """Filters translated to PostgREST operators."""
+
+    def test_apply_filters_uses_builder_operators(self):
+        """Conditions call the matching query builder methods."""
+        from src.data.supabase_db import apply_filters
+        query = MagicMock()
+        query.gte.return_value = query
+        query.lte.return_value = query
+        query.in_.return_value = query
+        query.is_.return_value = query
+        query.ilike.return_value = query
+
+        apply_filters(query, {
+            "year": between(2015, 2020),
+            "farm_uuid": in_(["a", "b"]),
+            "region": is_null(),
+            "project": ilike("al%")
+        })
+
+        query.gte.assert_called_once_with("year", 2015)
+        query.lte.assert_called_once_with("year", 2020)
+        query.in_.assert_called_once_with("farm_uuid", ["a", "b"])
+        query.is_.assert_called_once_with("region", "null")
+        query.ilike.assert_called_once_with("project", "al%")
+
+    def test_or_group_expression(self):
+        """OR groups become a PostgREST logic tree with quoted reserved values."""
+        from src.data.supabase_db import _postgrest_group
+        group = any_of({"code": "F.002"}, {"year": gte(2020), "region": is_null()})
+        assert _postgrest_group({"or": group}) == 'or(code.eq."F.002",and(year.gte.2020,region.is.null))'
+
+    def test_unknown_operator(self):
+        """Unsupported operators are rejected."""
+        from src.data.filters import Condition
+        from src.data.supabase_db import _postgrest_expression
+        with pytest.raises(ValueError):
+            _postgrest_expression("year", Condition("regex", ".*"))
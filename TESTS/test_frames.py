@@ -0,0 +1,51 @@
+"""Tests for typed DataFrame results."""
+
+import pandas as pd
+
+from src.data.filters import in_
+
+
+class TestTypedFrame:
+    """Column typing shared by both backends."""
+
+    def test_frame_from_rows(self):
+        """JSON rows become typed columns; text stays text."""
+        from src.data.frames import frame_from_rows
+        frame = frame_from_rows([
+            {"farm_uuid": "farm-1", "siret_number": "00123", "amount": 10, "contract_end_date": "2030-12-31"},
+            {"farm_uuid": "farm-2", "siret_number": None, "amount": None, "contract_end_date": None},
+        ])
+        assert frame["amount"].dtype == "float64"
+        assert pd.api.types.is_datetime64_any_dtype(frame["contract_end_date"])
+        assert frame["contract_end_date"].isna().tolist() == [False, True]
+        assert frame["siret_number"].tolist()[0] == "00123"
+
+    def test_empty_result_keeps_columns(self):
+        """An empty result still has the selected columns."""
+        from src.data.frames import frame_from_rows
+        assert list(frame_from_rows([], "farm_uuid, year").columns) == ["farm_uuid", "year"]
+
+
+class TestQueryFrame:
+    """query_frame through the facade on SQLite."""
+
+    def test_sqlite_frame(self, sqlite_test_db):
+        """pd.read_sql result with parsed dates and numeric dtypes."""
+        from src.database import query_frame
+        frame = query_frame("farm_tariffs", filters={"farm_uuid": in_(["farm-1"])}, order_by="tariff_start_date",
+                            parse_dates=["tariff_start_date"])
+        assert frame["price"].tolist() == [78.0, 82.0]
+        assert frame["price"].dtype == "float64"
+        assert pd.api.types.is_datetime64_any_dtype(frame["tariff_start_date"])
+
+    def test_sqlite_frame_default_dates_and_limit(self, sqlite_test_db):
+        """*_date columns are parsed by default; limit applies."""
+        from src.database import query_frame
+        frame = query_frame("farm_om_contracts", limit=1)
+        assert frame["contract_end_date"].iloc[0] == pd.Timestamp("2030-12-31")
+        assert query_frame("farm_actual_performances", order_by="year")["year"].dtype == "int64"
+
+    def test_error_returns_none(self, sqlite_test_db):
+        """Errors follow the facade convention."""
+        from src.database import query_frame
+        assert query_frame("missing_table") is None
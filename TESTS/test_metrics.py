@@ -0,0 +1,134 @@
+"""
+Tests for the data facade instrumentation (src/data/metrics.py).
+"""
+
+import asyncio
+
+import pytest
+
+from src.data import metrics
+from src.data.metrics import MetricsRegistry, instrumented, record_response_bytes
+
+
+def _series(registry, table, operation):
+    """The snapshot entry of one (table, operation) series."""
+    return next(s for s in registry.snapshot() if s['table'] == table and s['operation'] == operation)
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Each observation lands in the first bucket whose bound it does not exceed."""
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.01, 0.05, 3.0):
+            registry.observe("sqlite", "farms", "select", seconds, "ok", rows=2)
+
+        series = _series(registry, "farms", "select")
+        assert series['buckets'] == {0.01: 2, 0.1: 3, float("inf"): 4}
+        assert series['count'] == 4
+        assert series['rows'] == 8
+
+    def test_prometheus_text(self):
+        """The export follows the Prometheus text format, with escaped labels."""
+        registry = MetricsRegistry(buckets=(0.1,))
+        registry.observe("sqlite", 'we"ird', "select", 0.05, "error")
+        text = registry.render_prometheus()
+
+        labels = 'backend="sqlite",table="we\\"ird",operation="select"'
+        assert "# TYPE wndmngr_db_call_duration_seconds histogram" in text
+        assert f'wndmngr_db_call_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'wndmngr_db_call_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f'wndmngr_db_calls_total{{{labels},outcome="error"}} 1' in text
+        assert f'wndmngr_db_calls_total{{{labels},outcome="empty"}} 0' in text
+        assert text.endswith("\n")
+
+
+class TestInstrumented:
+    """Tests for the instrumented decorator."""
+
+    def test_errors_are_counted_apart_from_empty_results(self):
+        """None and exceptions are errors, [] and 0 are empty results."""
+        registry = MetricsRegistry()
+        results = iter([[{"a": 1}], [], None])
+
+        @instrumented(registry, lambda: "sqlite", "select")
+        def execute_query(table):
+            return next(results)
+
+        @instrumented(registry, lambda: "sqlite", "rpc")
+        def execute_rpc(function_name):
+            raise NotImplementedError(function_name)
+
+        for _ in range(3):
+            execute_query("farms")
+        with pytest.raises(NotImplementedError):
+            execute_rpc(function_name="missing")
+
+        select = _series(registry, "farms", "select")
+        assert (select['ok'], select['empty'], select['error'], select['rows']) == (1, 1, 1, 1)
+        assert select['payload_bytes'] == len('[{"a": 1}]') + len("[]")
+        assert _series(registry, "missing", "rpc")['error'] == 1
+
+    def test_long_results_are_sampled(self, monkeypatch):
+        """A long result is sized from a few serialised rows, not serialised whole."""
+        registry = MetricsRegistry()
+        rows = [{"id": i % 10, "code": "F"} for i in range(20000)]
+        dumped = []
+        dumps = metrics.json.dumps
+        monkeypatch.setattr(metrics.json, "dumps",
+                            lambda value, **kwargs: dumped.append(value) or dumps(value, **kwargs))
+
+        @instrumented(registry, lambda: "sqlite", "select")
+        def execute_query(table):
+            return rows
+
+        execute_query("farms")
+        assert [len(value) for value in dumped] == [3]
+        row_bytes = len('{"id": 0, "code": "F"}, ')
+        assert abs(_series(registry, "farms", "select")['payload_bytes'] - row_bytes * len(rows)) < len(rows)
+
+    def test_response_sizes_replace_the_estimate(self):
+        """Sizes reported by the backend during a call are summed instead of sizing the result."""
+        registry = MetricsRegistry()
+
+        @instrumented(registry, lambda: "supabase", "select")
+        def execute_query(table):
+            record_response_bytes(1200)
+            record_response_bytes(34)
+            return [{"a": 1}]
+
+        execute_query("farms")
+        record_response_bytes(99)  # outside of a measured call: ignored
+        assert _series(registry, "farms", "select")['payload_bytes'] == 1234
+
+    def test_coroutines_are_measured(self):
+        """Async facade functions are measured once awaited."""
+        registry = MetricsRegistry()
+
+        @instrumented(registry, lambda: "supabase", "update", payload_arg="data")
+        async def aupdate_record(table, filters, data):
+            return 0
+
+        asyncio.run(aupdate_record("farms", {"uuid": "x"}, data={"code": "F"}))
+        series = _series(registry, "farms", "update")
+        assert (series['backend'], series['empty'], series['payload_bytes']) == ("supabase", 1, len('{"code": "F"}'))
+
+
+class TestFacadeMetrics:
+    """Tests for the instrumented facade (SQLite backend)."""
+
+    def test_facade_calls_are_recorded(self, sqlite_test_db):
+        """Reads, writes and rejected queries feed the process registry."""
+        from src import database
+        database._metrics.reset()
+
+        database.execute_query("farms", filters={"code": "F001"})
+        database.execute_query("farms", filters={"code": "nope"})
+        database.execute_query("farms", columns="missing_column")
+        database.insert_record("farms", {"uuid": "farm-3", "code": "F003"})
+
+        select = _series(database._metrics, "farms", "select")
+        assert (select['ok'], select['empty'], select['error']) == (1, 1, 1)
+        assert _series(database._metrics, "farms", "insert")['ok'] == 1
+        assert 'operation="insert"' in database.render_query_metrics()
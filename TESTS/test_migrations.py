@@ -0,0 +1,103 @@
+"""
+Tests for the SQLite migration runner and the query plan check (src/data/migrations).
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.data.migrations import get_schema_version, load_migrations, migrate
+from src.data.migrations.plans import check_query_plans
+
+# Enough farms for the planner (after ANALYZE) to prefer an index over a scan
+FARM_COUNT = 300
+
+
+def _seed_farms(engine, count=FARM_COUNT):
+    """Add `count` farms with one row per 1:1 table and four rows per 1:many table."""
+    farms = [{"uuid": f"seed-{i}", "code": f"S{i:04d}"} for i in range(count)]
+    many = [{"uuid": f"seed-{i}", "id": f"seed-{i}-{n}", "n": 2015 + n} for i in range(count) for n in range(4)]
+    one_to_one = [
+        "farm_statuses (farm_uuid)", "farm_locations (farm_uuid)", "farm_turbine_details (wind_farm_uuid)",
+        "farm_administrations (farm_uuid)", "farm_tcma_contracts (farm_uuid)", "farm_om_contracts (farm_uuid)",
+        "farm_electrical_delegations (farm_uuid)", "farm_environmental_installations (farm_uuid)",
+        "farm_financial_guarantees (farm_uuid)", "farm_substation_details (farm_uuid)",
+        "persons (uuid)", "companies (uuid)", "ice_detection_systems (uuid)"
+    ]
+    one_to_many = [
+        "substations (uuid, farm_uuid) VALUES (:id, :uuid)",
+        "wind_turbine_generators (uuid, farm_uuid) VALUES (:id, :uuid)",
+        "farm_ice_detection_systems (farm_uuid, ice_detection_system_uuid) VALUES (:uuid, :uuid)",
+        "farm_actual_performances (farm_uuid, year) VALUES (:uuid, :n)",
+        "farm_target_performances (farm_uuid, year) VALUES (:uuid, :n)",
+        "farm_tariffs (farm_uuid, tariff_start_date) VALUES (:uuid, :n)",
+        "farm_referents (farm_uuid, person_role_id, person_uuid) VALUES (:uuid, 1, :uuid)",
+        "farm_company_roles (farm_uuid, company_role_id, company_uuid) VALUES (:uuid, 1, :uuid)"
+    ]
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO farms (uuid, code) VALUES (:uuid, :code)"), farms)
+        for target in one_to_one:
+            conn.execute(text(f"INSERT INTO {target} VALUES (:uuid)"), farms)
+        for target in one_to_many:
+            conn.execute(text(f"INSERT INTO {target}"), many)
+
+
+class TestMigrate:
+    """Tests for migrate()."""
+
+    def test_migrations_are_numbered(self):
+        """Migration files load in order with their statements."""
+        migrations = load_migrations()
+        assert [version for version, _, _ in migrations] == [1, 2]
+        assert all(statements for _, _, statements in migrations)
+
+    def test_migrate_creates_indexes_and_statistics(self, sqlite_test_db):
+        """Pending migrations run once, then ANALYZE fills sqlite_stat1."""
+        assert migrate(sqlite_test_db) == 2
+        assert migrate(sqlite_test_db) == 2
+
+        with sqlite_test_db.connect() as conn:
+            assert get_schema_version(conn) == 2
+            indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+            assert conn.execute(text("SELECT COUNT(*) FROM sqlite_stat1")).scalar() > 0
+        assert {"idx_farm_referents_farm_role", "idx_farm_tariffs_farm_start",
+                "idx_farm_actual_performances_farm_year", "uq_farm_locations_farm"} <= indexes
+
+    def test_failed_migration_is_rolled_back(self, sqlite_test_db):
+        """Duplicate 1:1 rows stop the unique keys migration without a partial schema."""
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("INSERT INTO farm_statuses VALUES ('farm-1', 'F001', 'Duplicate')"))
+
+        with pytest.raises(Exception, match="UNIQUE"):
+            migrate(sqlite_test_db)
+
+        with sqlite_test_db.connect() as conn:
+            assert get_schema_version(conn) == 1
+            unique = conn.execute(text("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'uq_%'")).scalar()
+        assert unique == 0
+
+    def test_apply_migrations_logs_errors(self, sqlite_test_db):
+        """The backend entry point returns None instead of raising."""
+        from src.data import sqlite_db
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("DROP TABLE farm_tariffs"))
+        assert sqlite_db.apply_migrations(sqlite_test_db) is None
+
+
+class TestQueryPlans:
+    """Tests for check_query_plans()."""
+
+    def test_unindexed_database_scans(self, sqlite_test_db):
+        """Without the migrations, per-farm reads scan whole tables."""
+        _seed_farms(sqlite_test_db)
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+        violations = check_query_plans(sqlite_test_db)
+        assert any(violation.startswith("farm_tariffs by farm_uuid:") for violation in violations)
+        assert any(violation.startswith("farm_referents roles:") for violation in violations)
+
+    def test_migrated_database_uses_indexes(self, sqlite_test_db):
+        """After the migrations, no facade query falls back to a full table scan."""
+        _seed_farms(sqlite_test_db)
+        migrate(sqlite_test_db)
+        assert check_query_plans(sqlite_test_db) == []
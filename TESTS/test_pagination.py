@@ -0,0 +1,299 @@
+"""Tests for limit/offset and keyset pagination, and Supabase page fetching."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.data.filters import in_
+
+
+class FakeSelect:
+    """
+    Minimal PostgREST select builder serving a list of rows, capped at max_rows
+
+    Without a total order, every request sees the rows in its own order, as
+    PostgreSQL may return them.
+    """
+
+    def __init__(self, rows, count, max_rows, calls, counted, estimate=None, in_lists=None):
+        self.rows = rows
+        self.count = count
+        self.max_rows = max_rows
+        self.calls = calls
+        self.counted = counted
+        self.estimate = estimate
+        self.in_lists = in_lists if in_lists is not None else []
+        self.bounds = (0, len(rows) - 1)
+        self.order_by = []
+        self.in_sizes = []
+
+    def in_(self, column, values):
+        self.in_sizes.append(len(values))
+        self.rows = [row for row in self.rows if row[column] in values]
+        return self
+
+    def order(self, column):
+        self.order_by.append(column)
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        start, end = self.bounds
+        self.calls.append(self.bounds)
+        self.in_lists.extend(self.in_sizes)
+        rows = list(self.rows)
+        random.shuffle(rows)
+        if self.order_by:
+            rows.sort(key=lambda row: tuple(row[column] for column in self.order_by))
+        data = rows[start:min(end + 1, start + self.max_rows)]
+        if self.count is None:
+            return SimpleNamespace(data=data, count=None)
+        self.counted.append((self.bounds, self.count.value))
+        exact = len(self.rows)
+        return SimpleNamespace(data=data, count=exact if self.estimate is None else self.estimate)
+
+
+class FakeClient:
+    """Client whose single table holds `size` numbered rows, five per year (estimated counts may be off)."""
+
+    def __init__(self, size, max_rows, estimate=None):
+        self.rows = [{"id": i, "year": 2000 + i // 5} for i in range(size)]
+        self.max_rows = max_rows
+        self.estimate = estimate
+        self.calls = []
+        self.counted = []
+        # Length of the IN list of every request
+        self.in_lists = []
+
+    def table(self, name):
+        client = self
+        return SimpleNamespace(select=lambda columns, count=None: FakeSelect(
+            list(client.rows), count, client.max_rows, client.calls, client.counted,
+            client.estimate if count is not None and count.value != "exact" else None, client.in_lists
+        ))
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Route supabase_db to a fake client; returns a factory taking (size, max_rows)."""
+    from config import settings
+    from src.data import supabase_db
+
+    monkeypatch.setitem(settings, "db_page_size", 10)
+    monkeypatch.setitem(settings, "db_page_fanout", 3)
+    monkeypatch.setattr(supabase_db, "_row_keys", {"farms": ["id"]})
+
+    def install(size, max_rows=1000, estimate=None):
+        client = FakeClient(size, max_rows, estimate)
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+        return client
+    return install
+
+
+class TestSupabasePagination:
+    """execute_query reads every page instead of stopping at max-rows."""
+
+    def test_reads_all_pages(self, fake_supabase):
+        """The second page brings an estimated count, the rest are fetched by range."""
+        from src.data.supabase_db import execute_query
+        client = fake_supabase(35)
+        rows = execute_query("farms", order_by="id")
+        assert [row["id"] for row in rows] == list(range(35))
+        assert sorted(client.calls) == [(0, 9), (10, 19), (20, 29), (30, 39)]
+        assert client.counted == [((10, 19), "estimated")]
+
+    def test_short_first_page_is_not_counted(self, fake_supabase):
+        """A lookup fitting in one page is a single request, without any count."""
+        from src.data.supabase_db import execute_query
+        client = fake_supabase(3)
+        assert [row["id"] for row in execute_query("farms", order_by="id")] == [0, 1, 2]
+        assert client.calls == [(0, 9)]
+        assert client.counted == []
+
+    def test_low_estimate_keeps_paging(self, fake_supabase):
+        """Pages past an underestimated count are read until a short page comes back."""
+        from src.data.supabase_db import execute_query
+        client = fake_supabase(35, estimate=15)
+        rows = execute_query("farms", order_by="id")
+        assert [row["id"] for row in rows] == list(range(35))
+        assert client.calls == [(0, 9), (10, 19), (20, 29), (30, 39)]
+
+    def test_limit_and_offset(self, fake_supabase):
+        """limit/offset only fetch the requested window."""
+        from src.data.supabase_db import execute_query
+        client = fake_supabase(35)
+        rows = execute_query("farms", order_by="id", limit=12, offset=20)
+        assert [row["id"] for row in rows] == list(range(20, 32))
+        assert sorted(client.calls) == [(20, 29), (30, 31)]
+
+    def test_pages_without_order_by_are_complete(self, fake_supabase):
+        """Without order_by, or on a column with ties, pages are ordered on the table key too."""
+        from src.data.supabase_db import execute_query
+        fake_supabase(35)
+        assert sorted(row["id"] for row in execute_query("farms")) == list(range(35))
+        rows = execute_query("farms", order_by="year")
+        assert [row["id"] for row in rows] == list(range(35))
+
+    def test_paging_order(self, monkeypatch):
+        """The key breaks ties; a table without a known key is ordered by order_by alone."""
+        from src.data import supabase_db
+        monkeypatch.setattr(supabase_db, "_row_keys", {"farms": ["uuid"], "farm_tariffs": ["farm_uuid", "price"]})
+        assert supabase_db.paging_order("farms") == ["uuid"]
+        assert supabase_db.paging_order("farms", "uuid") == ["uuid"]
+        assert supabase_db.paging_order("farm_tariffs", "price") == ["price", "farm_uuid"]
+        assert supabase_db.paging_order("unknown", "code") == ["code"]
+
+    def test_row_keys_from_openapi(self, monkeypatch):
+        """Primary key columns are read from the OpenAPI description; tables without one use every column."""
+        from src.data import supabase_db
+        definitions = {
+            "farms": {"properties": {"uuid": {"description": "Note:\nThis is a Primary Key.<pk/>"}, "code": {}}},
+            "farm_tariffs": {"properties": {"farm_uuid": {"description": "Note:\nForeign Key"}, "price": {}}}
+        }
+        response = SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"definitions": definitions})
+        monkeypatch.setattr(supabase_db, "get_supabase_credentials", lambda: ("https://x.supabase.co", "key"))
+        monkeypatch.setattr(supabase_db.httpx, "get", lambda *args, **kwargs: response)
+        monkeypatch.setattr(supabase_db, "_row_keys", None)
+
+        assert supabase_db.paging_order("farms", "code") == ["code", "uuid"]
+        assert supabase_db._row_keys == {"farms": ["uuid"], "farm_tariffs": ["farm_uuid", "price"]}
+
+    def test_long_in_lists_are_split(self, fake_supabase, monkeypatch):
+        """An IN list over db_in_batch_size values is read in batches, then merged in query order."""
+        from config import settings
+        from src.data.supabase_db import execute_query
+        monkeypatch.setitem(settings, "db_in_batch_size", 4)
+        client = fake_supabase(35)
+        wanted = list(range(30, 5, -1))
+
+        rows = execute_query("farms", filters={"id": wanted}, order_by="year")
+        assert [row["id"] for row in rows] == list(range(6, 31))
+        assert client.in_lists and max(client.in_lists) == 4
+
+        rows = execute_query("farms", filters={"id": wanted}, order_by="year", limit=5, offset=3)
+        assert [row["id"] for row in rows] == list(range(9, 14))
+        assert sorted(row["id"] for row in execute_query("farms", filters={"id": wanted})) == list(range(6, 31))
+
+    def test_page_ranges(self, monkeypatch):
+        """Next ranges run up to the estimate, at least one page, and stop at the limit."""
+        from config import settings
+        from src.data.supabase_db import next_page_ranges
+        monkeypatch.setitem(settings, "db_page_size", 10)
+        assert next_page_ranges(0, None, 0) == [(0, 9)]
+        assert next_page_ranges(0, 4, 20) == [(20, 23)]
+        assert next_page_ranges(20, None, 0, estimate=35) == [(20, 29), (30, 39)]
+        assert next_page_ranges(20, None, 0, estimate=5) == [(20, 29)]
+        assert next_page_ranges(10, 15, 0, estimate=25) == [(10, 14)]
+        assert next_page_ranges(15, 15, 0, estimate=25) == []
+
+
+class TestSQLitePagination:
+    """LIMIT/OFFSET and keyset pages through the facade."""
+
+    def test_limit_offset(self, sqlite_test_db):
+        """limit/offset select a window of the ordered rows."""
+        from src.database import execute_query
+        rows = execute_query("persons", order_by="uuid", limit=1, offset=1)
+        assert [row["uuid"] for row in rows] == ["p-2"]
+        rows = execute_query("farm_referents", columns="person_role_id", order_by="person_role_id", offset=2)
+        assert [row["person_role_id"] for row in rows] == [2, 3]
+
+    def test_keyset_pages(self, sqlite_test_db):
+        """Following the cursor walks the table page by page."""
+        from src.database import execute_keyset_page
+        first = execute_keyset_page("wind_turbine_generators", "uuid", limit=1)
+        assert [row["uuid"] for row in first] == ["wtg-1"]
+        second = execute_keyset_page("wind_turbine_generators", "uuid", after=first[-1]["uuid"], limit=1)
+        assert [row["uuid"] for row in second] == ["wtg-2"]
+        assert execute_keyset_page("wind_turbine_generators", "uuid", after="wtg-2", limit=1) == []
+
+    def test_keyset_keeps_filter_on_key(self, sqlite_test_db):
+        """A caller filter on the key column is combined with the cursor."""
+        from src.database import execute_keyset_page
+        rows = execute_keyset_page("persons", "uuid", after="p-1", filters={"uuid": in_(["p-1", "p-2"])})
+        assert [row["uuid"] for row in rows] == ["p-2"]
+
+
+class TestIterQuery:
+    """iter_query streams the same rows as execute_query."""
+
+    def test_sqlite_stream(self, sqlite_test_db):
+        """Rows are yielded lazily, in order, in small batches."""
+        from src.database import execute_query, iter_query
+        rows = iter_query("farm_referents", order_by="person_role_id", batch_size=1)
+        assert next(rows)["person_role_id"] == 1
+        assert [next(rows)] + list(rows) == execute_query("farm_referents", order_by="person_role_id")[1:]
+
+    def test_sqlite_error_propagates(self, sqlite_test_db):
+        """A failing stream raises instead of ending early."""
+        from src.database import iter_query
+        with pytest.raises(Exception):
+            list(iter_query("missing_table"))
+
+    def test_supabase_stream_by_page(self, fake_supabase):
+        """Pages are read one after another until a short page, without counting the rows."""
+        from src.data.supabase_db import iter_query
+        client = fake_supabase(23)
+        assert [row["id"] for row in iter_query("farms", order_by="id", batch_size=4)] == list(range(23))
+        assert client.calls == [(0, 3), (4, 7), (8, 11), (12, 15), (16, 19), (20, 23)]
+        assert client.counted == []
+
+    def test_supabase_stream_is_ordered_on_the_key(self, fake_supabase):
+        """Without order_by, or with ties, the stream neither repeats nor skips rows."""
+        from src.data.supabase_db import iter_query
+        fake_supabase(23)
+        assert sorted(row["id"] for row in iter_query("farms", batch_size=4)) == list(range(23))
+        assert [row["id"] for row in iter_query("farms", order_by="year", batch_size=4)] == list(range(23))
+
+    def test_supabase_stream_of_a_long_in_list(self, fake_supabase, monkeypatch):
+        """A long IN list gives one stream per batch, merged in order."""
+        from config import settings
+        from src.data.supabase_db import iter_query
+        monkeypatch.setitem(settings, "db_in_batch_size", 4)
+        client = fake_supabase(23)
+        rows = iter_query("farms", filters={"id": list(range(22, -1, -2))}, order_by="id", batch_size=3)
+        assert [row["id"] for row in rows] == list(range(0, 23, 2))
+        assert max(client.in_lists) == 4
+
+    def test_supabase_batch_size_is_capped(self, fake_supabase):
+        """A batch larger than db_page_size (max-rows) is read in db_page_size pages."""
+        from src.data.supabase_db import iter_query
+        client = fake_supabase(15)
+        assert len(list(iter_query("farms", batch_size=50))) == 15
+        assert client.calls == [(0, 9), (10, 19)]
+
+
+class TestSupabaseRoleAssignments:
+    """Role lookups for many farms."""
+
+    def test_farm_list_is_split(self, monkeypatch):
+        """Each request carries at most db_in_batch_size farm uuids; the rows of all batches are returned."""
+        from unittest.mock import MagicMock
+
+        from config import settings
+        from src.data import supabase_db
+        monkeypatch.setitem(settings, "db_in_batch_size", 100)
+        client = MagicMock()
+        sizes = []
+
+        def in_(column, farm_uuids):
+            sizes.append(len(farm_uuids))
+            query = MagicMock()
+            query.execute.return_value.data = [
+                {"farm_uuid": farm_uuid, "person_role_id": 1, "person_roles": {"id": 1, "role_name": "Asset Manager"},
+                 "persons": None}
+                for farm_uuid in farm_uuids
+            ]
+            return query
+
+        client.table.return_value.select.return_value.in_.side_effect = in_
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+
+        farm_uuids = [f"farm-{index:036d}" for index in range(250)]
+        assignments = supabase_db.get_role_assignments("farm_referents", farm_uuids)
+        assert sorted(sizes) == [50, 100, 100]
+        assert sorted(row["farm_uuid"] for row in assignments) == farm_uuids
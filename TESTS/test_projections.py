@@ -0,0 +1,119 @@
+"""
+Tests for the schema catalogue and the per-view column projections.
+"""
+
+import pytest
+
+from src.data.catalog import SchemaCatalog
+from src.data.projections import view_projection
+
+
+class TestSchemaCatalog:
+    """Tests for SchemaCatalog."""
+
+    def test_validate_rejects_unknown_names(self):
+        """Unknown tables and columns are rejected, known ones pass."""
+        catalog = SchemaCatalog(loader=lambda: {"farms": ["uuid", "code"]})
+        catalog.validate("farms", ["uuid", "code", "*"])
+
+        with pytest.raises(ValueError, match="Unknown column"):
+            catalog.validate("farms", ["uuid", "spv"])
+        with pytest.raises(ValueError, match="Unknown table"):
+            catalog.validate("plants", ["uuid"])
+
+    def test_validate_rejects_injection_without_catalogue(self):
+        """Without a catalogue, only identifier shapes are checked."""
+        catalog = SchemaCatalog(loader=lambda: None)
+        catalog.validate("anything", ["col_1"])
+
+        with pytest.raises(ValueError, match="Invalid identifier"):
+            catalog.validate("farms", ["uuid; DROP TABLE farms"])
+
+    def test_failed_load_is_retried_later(self):
+        """A failed load is not retried on every call, only after retry_after."""
+        now = [0.0]
+        calls = []
+
+        def loader():
+            calls.append(now[0])
+            return None if len(calls) == 1 else {"farms": ["uuid"]}
+
+        catalog = SchemaCatalog(loader=loader, retry_after=60, clock=lambda: now[0])
+        assert catalog.tables() == {}
+        assert catalog.tables() == {}
+        now[0] = 61
+        assert catalog.tables() == {"farms": ["uuid"]}
+        assert len(calls) == 2
+
+    def test_restrict_keeps_existing_columns(self):
+        """A projection is narrowed to the columns the table really has."""
+        catalog = SchemaCatalog(loader=lambda: {"farms": ["uuid", "code"]})
+        assert catalog.restrict("farms", ["uuid", "spv"]) == ["uuid"]
+        assert catalog.restrict("plants", ["uuid"]) == ["uuid"]
+
+
+class TestViewProjection:
+    """Tests for view_projection."""
+
+    def test_group_merges_views(self):
+        """The farm page group combines the columns of its views without duplicates."""
+        projection = view_projection("farm_page")
+        assert projection["farms"] == ["uuid", "code", "project", "spv", "farm_type_id"]
+        assert projection["farm_om_contracts"] == ["farm_uuid", "service_contract_type", "contract_end_date"]
+
+    def test_unknown_view_raises(self):
+        """A typo in a view name is an error, not a full read."""
+        with pytest.raises(KeyError):
+            view_projection("sidebarr")
+        assert view_projection(None) == {}
+
+
+class TestFacadeProjections:
+    """Tests for the projected facade loaders (SQLite backend)."""
+
+    def test_load_schema(self, sqlite_test_db):
+        """The SQLite catalogue lists every table with its columns."""
+        from src.data.sqlite_db import load_schema
+        schema = load_schema()
+        assert schema["farm_types"] == ["id", "type_title"]
+        assert "farm_company_roles" in schema
+
+    def test_execute_query_rejects_unknown_column(self, sqlite_test_db):
+        """Unknown column names never reach the SQL statement."""
+        from src.database import execute_query
+        assert execute_query("farms", columns="uuid, nope") is None
+        assert execute_query("farms", filters={"nope": 1}) is None
+        assert execute_query("farms", order_by="code; DROP TABLE farms") is None
+        assert len(execute_query("farms", columns="uuid, code", order_by="code")) == 2
+
+    def test_all_farm_data_reads_projected_columns(self, sqlite_test_db):
+        """The farm page only receives the columns it renders."""
+        from src.database import get_all_farm_data
+        data = get_all_farm_data("farm-1", view="farm_page")
+
+        assert set(data['contracts_admin']['administrations']) == {
+            "farm_uuid", "account_number", "siret_number", "vat_number"
+        }
+        assert data['general_info']['farm_type']['type_title'] == "Wind"
+        # Tables missing from the view are read in full
+        assert data['contracts_admin']['tcma_contracts'] is None
+        assert data['technical_details']['turbine_details']['turbine_count'] == 4
+
+    def test_views_are_cached_separately(self, sqlite_test_db):
+        """A projected section does not satisfy a full read of the same section."""
+        from src.database import get_farm_contracts_admin
+        projected = get_farm_contracts_admin("farm-1", view="contracts")
+        full = get_farm_contracts_admin("farm-1")
+
+        assert "farm_code" not in projected['om_contracts']
+        assert full['om_contracts']['farm_code'] == "F001"
+
+    def test_fallback_loaders_use_projection(self, sqlite_test_db, monkeypatch):
+        """Without a bundle, the section loaders apply the same projection."""
+        from src import database
+        monkeypatch.setattr(database.db, "get_farm_bundle", lambda farm_uuid, columns=None: None)
+        data = database.get_all_farm_data("farm-1", view="farm_page")
+
+        assert set(data['general_info']['location']) == set(view_projection("location")["farm_locations"])
+        assert [row['year'] for row in data['performance_data']['actual_performances']] == [2020, 2021]
+        assert "energy_mwh" not in data['performance_data']['actual_performances'][0]
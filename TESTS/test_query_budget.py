@@ -0,0 +1,185 @@
+"""
+Tests for the per-callback query budget (src/data/query_budget.py) and the
+number of queries issued by the data paths of the Taipy callbacks.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from src.data.query_budget import QueryBudgetExceeded, QueryTracker, query_budget, track_queries, track_statement
+
+
+@pytest.fixture
+def budget_mode(monkeypatch):
+    """Set query_budget_mode for the test."""
+    from config import settings
+
+    def set_mode(mode):
+        monkeypatch.setattr(settings, "query_budget_mode", mode, raising=False)
+    return set_mode
+
+
+@pytest.fixture
+def tracked_db(sqlite_test_db):
+    """The test database, with its statements reported to the query tracker and the schema catalogue loaded."""
+    from src import database
+    from src.data import sqlite_db
+    event.listen(sqlite_test_db, "before_cursor_execute", sqlite_db._start_tracked_statement)
+    event.listen(sqlite_test_db, "after_cursor_execute", sqlite_db._end_tracked_statement)
+    database._schema_catalog.tables()
+    return sqlite_test_db
+
+
+class TestQueryTracker:
+    """Tests for QueryTracker and track_queries."""
+
+    def test_counts_time_and_shapes(self):
+        """Statements are counted with their time, grouped by shape whatever their values."""
+        with track_queries("on_farm_selected") as tracker:
+            track_statement("SELECT * FROM farms WHERE uuid IN (?, ?)", 0.002)
+            track_statement("SELECT * FROM farms WHERE uuid IN (?)", 0.001)
+            track_statement("GET /rest/v1/persons?select=*&uuid=eq.p-1", 0.003)
+        track_statement("SELECT 1", 1.0)
+
+        assert tracker.count == 3
+        assert tracker.db_ms == pytest.approx(6.0)
+        assert tracker.shapes()["SELECT * FROM farms WHERE uuid IN (...)"] == 2
+        assert tracker.shapes()["GET /rest/v1/persons?select=?&uuid=eq.?"] == 1
+
+    def test_nested_scopes_report_to_their_parent(self):
+        """Queries of a nested callback count for the enclosing one too."""
+        with track_queries("load_farms") as outer:
+            track_statement("SELECT * FROM farms", 0.0)
+            with track_queries("on_farm_selected") as inner:
+                track_statement("SELECT * FROM farms WHERE code = ?", 0.0)
+        assert (outer.count, inner.count) == (2, 1)
+
+    def test_repeated_shapes_are_n_plus_one(self):
+        """A shape repeated up to the threshold is reported as an N+1 pattern."""
+        tracker = QueryTracker("on_save_referent")
+        for _ in range(3):
+            tracker.record("SELECT * FROM persons WHERE uuid = ?", 0.0)
+        tracker.record("SELECT * FROM farms", 0.0)
+
+        assert tracker.repeated(threshold=3) == [("SELECT * FROM persons WHERE uuid = ?", 3)]
+        assert tracker.repeated(threshold=4) == []
+        assert tracker.violations(max_queries=4, n_plus_one=0) == []
+
+    def test_n_plus_one_threshold_comes_from_settings(self, monkeypatch):
+        """Without an explicit threshold, n_plus_one_threshold is used; 0 disables the check."""
+        from config import settings
+        tracker = QueryTracker("on_save_referent")
+        for _ in range(4):
+            tracker.record("SELECT * FROM persons WHERE uuid = ?", 0.0)
+
+        monkeypatch.setattr(settings, "n_plus_one_threshold", 5, raising=False)
+        assert tracker.repeated() == []
+        monkeypatch.setattr(settings, "n_plus_one_threshold", 4, raising=False)
+        assert tracker.violations() == ["N+1: 4 x SELECT * FROM persons WHERE uuid = ?"]
+        monkeypatch.setattr(settings, "n_plus_one_threshold", 0, raising=False)
+        assert tracker.violations() == []
+
+
+class TestQueryBudget:
+    """Tests for the query_budget decorator."""
+
+    def test_raise_mode(self, budget_mode):
+        """In raise mode, a callback over its budget fails with the offending shapes."""
+        budget_mode("raise")
+
+        @query_budget(max_queries=2)
+        def on_edit_referent(state):
+            for _ in range(3):
+                track_statement("SELECT * FROM persons WHERE uuid = ?", 0.0)
+
+        with pytest.raises(QueryBudgetExceeded) as error:
+            on_edit_referent(None)
+        assert "on_edit_referent: 3 queries (budget 2)" in str(error.value)
+        assert "N+1" not in str(error.value)
+
+    def test_n_plus_one_is_reported(self, budget_mode):
+        """A same-shape query issued in a loop fails even within the query budget."""
+        budget_mode("raise")
+
+        @query_budget(n_plus_one=3)
+        def load_referents(state):
+            for _ in range(3):
+                track_statement("SELECT * FROM farm_referents WHERE person_role_id = ?", 0.0)
+
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1: 3 x SELECT"):
+            load_referents(None)
+
+    def test_warn_and_off_modes(self, budget_mode, caplog):
+        """Warn mode logs the overrun, off mode ignores it; the callback result is kept."""
+        @query_budget(max_queries=0)
+        def on_save_general(state):
+            track_statement("UPDATE farms SET spv = ? WHERE uuid = ?", 0.0)
+            return "saved"
+
+        budget_mode("warn")
+        assert on_save_general(None) == "saved"
+        assert "Query budget exceeded by on_save_general" in caplog.text
+
+        caplog.clear()
+        budget_mode("off")
+        assert on_save_general(None) == "saved"
+        assert caplog.text == ""
+
+    def test_coroutines(self, budget_mode):
+        """Async callbacks are tracked once awaited."""
+        budget_mode("raise")
+
+        @query_budget(max_queries=1)
+        async def on_farm_selected(state):
+            track_statement("SELECT 1", 0.0)
+            track_statement("SELECT 2", 0.0)
+
+        with pytest.raises(QueryBudgetExceeded):
+            asyncio.run(on_farm_selected(None))
+
+
+class TestCallbackQueryCounts:
+    """Queries issued by the data paths of the Taipy callbacks (SQLite backend)."""
+
+    def _select_farm(self, database, code):
+        """The facade calls of on_farm_selected."""
+        farm = database.get_farm_by_code(code)
+        database.get_all_farm_data(farm['uuid'], view="farm_page")
+        database.get_farm_referents(farm['uuid'])
+        database.get_farm_companies(farm['uuid'])
+
+    def test_selecting_a_farm(self, tracked_db):
+        """Selecting a farm issues one query per data set and no N+1; reselecting it at most 3."""
+        from src import database
+        with track_queries("on_farm_selected") as first:
+            self._select_farm(database, "F001")
+        assert first.count <= 4, first.summary()
+        assert first.repeated(threshold=2) == []
+
+        with track_queries("on_farm_selected") as again:
+            self._select_farm(database, "F001")
+        assert again.count <= 3, again.summary()
+
+    def test_editing_a_referent(self, tracked_db):
+        """Opening the referent editor reads the persons and the farm referents."""
+        from src import database
+        with track_queries("on_edit_referent") as tracker:
+            database.execute_query("persons", order_by="last_name")
+            database.get_farm_referents("farm-1")
+        assert tracker.count <= 2, tracker.summary()
+
+    def test_saving_a_referent(self, tracked_db):
+        """Saving a referent stays within the budget declared on on_save_referent."""
+        from src import database
+        filters = {"farm_uuid": "farm-1", "person_role_id": 1}
+        with track_queries("on_save_referent") as tracker:
+            role = database.get_reference_by_name("person_roles", "Technical Manager")
+            with database.transaction() as tx:
+                persons = tx.execute_query("persons", columns="uuid", filters={"first_name": "John", "last_name": "Smith"})
+                assert tx.execute_query("farm_referents", columns="person_uuid", filters=filters)
+                tx.update_record("farm_referents", filters, {"person_uuid": persons[0]['uuid']})
+            database.get_farm_referents("farm-1")
+        assert role['id'] == 1
+        assert tracker.count <= 5, tracker.summary()
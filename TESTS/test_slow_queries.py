@@ -0,0 +1,192 @@
+"""
+Tests for the slow-query log (src/data/slow_queries.py): redaction, capture
+of the facade statements with their SQLite plan, and the summary CLI.
+"""
+
+import json
+import logging
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from src.data import slow_queries
+from src.data.slow_queries import SlowQueryLog, main, record_statement, redact_params, redact_url, summarize
+
+
+class ListHandler(logging.Handler):
+    """Collects the JSON records written to the slow-query logger."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def slow_log():
+    """Capture the slow-query log in memory instead of the rotating file."""
+    handler = ListHandler()
+    slow_queries._logger.addHandler(handler)
+    yield handler.records
+    slow_queries._logger.removeHandler(handler)
+
+
+class TestRedaction:
+    """Tests for the redaction of parameters and URLs."""
+
+    def test_params_bound_to_secret_columns(self):
+        """A parameter is masked when the column it filters is a secret, whatever its name."""
+        statement = "SELECT * FROM users WHERE email = :param_0 AND password_hash = :param_1 AND id IN (:p_0, :p_1)"
+        params = {"param_0": "a@b.fr", "param_1": "hash", "p_0": 1, "p_1": 2}
+        assert redact_params(statement, params) == {"param_0": "a@b.fr", "param_1": "***", "p_0": 1, "p_1": 2}
+
+    def test_params_named_or_shaped_as_secrets(self):
+        """Parameter names and JWT-like values are masked too, also for executemany lists."""
+        jwt = "eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxIn0.sig"
+        redacted = redact_params("INSERT INTO t VALUES (:api_key, :note)", [{"api_key": "k", "note": jwt}])
+        assert redacted == [{"api_key": "***", "note": "***"}]
+
+    def test_url(self):
+        """PostgREST filters on secret columns and apikey are masked, other filters kept."""
+        url = redact_url("https://x.supabase.co/rest/v1/users?select=*&email=eq.a@b.fr&password=eq.secret&apikey=k")
+        assert "email=eq.a@b.fr" in url
+        assert "password=***" in url
+        assert "apikey=***" in url
+        assert "secret" not in url.split("password")[1]
+
+
+class TestSlowQueryLog:
+    """Tests for SlowQueryLog.watched."""
+
+    def test_only_slow_calls_are_logged(self, slow_log):
+        """Calls under the threshold write nothing; statements of slow calls are kept."""
+        fast = SlowQueryLog(backend=lambda: "sqlite", threshold_ms=60_000)
+        slow = SlowQueryLog(backend=lambda: "sqlite", threshold_ms=1e-6)
+
+        def execute_query(table):
+            record_statement("SELECT * FROM farms WHERE code = :code", {"code": "F001"})
+            return [{"code": "F001"}]
+
+        fast.watched("select")(execute_query)("farms")
+        assert slow_log == []
+
+        slow.watched("select")(execute_query)("farms")
+        slow.flush()
+        record = slow_log[0]
+        assert (record['operation'], record['table'], record['rows'], record['error']) == ("select", "farms", 1, None)
+        assert record['statements'] == [{"statement": "SELECT * FROM farms WHERE code = :code",
+                                         "params": {"code": "F001"}}]
+        assert record['callback'].endswith("test_only_slow_calls_are_logged")
+
+    def test_statements_outside_watched_calls_are_ignored(self, slow_log):
+        """record_statement has no effect outside a watched call, and a disabled log writes nothing."""
+        record_statement("SELECT 1")
+        log = SlowQueryLog(backend=lambda: "sqlite", threshold_ms=0)
+        log.watched("select")(lambda table: [])("farms")
+        assert slow_log == []
+
+    def test_exceptions_are_logged_and_propagated(self, slow_log):
+        """A failing slow call is logged with its error."""
+        log = SlowQueryLog(backend=lambda: "sqlite", threshold_ms=1e-6)
+
+        @log.watched("rpc")
+        def execute_rpc(function_name):
+            raise NotImplementedError(function_name)
+
+        with pytest.raises(NotImplementedError):
+            execute_rpc("missing")
+        log.flush()
+        assert slow_log[0]['error'].startswith("NotImplementedError")
+
+    def test_plan_and_write_happen_after_the_call(self, slow_log):
+        """The call returns without waiting for the EXPLAIN; its duration does not include it."""
+        release = threading.Event()
+
+        def explain(statement, params):
+            release.wait(5)
+            return ["SCAN farms"]
+
+        log = SlowQueryLog(backend=lambda: "sqlite", explain=explain, threshold_ms=1e-6)
+
+        @log.watched("select")
+        def execute_query(table):
+            record_statement("SELECT * FROM farms")
+            return []
+
+        started = time.perf_counter()
+        execute_query("farms")
+        assert time.perf_counter() - started < 1
+        assert slow_log == []
+
+        release.set()
+        log.flush()
+        assert slow_log[0]['statements'][0]['plan'] == ["SCAN farms"]
+        assert slow_log[0]['duration_ms'] < 1000
+        assert slow_log[0]['callback'].endswith("test_plan_and_write_happen_after_the_call")
+
+    def test_inline_mode_writes_before_returning(self, slow_log):
+        """With background=False the entry is written when the call returns."""
+        log = SlowQueryLog(backend=lambda: "sqlite", threshold_ms=1e-6, background=False)
+        log.watched("select")(lambda table: [])("farms")
+        assert slow_log[0]['table'] == "farms"
+
+
+class TestFacadeSlowQueries:
+    """Tests for the slow-query log of the facade (SQLite backend)."""
+
+    def test_sql_and_plan_are_captured(self, sqlite_test_db, slow_log, monkeypatch):
+        """A slow facade select is logged with its SQL, parameters and EXPLAIN QUERY PLAN."""
+        from src import database
+        from src.data import sqlite_db
+        event.listen(sqlite_test_db, "before_execute", sqlite_db._record_for_slow_log)
+        database._schema_catalog.tables()
+        monkeypatch.setattr(database._slow_queries, "_threshold_ms", 1e-6)
+
+        database.execute_query("farms", filters={"code": "F001"})
+        database._slow_queries.flush()
+
+        record = slow_log[-1]
+        assert (record['backend'], record['table'], record['rows']) == ("sqlite", "farms", 1)
+        statement = record['statements'][0]
+        assert "FROM farms" in statement['statement']
+        assert "F001" in statement['params'].values()
+        assert any(line.startswith("SCAN farms") for line in statement['plan'])
+
+
+class TestSummary:
+    """Tests for the worst-offender summary."""
+
+    def _record(self, duration_ms, binds):
+        """A logged select on farms with an IN list of the given bind names."""
+        return {
+            "duration_ms": duration_ms, "operation": "select", "table": "farms", "callback": "app.on_change",
+            "statements": [{"statement": f"SELECT * FROM farms WHERE code IN ({', '.join(binds)})",
+                            "plan": ["SCAN farms"]}]
+        }
+
+    def test_variants_are_grouped_by_shape(self):
+        """Statements differing only by their values are one group, ranked by total time."""
+        records = [self._record(300, [":c_0"]), self._record(500, [":c_0", ":c_1"]),
+                   {"duration_ms": 400, "operation": "rpc", "table": "get_table_stats", "statements": []}]
+        summary = summarize(records)
+        assert summary[0]['shape'] == "SELECT * FROM farms WHERE code IN (...)"
+        assert (summary[0]['count'], summary[0]['total_ms'], summary[0]['max_ms']) == (2, 800, 500)
+        assert summary[0]['scans'] == ["SCAN farms"]
+        assert summary[0]['callbacks'] == ["app.on_change"]
+        assert summary[1]['table'] == "get_table_stats"
+
+    def test_cli_reads_rotated_files(self, tmp_path, capsys):
+        """The CLI reads the log and its rotated files."""
+        log_file = tmp_path / "slow_queries.log"
+        log_file.write_text(json.dumps(self._record(300, [":c_0"])) + "\n")
+        (tmp_path / "slow_queries.log.1").write_text(json.dumps(self._record(200, [":c_0", ":c_1"])) + "\nnot json\n")
+
+        assert main(["--file", str(log_file)]) == 0
+        output = capsys.readouterr().out
+        assert "2 calls" in output
+        assert "select farms" in output
+        assert "plan: SCAN farms" in output
@@ -0,0 +1,141 @@
+"""Tests for the SQLite backend (src/data/sqlite_db.py)."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def tuned_engines(tmp_path, monkeypatch):
+    """Build the real tuned engines against a temporary database file."""
+    from config import settings
+    from src.data import sqlite_db
+
+    db_path = tmp_path / "tuned.db"
+    sqlite3.connect(db_path).execute("CREATE TABLE farms (uuid TEXT PRIMARY KEY, code TEXT)").connection.close()
+
+    monkeypatch.setattr(settings, "db_path", str(db_path))
+    monkeypatch.setattr(sqlite_db, "_engine", None)
+    monkeypatch.setattr(sqlite_db, "_read_engine", None)
+    monkeypatch.setattr(sqlite_db, "_engine_profile", None)
+    yield sqlite_db
+    for engine in (sqlite_db._engine, sqlite_db._read_engine):
+        if engine is not None:
+            engine.dispose()
+
+
+class TestEngineProfile:
+    """Tests for the tuned SQLite engine."""
+
+    def test_pragmas_applied_on_connect(self, tuned_engines):
+        """Every pooled connection gets the configured pragmas."""
+        engine = tuned_engines.get_sqlite_engine()
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -20000
+
+    def test_pool_is_sized_from_settings(self, tuned_engines):
+        """The connection pool uses the configured size."""
+        engine = tuned_engines.get_sqlite_engine()
+        assert engine.pool.size() == tuned_engines.get_engine_profile()["pool_size"]
+
+    def test_read_only_engine_rejects_writes(self, tuned_engines):
+        """The mode=ro engine can read but not write."""
+        tuned_engines.get_sqlite_engine()  # create the file in WAL mode first
+        read_engine = tuned_engines.get_sqlite_engine(read_only=True)
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM farms")).scalar() == 0
+            with pytest.raises(Exception, match="readonly"):
+                conn.execute(text("INSERT INTO farms VALUES ('x', 'X')"))
+
+    def test_invalid_pragma_value(self, tuned_engines, monkeypatch):
+        """Textual pragmas are validated before being interpolated."""
+        monkeypatch.setattr(tuned_engines, "_ENGINE_DEFAULTS",
+                            {**tuned_engines._ENGINE_DEFAULTS, "synchronous": "NORMAL; DROP TABLE farms"})
+        from config import settings
+        monkeypatch.setattr(settings, "sqlite", {})
+        with pytest.raises(ValueError):
+            tuned_engines.get_engine_profile()
+
+
+class TestStatementCache:
+    """Tests for the compiled-statement cache."""
+
+    def test_where_params_match_build_where(self):
+        """The param-only path binds the same names and values as the SQL builder."""
+        from src.data.filters import any_of, between, in_, like
+        from src.data.sqlite_db import _build_where, _where_params
+        filters = {
+            "farm_uuid": in_(["a", "b"]),
+            "year": between(2015, 2020),
+            "or": any_of({"code": like("F%")}, {"spv": "x"})
+        }
+        assert _where_params(filters, "param") == _build_where(filters, "param")[1]
+
+    def test_repeated_query_shape_hits_cache(self, sqlite_test_db):
+        """Same shape with new values reuses the statement; a new shape misses."""
+        from src.data import sqlite_db
+        sqlite_db._statement_cache.clear()
+
+        sqlite_db.execute_query("farms", filters={"code": "F001"})
+        sqlite_db.execute_query("farms", filters={"code": "F002"})
+        assert sqlite_db.get_statement_cache_stats() == {'size': 1, 'hits': 1, 'misses': 1}
+
+        rows = sqlite_db.execute_query("farms", filters={"code": ["F001", "F002"]})
+        assert len(rows) == 2
+        assert sqlite_db.get_statement_cache_stats()['misses'] == 2
+
+    def test_writes_use_cache(self, sqlite_test_db):
+        """update/delete with the same shape reuse their statements."""
+        from src.data import sqlite_db
+        sqlite_db._statement_cache.clear()
+
+        sqlite_db.update_record("farms", {"uuid": "farm-1"}, {"spv": "A"})
+        sqlite_db.update_record("farms", {"uuid": "farm-2"}, {"spv": "B"})
+        # The UPDATE and its RETURNING variant are both reused
+        assert sqlite_db.get_statement_cache_stats()['hits'] == 2
+        assert sqlite_db.execute_query("farms", columns="spv", filters={"uuid": "farm-2"}) == [{'spv': 'B'}]
+
+
+class TestReturningWrites:
+    """Writes return the affected rows in the same statement."""
+
+    def test_insert_returns_row_without_uuid(self, sqlite_test_db):
+        """Tables without a uuid column still get their inserted row back."""
+        from src.database import insert_record
+        row = insert_record("farm_statuses", {"farm_uuid": "farm-2", "farm_status": "Construction"})
+        assert row == {"farm_uuid": "farm-2", "farm_code": None, "farm_status": "Construction"}
+
+    def test_update_and_delete_counts(self, sqlite_test_db):
+        """update/delete report affected-row counts, None on error."""
+        from src.database import delete_record, update_record
+        assert update_record("farm_referents", {"farm_uuid": "farm-1"}, {"farm_code": "F1"}) == 3
+        assert update_record("farm_referents", {"farm_uuid": "farm-9"}, {"farm_code": "F9"}) == 0
+        assert delete_record("farm_tariffs", {"farm_uuid": "farm-1"}) == 2
+        assert update_record("missing_table", {"uuid": "x"}, {"a": 1}) is None
+
+    def test_fallback_without_returning(self, sqlite_test_db, monkeypatch):
+        """Older SQLite versions re-read the written rows in the same transaction."""
+        from src.data import sqlite_db
+        monkeypatch.setattr(sqlite_db, "_SUPPORTS_RETURNING", False)
+        updated = sqlite_db.update_record("farm_referents", {"farm_uuid": "farm-1"}, {"farm_code": "F1"})
+        assert [row["farm_code"] for row in updated] == ["F1", "F1", "F1"]
+        assert len(sqlite_db.delete_record("farm_referents", {"farm_uuid": "farm-1"})) == 3
+        assert sqlite_db.insert_record("persons", {"uuid": "p-3"}) == {
+            "uuid": "p-3", "first_name": None, "last_name": None
+        }
+        row = sqlite_db.upsert_one("farm_types", "id", {"id": 1, "type_title": "Onshore"})
+        assert row == {"id": 1, "type_title": "Onshore"}
+
+    def test_returned_rows_target_invalidation(self, sqlite_test_db):
+        """Rows returned by an update invalidate only their own farm."""
+        from src import database
+        database.get_farm_contracts_admin("farm-1")
+        database.get_farm_contracts_admin("farm-2")
+        database.update_record("farm_administrations", {"account_number": "ACC-1"}, {"vat_number": "FR2"})
+        assert database._farm_cache.get("farm-1", "contracts_admin")[0] is False
+        assert database._farm_cache.get("farm-2", "contracts_admin")[0] is True
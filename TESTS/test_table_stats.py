@@ -0,0 +1,212 @@
+"""
+Tests for the table statistics: the snapshot cache (src/data/table_stats.py)
+the SQLite estimate/exact modes and the Supabase fallback.
+"""
+
+from unittest.mock import MagicMock
+
+from sqlalchemy import event, text
+
+from src.data.table_stats import TableStatsCache
+
+
+class FakeLoader:
+    """Loader returning a new row count on every call, or None when failing."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, exact):
+        self.calls.append(exact)
+        if self.fail:
+            return None
+        return [{"table_name": "farms", "column_count": 5, "row_count": len(self.calls), "estimated": not exact}]
+
+
+class TestTableStatsCache:
+    """Tests for TableStatsCache."""
+
+    def test_snapshot_is_reused(self):
+        """The first call loads, the next ones are served from memory."""
+        loader = FakeLoader()
+        cache = TableStatsCache(loader, ttl=60, background=False)
+        assert cache.get()[0]['row_count'] == 1
+        assert cache.get()[0]['row_count'] == 1
+        assert cache.get(exact=True)[0]['estimated'] is False
+        assert loader.calls == [False, True]
+
+    def test_write_serves_stale_then_refreshes(self):
+        """After invalidate(), the stale snapshot is returned while it is recomputed."""
+        loader = FakeLoader()
+        cache = TableStatsCache(loader, ttl=60, background=False)
+        cache.get()
+        cache.invalidate()
+        assert cache.get()[0]['row_count'] == 1
+        assert cache.get()[0]['row_count'] == 2
+        assert len(loader.calls) == 2
+
+    def test_ttl_expiry(self):
+        """A snapshot older than the TTL is refreshed."""
+        now = [0.0]
+        loader = FakeLoader()
+        cache = TableStatsCache(loader, ttl=60, clock=lambda: now[0], background=False)
+        cache.get()
+        now[0] = 61
+        cache.get()
+        assert cache.get()[0]['row_count'] == 2
+
+    def test_failed_refresh_keeps_snapshot(self):
+        """A failing refresh keeps serving the last good snapshot."""
+        loader = FakeLoader()
+        cache = TableStatsCache(loader, ttl=60, background=False)
+        cache.get()
+        loader.fail = True
+        cache.invalidate()
+        assert cache.get()[0]['row_count'] == 1
+        assert cache.get()[0]['row_count'] == 1
+
+    def test_failed_first_load(self):
+        """Without any snapshot, a failing load returns None."""
+        assert TableStatsCache(lambda exact: None, ttl=60).get() is None
+
+    def test_write_during_load_keeps_snapshot_stale(self):
+        """A write that overlaps a load forces another refresh."""
+        cache = None
+
+        def loader(exact):
+            cache.invalidate()
+            return [{"table_name": "farms", "column_count": 5, "row_count": 0, "estimated": True}]
+
+        cache = TableStatsCache(loader, ttl=60, background=False)
+        cache.get()
+        assert cache._snapshots["estimate"]['stale'] is True
+
+
+class TestSqliteTableStats:
+    """Tests for sqlite_db.get_table_stats."""
+
+    def test_exact_counts(self, sqlite_test_db):
+        """Exact mode counts every table."""
+        from src.data.sqlite_db import get_table_stats
+        stats = {row['table_name']: row for row in get_table_stats(exact=True)}
+        assert stats['farms'] == {"table_name": "farms", "column_count": 5, "row_count": 2, "estimated": False}
+        assert stats['farm_tariffs']['row_count'] == 2
+
+    def test_estimates_follow_writes_after_analyze(self, sqlite_test_db):
+        """Estimates come from MAX(rowid), not sqlite_stat1: rows written after ANALYZE are seen."""
+        from src.data.sqlite_db import get_table_stats
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.execute(text("INSERT INTO farms (uuid, code) VALUES ('farm-3', 'F003')"))
+
+        stats = {row['table_name']: row for row in get_table_stats()}
+        assert stats['farms']['row_count'] == 3
+        assert stats['farms']['estimated'] is True
+        assert stats['farm_tcma_contracts']['row_count'] == 0
+
+    def test_estimate_mode_issues_two_queries(self, sqlite_test_db):
+        """The schema and all the estimates are read in two statements, whatever the number of tables."""
+        from src.data import sqlite_db
+        from src.data.query_budget import track_queries
+        event.listen(sqlite_test_db, "before_cursor_execute", sqlite_db._start_tracked_statement)
+        event.listen(sqlite_test_db, "after_cursor_execute", sqlite_db._end_tracked_statement)
+        with track_queries() as tracker:
+            sqlite_db.get_table_stats()
+        assert tracker.count == 2
+
+    def test_without_rowid_tables_are_counted(self, sqlite_test_db):
+        """A WITHOUT ROWID table has no rowid to estimate from: it is counted."""
+        from src.data.sqlite_db import get_table_stats
+        with sqlite_test_db.begin() as conn:
+            conn.execute(text("CREATE TABLE farm_tags (farm_uuid TEXT, tag TEXT, PRIMARY KEY (farm_uuid, tag))"
+                              " WITHOUT ROWID"))
+            conn.execute(text("INSERT INTO farm_tags VALUES ('farm-1', 'north'), ('farm-1', 'coast')"))
+
+        stats = {row['table_name']: row for row in get_table_stats()}
+        assert (stats['farm_tags']['row_count'], stats['farm_tags']['estimated']) == (2, False)
+        assert stats['farms']['estimated'] is True
+
+    def test_rpc_keeps_exact_counts(self, sqlite_test_db):
+        """The backend RPC still returns exact counts."""
+        from src.data.sqlite_db import execute_rpc
+        stats = {row['table_name']: row for row in execute_rpc("get_table_stats")}
+        assert stats['persons']['row_count'] == 2
+
+
+class TestFacadeTableStats:
+    """Tests for the facade snapshot."""
+
+    def test_rpc_served_from_snapshot_and_refreshed_on_write(self, sqlite_test_db, monkeypatch):
+        """execute_rpc reuses the snapshot until a write marks it stale."""
+        from src import database
+        from src.data import sqlite_db
+
+        loads = []
+
+        def loader(exact):
+            loads.append(exact)
+            return sqlite_db.get_table_stats(exact=True)
+
+        monkeypatch.setattr(database, "_table_stats", TableStatsCache(loader, ttl=600, background=False))
+
+        def farm_count():
+            return {row['table_name']: row['row_count'] for row in database.execute_rpc("get_table_stats")}['farms']
+
+        assert farm_count() == 2
+        assert farm_count() == 2
+        assert len(loads) == 1
+
+        database.insert_record("farms", {"uuid": "farm-3", "code": "F003"})
+        assert farm_count() == 2  # stale snapshot, refreshed on this call
+        assert farm_count() == 3
+        assert len(loads) == 2
+
+    def test_overview_follows_bulk_insert_after_migrate(self, sqlite_test_db, monkeypatch):
+        """After migrate() (and its ANALYZE), the overview still reflects new rows."""
+        from src import database
+        from src.data.migrations import migrate
+
+        migrate(sqlite_test_db)
+        monkeypatch.setattr(database, "_table_stats", TableStatsCache(
+            lambda exact: database.db.get_table_stats(exact), ttl=600, background=False
+        ))
+
+        def farms():
+            return {row['table_name']: row for row in database.execute_rpc("get_table_stats")}['farms']
+
+        assert farms()['row_count'] == 2
+        database.insert_many("farms", [{"uuid": f"farm-{i}", "code": f"F{i:04d}"} for i in range(3, 503)])
+        farms()  # stale snapshot, refreshed on this call
+        assert farms() == {"table_name": "farms", "column_count": 5, "row_count": 502, "estimated": True}
+
+
+class TestSupabaseTableStats:
+    """Tests for supabase_db.get_table_stats."""
+
+    def test_falls_back_to_get_table_stats(self, monkeypatch):
+        """Without get_table_estimates on the project (PGRST202), the get_table_stats RPC is read."""
+        from postgrest.exceptions import APIError
+        from src.data import supabase_db
+        client = MagicMock()
+        responses = {
+            "get_table_estimates": APIError({"code": "PGRST202", "message": "not found"}),
+            "get_table_stats": [{"table_name": "farms", "column_count": 5, "row_count": 2}]
+        }
+
+        def rpc(name):
+            call = MagicMock()
+            if isinstance(responses[name], Exception):
+                call.execute.side_effect = responses[name]
+            else:
+                call.execute.return_value.data = responses[name]
+            return call
+
+        client.rpc.side_effect = rpc
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+        assert supabase_db.get_table_stats() == [
+            {"table_name": "farms", "column_count": 5, "row_count": 2, "estimated": False}
+        ]
+
+        responses["get_table_estimates"] = APIError({"code": "42501", "message": "denied"})
+        assert supabase_db.get_table_stats() is None
@@ -0,0 +1,100 @@
+"""Tests for the unit-of-work transaction context."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class TestSQLiteTransaction:
+    """One connection, one commit."""
+
+    def test_commit_applies_all_writes(self, sqlite_test_db):
+        """Writes are visible to later reads in the block and committed together."""
+        from src.database import execute_query, transaction
+        with transaction() as tx:
+            tx.insert_record("persons", {"uuid": "p-3", "first_name": "Ann", "last_name": "Lee"})
+            assert tx.execute_query("persons", filters={"uuid": "p-3"})[0]["last_name"] == "Lee"
+            tx.update_record("farm_referents", {"farm_uuid": "farm-1", "person_role_id": 3}, {"person_uuid": "p-3"})
+        rows = execute_query("farm_referents", filters={"farm_uuid": "farm-1", "person_role_id": 3})
+        assert rows[0]["person_uuid"] == "p-3"
+
+    def test_error_rolls_back(self, sqlite_test_db):
+        """An exception in the block leaves nothing applied."""
+        from src.database import execute_query, transaction
+        with pytest.raises(RuntimeError):
+            with transaction() as tx:
+                tx.insert_record("persons", {"uuid": "p-3", "first_name": "Ann", "last_name": "Lee"})
+                tx.delete_record("farm_referents", {"farm_uuid": "farm-1"})
+                raise RuntimeError("abort")
+        assert execute_query("persons", filters={"uuid": "p-3"}) == []
+        assert len(execute_query("farm_referents", filters={"farm_uuid": "farm-1"})) == 3
+
+    def test_commit_invalidates_caches(self, sqlite_test_db):
+        """Cached sections touched by the transaction are dropped after commit."""
+        from src.database import get_farm_contracts_admin, transaction
+        assert get_farm_contracts_admin("farm-1")["administrations"]["account_number"] == "ACC-1"
+        with transaction() as tx:
+            tx.update_record("farm_administrations", {"farm_uuid": "farm-1"}, {"account_number": "ACC-9"})
+        assert get_farm_contracts_admin("farm-1")["administrations"]["account_number"] == "ACC-9"
+
+
+class TestSupabaseUnitOfWork:
+    """Queued writes sent as one RPC."""
+
+    def test_single_rpc_on_commit(self, monkeypatch):
+        """All writes go out in one apply_unit_of_work call."""
+        from src.data import supabase_db
+        client = MagicMock()
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+
+        unit = supabase_db.UnitOfWork()
+        unit.insert_record("persons", {"uuid": "p-3"})
+        unit.update_record("farm_referents", {"farm_uuid": "farm-1", "person_role_id": 3}, {"person_uuid": "p-3"})
+        unit.delete_record("farm_referents", {"farm_uuid": "farm-2"})
+        client.rpc.assert_not_called()
+
+        unit.commit()
+        client.rpc.assert_called_once()
+        name, payload = client.rpc.call_args.args
+        assert name == "apply_unit_of_work"
+        assert [op["op"] for op in payload["ops"]] == ["insert", "update", "delete"]
+        assert payload["ops"][1]["filters"] == {"farm_uuid": "farm-1", "person_role_id": 3}
+
+    def test_one_by_one_without_the_function(self, monkeypatch):
+        """Without apply_unit_of_work on the project (PGRST202), the writes are sent one by one."""
+        from postgrest.exceptions import APIError
+        from src.data import supabase_db
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = APIError({"code": "PGRST202", "message": "not found"})
+        monkeypatch.setattr(supabase_db, "init_supabase_connection", lambda: client)
+        table = client.table.return_value
+        table.insert.return_value.execute.return_value.data = [{"uuid": "p-3"}]
+        table.update.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+
+        unit = supabase_db.UnitOfWork()
+        unit.insert_record("persons", {"uuid": "p-3"})
+        unit.update_record("farm_referents", {"farm_uuid": "farm-1", "person_role_id": 3}, {"person_uuid": "p-3"})
+        unit.commit()
+        table.insert.assert_called_once()
+        table.update.return_value.eq.return_value.eq.assert_called_with("person_role_id", 3)
+
+        client.rpc.return_value.execute.side_effect = APIError({"code": "42501", "message": "denied"})
+        unit.delete_record("farm_referents", {"farm_uuid": "farm-2"})
+        with pytest.raises(APIError):
+            unit.commit()
+        table.delete.assert_not_called()
+
+    def test_rejects_empty_filters(self):
+        """An update or delete without filters would reach the whole table: it is refused."""
+        from src.data.supabase_db import UnitOfWork
+        with pytest.raises(ValueError):
+            UnitOfWork().delete_record("farm_referents", {})
+        with pytest.raises(ValueError):
+            UnitOfWork().update_record("farm_referents", {}, {"person_uuid": None})
+
+    def test_rejects_non_equality_filters(self):
+        """Only equality filters can be sent to the RPC."""
+        from src.data.filters import gte
+        from src.data.supabase_db import UnitOfWork
+        with pytest.raises(ValueError):
+            UnitOfWork().delete_record("farm_tariffs", {"tariff_start_date": gte("2020-01-01")})
@@ -4,20 +4,23 @@ Taipy version (migrated from Streamlit)
 """
 
 import uuid as uuid_lib
+import pandas as pd
 from taipy.gui import Gui, State, notify
 from config import settings
 from src.auth.manager import auth_manager
+from src.data.query_budget import query_budget
 from src.database import (
     get_all_farms,
     get_farm_by_code,
-    get_farm_general_info,
-    get_farm_technical_details,
-    get_farm_contracts_admin,
-    get_farm_performance_data,
+    get_all_farm_data,
+    get_farm_referents,
+    get_farm_companies,
+    get_reference_rows,
+    get_reference_by_name,
     execute_query,
     update_record,
-    insert_record,
-    delete_record
+    transaction,
+    upsert_one
 )
 
 # ==================== STATE VARIABLES ====================
@@ -58,6 +61,26 @@ ref_electrical = "N/A"
 ref_field_crew = "N/A"
 ref_asset_manager = "N/A"
 
+# Services Tab
+SERVICE_ROLES = [
+    "OM Main Service Company",
+    "OM Service Provider",
+    "WTG Service Provider",
+    "Substation Service Provider",
+    "Grid Operator",
+    "Energy Trader",
+    "Asset Manager",
+    "Project Developer",
+    "Legal Representative",
+    "Chartered Accountant",
+    "Legal Auditor",
+    "Bank Domiciliation",
+    "Customer",
+    "Co-developer",
+    "Portfolio"
+]
+services_data = pd.DataFrame(columns=["Role", "Company"])
+
 # Contracts Tab
 admin_data = {}
 om_contract = {}
@@ -176,6 +199,8 @@ def on_show_reset(state: State):
 
 
 # ==================== FARM FUNCTIONS ====================
+# Farm list + first farm selection
+@query_budget(max_queries=6)
 def load_farms(state: State):
     try:
         farms = get_all_farms()
@@ -186,6 +211,8 @@ def load_farms(state: State):
         notify(state, "error", f"Erreur chargement farms: {str(e)}")
 
 
+# Farm by code, bundle (cached per farm), referents, companies (+ schema catalogue on first use)
+@query_budget(max_queries=5)
 def on_farm_selected(state: State, var_name: str, value):
     if value:
         farm_code = value.split(" - ")[0]
@@ -202,8 +229,10 @@ def on_farm_selected(state: State, var_name: str, value):
 
 def load_farm_data(state: State, farm_uuid: str):
     """Load all data for the selected farm."""
+    all_data = get_all_farm_data(farm_uuid, view="farm_page")
+
     # General Info
-    general = get_farm_general_info(farm_uuid)
+    general = all_data['general_info']
     farm = general.get('farm', {}) or {}
     farm_type_data = general.get('farm_type', {}) or {}
     status = general.get('status', {}) or {}
@@ -225,20 +254,25 @@ def load_farm_data(state: State, farm_uuid: str):
     # Referents
     load_referents(state, farm_uuid)
 
+    # Services
+    load_services(state, farm_uuid)
+
     # Contracts
-    contracts = get_farm_contracts_admin(farm_uuid)
+    contracts = all_data['contracts_admin']
     state.admin_data = contracts.get('administrations', {}) or {}
     state.om_contract = contracts.get('om_contracts', {}) or {}
     state.tcma_contract = contracts.get('tcma_contracts', {}) or {}
 
     # Performance
-    state.performance_data = get_farm_performance_data(farm_uuid)
+    state.performance_data = all_data['performance_data']
 
 
 def load_referents(state: State, farm_uuid: str):
     """Load referents for the farm."""
+    referents = get_farm_referents(farm_uuid)
+
     def get_name(role):
-        person = get_person_by_role(farm_uuid, role)
+        person = referents.get(role)
         if person:
             return f"{person.get('first_name', '')} {person.get('last_name', '')}"
         return "N/A"
@@ -251,19 +285,16 @@ def load_referents(state: State, farm_uuid: str):
     state.ref_asset_manager = get_name("Asset Manager")
 
 
-def get_person_by_role(farm_uuid: str, role_name: str) -> dict:
-    """Get a person by their role for a specific farm."""
-    role = execute_query("person_roles", filters={"role_name": role_name})
-    if not role:
-        return {}
-
-    role_id = role[0]['id']
-    referent = execute_query("farm_referents", filters={"farm_uuid": farm_uuid, "person_role_id": role_id})
-    if not referent or not referent[0].get('person_uuid'):
-        return {}
-
-    person = execute_query("persons", filters={"uuid": referent[0]['person_uuid']})
-    return person[0] if person else {}
+def load_services(state: State, farm_uuid: str):
+    """Load service providers and partners for the farm."""
+    companies = get_farm_companies(farm_uuid)
+    state.services_data = pd.DataFrame(
+        [
+            {"Role": role, "Company": (companies.get(role) or {}).get('name', 'N/A') or 'N/A'}
+            for role in SERVICE_ROLES
+        ],
+        columns=["Role", "Company"]
+    )
 
 
 # ==================== GENERAL INFO EDITING ====================
@@ -279,15 +310,17 @@ def on_edit_project(state: State):
     state.edit_project = state.farm_project if state.farm_project != "N/A" else ""
 
 
+@query_budget(max_queries=1)
 def on_edit_farm_type(state: State):
     """Start editing Farm Type field."""
     state.editing_general_field = "farm_type"
     # Load farm types
-    farm_types = execute_query("farm_types") or []
+    farm_types = get_reference_rows("farm_types")
     state.farm_type_options = [ft['type_title'] for ft in farm_types]
     state.selected_farm_type = state.farm_type if state.farm_type in state.farm_type_options else (state.farm_type_options[0] if state.farm_type_options else "")
 
 
+@query_budget(max_queries=2)
 def on_save_general(state: State):
     """Save the edited general info field."""
     if not state.selected_farm_uuid:
@@ -308,9 +341,9 @@ def on_save_general(state: State):
 
         elif state.editing_general_field == "farm_type":
             # Get farm type ID
-            farm_types = execute_query("farm_types", filters={"type_title": state.selected_farm_type})
-            if farm_types:
-                update_record("farms", {"uuid": state.selected_farm_uuid}, {"farm_type_id": farm_types[0]['id']})
+            farm_type = get_reference_by_name("farm_types", state.selected_farm_type)
+            if farm_type:
+                update_record("farms", {"uuid": state.selected_farm_uuid}, {"farm_type_id": farm_type['id']})
                 state.farm_type = state.selected_farm_type
                 notify(state, "success", "Farm type updated")
 
@@ -332,6 +365,8 @@ def load_all_persons(state: State):
     state.all_persons_list = ["N/A"] + [f"{p['first_name']} {p['last_name']}" for p in persons]
 
 
+# Person list + farm referents
+@query_budget(max_queries=2)
 def on_edit_referent(state: State, role_name: str):
     """Start editing a referent."""
     state.editing_referent_role = role_name
@@ -341,7 +376,7 @@ def on_edit_referent(state: State, role_name: str):
     load_all_persons(state)
 
     # Find current person for this role
-    person = get_person_by_role(state.selected_farm_uuid, role_name)
+    person = get_farm_referents(state.selected_farm_uuid).get(role_name)
     if person:
         state.selected_person = f"{person.get('first_name', '')} {person.get('last_name', '')}"
     else:
@@ -377,6 +412,8 @@ def on_toggle_new_person(state: State):
     state.show_new_person_form = not state.show_new_person_form
 
 
+# Person lookup/insert, referent check and write, referents refresh
+@query_budget(max_queries=5)
 def on_save_referent(state: State):
     """Save the edited referent."""
     if not state.selected_farm_uuid or not state.editing_referent_role:
@@ -386,64 +423,60 @@ def on_save_referent(state: State):
         role_name = state.editing_referent_role
 
         # Get role ID
-        role = execute_query("person_roles", filters={"role_name": role_name})
+        role = get_reference_by_name("person_roles", role_name)
         if not role:
             notify(state, "error", f"Role '{role_name}' not found")
             return
-        role_id = role[0]['id']
-
-        # Handle new person creation
-        if state.show_new_person_form and state.new_person_first and state.new_person_last:
-            new_uuid = str(uuid_lib.uuid4())
-            insert_record("persons", {
-                "uuid": new_uuid,
-                "first_name": state.new_person_first,
-                "last_name": state.new_person_last
-            })
-            person_uuid = new_uuid
-            notify(state, "info", f"Created new person: {state.new_person_first} {state.new_person_last}")
-        elif state.selected_person == "N/A":
-            person_uuid = None
-        else:
-            # Find person UUID by name
-            parts = state.selected_person.split(" ", 1)
-            if len(parts) == 2:
-                persons = execute_query("persons", filters={"first_name": parts[0], "last_name": parts[1]})
-                person_uuid = persons[0]['uuid'] if persons else None
-            else:
+        role_id = role['id']
+
+        farm_uuid = state.selected_farm_uuid
+        referent_filters = {"farm_uuid": farm_uuid, "person_role_id": role_id}
+        created_person = False
+
+        # All reads and writes of the save share one transaction (single commit)
+        with transaction() as tx:
+            # Handle new person creation
+            if state.show_new_person_form and state.new_person_first and state.new_person_last:
+                person_uuid = str(uuid_lib.uuid4())
+                tx.insert_record("persons", {
+                    "uuid": person_uuid,
+                    "first_name": state.new_person_first,
+                    "last_name": state.new_person_last
+                })
+                created_person = True
+            elif state.selected_person == "N/A":
                 person_uuid = None
-
-        # Check existing referent
-        existing = execute_query("farm_referents", filters={
-            "farm_uuid": state.selected_farm_uuid,
-            "person_role_id": role_id
-        })
-
-        if person_uuid is None:
-            # Delete if exists
-            if existing:
-                delete_record("farm_referents", {
-                    "farm_uuid": state.selected_farm_uuid,
-                    "person_role_id": role_id
+            else:
+                # Find person UUID by name
+                parts = state.selected_person.split(" ", 1)
+                if len(parts) == 2:
+                    persons = tx.execute_query("persons", columns="uuid",
+                                               filters={"first_name": parts[0], "last_name": parts[1]})
+                    person_uuid = persons[0]['uuid'] if persons else None
+                else:
+                    person_uuid = None
+
+            # Check existing referent
+            existing = bool(tx.execute_query("farm_referents", columns="person_uuid", filters=referent_filters))
+
+            if person_uuid is None:
+                # Delete if exists
+                if existing:
+                    tx.delete_record("farm_referents", referent_filters)
+            elif existing:
+                # Update existing
+                tx.update_record("farm_referents", referent_filters, {"person_uuid": person_uuid})
+            else:
+                # Insert new (farm code comes from the loaded farm)
+                tx.insert_record("farm_referents", {
+                    "farm_uuid": farm_uuid,
+                    "farm_code": state.farm_code if state.farm_code != "N/A" else "",
+                    "person_role_id": role_id,
+                    "person_uuid": person_uuid
                 })
-        elif existing:
-            # Update existing
-            update_record("farm_referents",
-                {"farm_uuid": state.selected_farm_uuid, "person_role_id": role_id},
-                {"person_uuid": person_uuid}
-            )
-        else:
-            # Get farm code for insert
-            farm = execute_query("farms", filters={"uuid": state.selected_farm_uuid})
-            farm_code = farm[0]['code'] if farm else ""
-
-            # Insert new
-            insert_record("farm_referents", {
-                "farm_uuid": state.selected_farm_uuid,
-                "farm_code": farm_code,
-                "person_role_id": role_id,
-                "person_uuid": person_uuid
-            })
+
+        if created_person:
+            notify(state, "info", f"Created new person: {state.new_person_first} {state.new_person_last}")
 
         # Refresh referents display
         load_referents(state, state.selected_farm_uuid)
@@ -474,19 +507,17 @@ def on_edit_location(state: State):
     state.edit_arras_distance = float(loc.get('arras_round_trip_distance_km', 0) or 0)
 
 
+# Upsert (+ unique-key lookup on first use)
+@query_budget(max_queries=4)
 def on_save_location(state: State):
     """Save location changes."""
     if not state.selected_farm_uuid:
         return
 
     try:
-        # Get farm code
-        farm = execute_query("farms", filters={"uuid": state.selected_farm_uuid})
-        farm_code = farm[0]['code'] if farm else ""
-
         location_data = {
             "farm_uuid": state.selected_farm_uuid,
-            "farm_code": farm_code,
+            "farm_code": state.farm_code if state.farm_code != "N/A" else "",
             "country": state.edit_country,
             "region": state.edit_region,
             "department": state.edit_department,
@@ -495,13 +526,10 @@ def on_save_location(state: State):
             "arras_round_trip_distance_km": state.edit_arras_distance
         }
 
-        # Check if location exists
-        existing = execute_query("farm_locations", filters={"farm_uuid": state.selected_farm_uuid})
-
-        if existing:
-            update_record("farm_locations", {"farm_uuid": state.selected_farm_uuid}, location_data)
-        else:
-            insert_record("farm_locations", location_data)
+        # Insert or update the farm's single location row in one statement
+        if upsert_one("farm_locations", "farm_uuid", location_data) is None:
+            notify(state, "error", "Error saving location")
+            return
 
         # Update display
         state.farm_country = state.edit_country or "N/A"
@@ -916,7 +944,11 @@ First: <|{new_person_first}|input|> Last: <|{new_person_last}|input|>
 
 ### Services
 
-*Liste des prestataires en cours de developpement...*
+<|part|class_name=section-title|
+**Service Providers & Partners**
+|>
+
+<|{services_data}|table|show_all=True|>
 
 |>
 
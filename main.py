@@ -4,10 +4,23 @@ WNDMNGR - Main entry point for cloud deployment (Render, etc.)
 import os
 # Import EVERYTHING from app (variables, functions, page)
 from app import *
+from flask import Flask, Response
 from taipy.gui import Gui
 
+from src.database import render_query_metrics
+
+# Flask server hosting the Taipy GUI, plus a Prometheus scrape endpoint
+server = Flask(__name__)
+
+
+@server.route("/metrics")
+def metrics():
+    """Latency histograms and call counters of the data facade (Prometheus text format)"""
+    return Response(render_query_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Create the GUI instance
-gui = Gui(page=page)
+gui = Gui(page=page, flask=server)
 
 # Get port from environment variable (Render sets this)
 port = int(os.environ.get("PORT", 5000))
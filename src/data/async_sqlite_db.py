@@ -0,0 +1,48 @@
+"""Async SQLite implementation - thread-offloaded calls to the sync SQLite backend"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from src.data import sqlite_db
+
+# sqlite3 n'a pas d'API asynchrone : chaque appel est exécuté dans un thread du
+# pool par défaut de la boucle. Le moteur (QueuePool, check_same_thread=False)
+# sert déjà des connexions à plusieurs threads, donc des lectures lancées avec
+# asyncio.gather s'exécutent réellement en parallèle en mode WAL.
+
+
+async def execute_rpc(function_name: str) -> Any:
+    """Exécute une fonction RPC SQLite hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.execute_rpc, function_name)
+
+
+async def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None,
+                        order_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> Any:
+    """Exécute une requête SELECT SQLite hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.execute_query, table, columns, filters, order_by, limit, offset)
+
+
+async def update_record(table: str, filters: dict, data: dict) -> Optional[List[dict]]:
+    """Met à jour un enregistrement SQLite hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.update_record, table, filters, data)
+
+
+async def insert_record(table: str, data: dict) -> Optional[dict]:
+    """Insère un enregistrement SQLite hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.insert_record, table, data)
+
+
+async def delete_record(table: str, filters: dict) -> Optional[List[dict]]:
+    """Supprime un enregistrement SQLite hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.delete_record, table, filters)
+
+
+async def get_farm_bundle(farm_uuid: str,
+                          columns: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, List[dict]]]:
+    """Récupère le bundle d'un farm (UNION ALL) hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.get_farm_bundle, farm_uuid, columns)
+
+
+async def get_role_assignments(link_table: str, farm_uuids: List[str]) -> Optional[List[dict]]:
+    """Résout les rôles d'une table de liaison hors de la boucle d'événements"""
+    return await asyncio.to_thread(sqlite_db.get_role_assignments, link_table, farm_uuids)
@@ -0,0 +1,204 @@
+"""Async Supabase implementation - native asyncio client"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import httpx
+from postgrest.types import CountMethod, ReturnMethod
+from supabase import AsyncClient, acreate_client
+
+from config import settings
+from src.data.query_budget import tracking
+from src.data.slow_queries import record_request
+from src.data.supabase_db import (
+    apply_filters,
+    farm_bundle_query,
+    get_supabase_credentials,
+    in_batches,
+    merge_batches,
+    parse_farm_bundle,
+    parse_role_assignments,
+    next_page_ranges,
+    paging_order,
+    role_assignments_query,
+    select_query,
+    track_response,
+    watch_requests
+)
+
+# One async client per event loop: its httpx connections are bound to the loop
+# that opened them, so a client cannot be reused from another loop (asyncio.run
+# per callback, scripts). Entries go away with their loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+async def init_supabase_connection() -> AsyncClient:
+    """Initialise la connexion au client Supabase asynchrone de la boucle courante"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        supabase_url, supabase_key = get_supabase_credentials()
+        try:
+            client = await acreate_client(supabase_url, supabase_key)
+        except Exception as e:
+            logging.error(f"Error initializing async Supabase client: {e}")
+            raise
+        _clients[loop] = client
+
+    watch_requests(client.postgrest.session, _record_request, _record_response)
+    return client
+
+
+async def _record_request(request: httpx.Request) -> None:
+    """Hook httpx : transmet la requête PostgREST au journal des requêtes lentes et la chronomètre"""
+    record_request(request.method, str(request.url), request.content)
+    if tracking():
+        request.extensions['query_started'] = time.perf_counter()
+
+
+async def _record_response(response: httpx.Response) -> None:
+    """Hook httpx : transmet la requête et sa durée au budget de requêtes du callback en cours"""
+    track_response(response)
+
+
+async def execute_rpc(function_name: str) -> Any:
+    """Exécute une fonction RPC Supabase"""
+    client = await init_supabase_connection()
+    response = await client.rpc(function_name).execute()
+    return response.data
+
+
+async def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None,
+                        order_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> Any:
+    """
+    Exécute une requête SELECT sur une table Supabase, page par page
+
+    Une page incomplète est la dernière ; après une première page pleine, la
+    deuxième donne une estimation du nombre de lignes et les pages suivantes
+    sont lues simultanément, triées sur order_by puis sur la clé de la table ;
+    un filtre IN trop long est lu par lots (voir supabase_db.execute_query).
+    """
+    if limit is not None and limit <= 0:
+        return []
+    batches = in_batches(filters)
+    if batches is not None:
+        window = None if limit is None else offset + limit
+        semaphore = asyncio.Semaphore(int(settings.get('db_page_fanout', 4)))
+
+        async def read_batch(batch: dict) -> Any:
+            async with semaphore:
+                return await execute_query(table, columns, batch, order_by, window)
+
+        results = await asyncio.gather(*(read_batch(batch) for batch in batches))
+        if any(rows is None for rows in results):
+            logging.error(f"Error querying table {table}: an IN batch could not be read")
+            return None
+        return await asyncio.to_thread(merge_batches, table, list(results), order_by, limit, offset)
+    try:
+        client = await init_supabase_connection()
+        semaphore = asyncio.Semaphore(int(settings.get('db_page_fanout', 4)))
+        # The schema (with the table keys) is read over HTTP on the first call only
+        order = await asyncio.to_thread(paging_order, table, order_by)
+
+        async def read_page(page: Tuple[int, int], count: Optional[CountMethod] = None) -> Any:
+            async with semaphore:
+                return await select_query(client, table, columns, filters, order, count).range(*page).execute()
+
+        rows: List[dict] = []
+        estimate: Optional[int] = None
+        while True:
+            ranges = next_page_ranges(len(rows), limit, offset, estimate)
+            if not ranges:
+                return rows
+            # The page after a full first page also brings the estimated row count
+            count = CountMethod.estimated if rows and estimate is None else None
+            responses = await asyncio.gather(*(read_page(page, count) for page in ranges))
+            if count is not None:
+                estimate = responses[0].count
+            for (start, end), response in zip(ranges, responses):
+                rows.extend(response.data)
+                if len(response.data) < end - start + 1:
+                    return rows
+    except Exception as e:
+        logging.error(f"Error querying table {table}: {e}")
+        return None
+
+
+async def update_record(table: str, filters: dict, data: dict) -> Optional[List[dict]]:
+    """Met à jour des enregistrements Supabase ; retourne les lignes modifiées ou None"""
+    try:
+        client = await init_supabase_connection()
+        query = apply_filters(client.table(table).update(data, returning=ReturnMethod.representation), filters)
+        response = await query.execute()
+        return list(response.data or [])
+    except Exception as e:
+        logging.error(f"Error updating table {table}: {e}")
+        return None
+
+
+async def insert_record(table: str, data: dict) -> Optional[dict]:
+    """Insère un nouvel enregistrement dans une table Supabase"""
+    try:
+        client = await init_supabase_connection()
+        response = await client.table(table).insert(data, returning=ReturnMethod.representation).execute()
+        return cast(dict, response.data[0]) if response.data else None
+    except Exception as e:
+        logging.error(f"Error inserting into table {table}: {e}")
+        return None
+
+
+async def delete_record(table: str, filters: dict) -> Optional[List[dict]]:
+    """Supprime des enregistrements Supabase ; retourne les lignes supprimées ou None"""
+    try:
+        client = await init_supabase_connection()
+        query = apply_filters(client.table(table).delete(returning=ReturnMethod.representation), filters)
+        response = await query.execute()
+        return list(response.data or [])
+    except Exception as e:
+        logging.error(f"Error deleting from table {table}: {e}")
+        return None
+
+
+async def get_farm_bundle(farm_uuid: str,
+                          columns: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, List[dict]]]:
+    """
+    Récupère toutes les lignes liées à un farm en une seule requête Supabase
+
+    Returns:
+        Dict {table: [rows]}, voir supabase_db.get_farm_bundle, ou None en cas d'erreur
+    """
+    try:
+        client = await init_supabase_connection()
+        response = await farm_bundle_query(client, farm_uuid, columns).execute()
+        return parse_farm_bundle(response.data)
+    except Exception as e:
+        logging.error(f"Error loading bundle for farm {farm_uuid}: {e}")
+        return None
+
+
+async def get_role_assignments(link_table: str, farm_uuids: List[str]) -> Optional[List[dict]]:
+    """
+    Résout les rôles d'une table de liaison (farm_referents, ...), une requête par lot de db_in_batch_size farms
+
+    Returns:
+        Liste de {farm_uuid, role_id, role_name, entity}, ou None en cas d'erreur
+    """
+    try:
+        client = await init_supabase_connection()
+        batch_size = int(settings.get('db_in_batch_size', 100))
+        semaphore = asyncio.Semaphore(int(settings.get('db_page_fanout', 4)))
+
+        async def read_batch(batch: List[str]) -> Any:
+            async with semaphore:
+                return await role_assignments_query(client, link_table, batch).execute()
+
+        responses = await asyncio.gather(*(
+            read_batch(farm_uuids[start:start + batch_size]) for start in range(0, len(farm_uuids), batch_size)
+        ))
+        return parse_role_assignments(link_table, [row for response in responses for row in response.data])
+    except Exception as e:
+        logging.error(f"Error resolving roles from {link_table}: {e}")
+        return None
@@ -0,0 +1,93 @@
+"""Schema catalogue: table and column names read once from the backend"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Plain SQL identifier (what can safely be put into a statement without quoting)
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_columns(columns: str) -> List[str]:
+    """Découpe une liste de colonnes "a, b" (["*"] pour "*")"""
+    return [column.strip() for column in columns.split(",") if column.strip()]
+
+
+class SchemaCatalog:
+    """
+    Catalogue {table: [colonnes]} chargé une fois depuis le backend
+
+    Sert à valider les noms de tables/colonnes avant de les placer dans une
+    requête, et à restreindre les projections aux colonnes existantes. Si le
+    chargement échoue, le catalogue est vide et la validation ne porte plus
+    que sur la forme des identifiants ; un nouvel essai a lieu après retry_after
+    secondes.
+    """
+
+    def __init__(self, loader: Callable[[], Optional[Dict[str, List[str]]]], retry_after: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            loader: Fonction retournant {table: [colonnes]} (None en cas d'erreur)
+            retry_after: Délai (secondes) avant de retenter un chargement échoué
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        self._loader = loader
+        self._retry_after = retry_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tables: Optional[Dict[str, List[str]]] = None
+        self._failed_at: Optional[float] = None
+
+    def tables(self) -> Dict[str, List[str]]:
+        """Le catalogue complet (vide si indisponible)"""
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    if self._failed_at is not None and self._clock() - self._failed_at < self._retry_after:
+                        return {}
+                    tables = self._loader()
+                    if tables is None:
+                        self._failed_at = self._clock()
+                        return {}
+                    self._tables = tables
+        return self._tables
+
+    def columns(self, table: str) -> Optional[List[str]]:
+        """Colonnes d'une table, None si la table (ou le catalogue) est inconnue"""
+        return self.tables().get(table)
+
+    def validate(self, table: str, columns: List[str]) -> None:
+        """
+        Vérifie qu'une table et des colonnes existent
+
+        Raises:
+            ValueError: identifiant invalide, table ou colonne inconnue
+        """
+        for name in [table] + [column for column in columns if column != "*"]:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid identifier: {name!r}")
+
+        catalog = self.tables()
+        if not catalog:
+            return
+        known = catalog.get(table)
+        if known is None:
+            raise ValueError(f"Unknown table: {table}")
+        unknown = [column for column in columns if column != "*" and column not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) in {table}: {', '.join(unknown)}")
+
+    def restrict(self, table: str, columns: List[str]) -> List[str]:
+        """Garde les colonnes existantes d'une projection (toutes si la table est inconnue)"""
+        known = self.columns(table)
+        if known is None:
+            return list(columns)
+        return [column for column in columns if column in known]
+
+    def invalidate(self) -> None:
+        """Force un rechargement au prochain accès (après une migration)"""
+        with self._lock:
+            self._tables = None
+            self._failed_at = None
@@ -0,0 +1,69 @@
+"""Bounded concurrent execution of independent backend reads"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Shared worker pools by name, created on first parallel call: {pool: (executor, width)}
+_executors: Dict[str, Tuple[ThreadPoolExecutor, int]] = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(width: int, pool: str) -> ThreadPoolExecutor:
+    """Retourne le pool partagé nommé, recréé si la largeur configurée change"""
+    with _executor_lock:
+        executor, executor_width = _executors.get(pool, (None, 0))
+        if executor is None or executor_width != width:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = ThreadPoolExecutor(max_workers=width, thread_name_prefix=f"db-{pool}")
+            _executors[pool] = (executor, width)
+        return executor
+
+
+def run_parallel(calls: Dict[Hashable, Callable[[], Any]], width: int, timeout: float,
+                 pool: str = "fanout") -> Dict[Hashable, Any]:
+    """
+    Exécute des lectures indépendantes en parallèle sur un pool borné
+
+    La latence totale devient celle de la lecture la plus lente. Chaque appel
+    s'exécute dans une copie du contexte courant (contextvars). Un appel qui
+    dépasse le délai ou lève une exception est journalisé et vaut None, comme
+    les erreurs des backends.
+
+    Args:
+        calls: Dict {clé: fonction sans argument}
+        width: Nombre maximal de lectures simultanées (<= 1 : exécution séquentielle)
+        timeout: Délai maximal (secondes) accordé à chaque lecture
+        pool: Nom du pool de threads ; un appel exécuté dans un pool ne doit
+            soumettre de travail qu'à un autre pool (sinon risque d'interblocage)
+
+    Returns:
+        Dict {clé: résultat ou None}
+    """
+    if width <= 1 or len(calls) <= 1:
+        return {key: call() for key, call in calls.items()}
+
+    executor = _get_executor(width, pool)
+    futures = {
+        key: executor.submit(contextvars.copy_context().run, call)
+        for key, call in calls.items()
+    }
+
+    deadline = time.monotonic() + timeout
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            logging.error(f"Parallel read {key} timed out after {timeout}s")
+            results[key] = None
+        except Exception as e:
+            logging.error(f"Parallel read {key} failed: {e}")
+            results[key] = None
+    return results
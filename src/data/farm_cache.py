@@ -0,0 +1,199 @@
+"""Bounded, write-invalidated LRU cache for per-farm data sections"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.data.schema import FARM_CONTRACT_TABLES, FARM_LINKED_TABLES, FARM_PERFORMANCE_TABLES
+
+# Tables read by each cached section
+SECTION_TABLES: Dict[str, List[str]] = {
+    "general_info": ["farms", "farm_types", "farm_statuses", "farm_locations"],
+    "technical_details": [
+        "farm_turbine_details",
+        "substations",
+        "wind_turbine_generators",
+        "farm_ice_detection_systems",
+        "ice_detection_systems"
+    ],
+    "contracts_admin": list(FARM_CONTRACT_TABLES),
+    "performance_data": list(FARM_PERFORMANCE_TABLES)
+}
+
+# Column carrying the farm uuid for each farm-scoped table
+FARM_KEY_COLUMNS: Dict[str, str] = {"farms": "uuid", **FARM_LINKED_TABLES}
+
+
+def _estimate_size(value: Any) -> int:
+    """Taille approximative (en octets) d'une section, mesurée sur sa forme JSON"""
+    return len(json.dumps(value, default=str))
+
+
+def _is_negative(value: Any) -> bool:
+    """
+    Vrai si la ligne principale de la section est absente : le farm lui-même
+    (general_info), ou toute ligne pour les sections sans ligne farm
+
+    Une ligne 1:1 facultative absente (contrat TCMA, détails turbine d'un
+    farm solaire, ...) est un état normal, mis en cache avec le TTL plein.
+    """
+    if not isinstance(value, dict):
+        return False
+    if "farm" in value:
+        return value["farm"] is None
+    return bool(value) and all(item is None or item == [] for item in value.values())
+
+
+def _farm_uuids_from(value: Any) -> Optional[List[str]]:
+    """Extrait les uuid de farm d'une valeur de filtre/donnée, None si indéterminable"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple, set, frozenset)) and all(isinstance(item, str) for item in value):
+        return list(value)
+    return None
+
+
+class FarmCache:
+    """
+    Cache LRU des sections de données d'un farm, clé (farm_uuid, section, vue)
+
+    Borné en octets (taille JSON des valeurs), avec TTL. Les sections d'un
+    farm absent (aucune ligne) sont aussi mises en cache (cache négatif) mais
+    avec un TTL plus court. invalidate_write() retire précisément les entrées
+    touchées par une écriture, quelle que soit leur vue (projection de colonnes).
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, negative_ttl: float,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_bytes: Taille maximale totale ; 0 désactive le cache
+            ttl: Durée de vie (secondes) d'une entrée
+            negative_ttl: Durée de vie (secondes) d'une entrée d'un farm absent
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, Optional[str]], tuple]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, farm_uuid: str, section: str, view: Optional[str] = None) -> Tuple[bool, Any]:
+        """
+        Args:
+            view: Vue (projection de colonnes) de la section, None pour toutes les colonnes
+
+        Returns:
+            Tuple (trouvé, copie de la valeur)
+        """
+        key = (farm_uuid, section, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= self._clock():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.deepcopy(entry[0])
+
+    def put(self, farm_uuid: str, section: str, value: Any, view: Optional[str] = None) -> None:
+        """Mémorise une section, en évinçant les entrées les moins récentes si nécessaire"""
+        if self.max_bytes <= 0:
+            return
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        ttl = self.negative_ttl if _is_negative(value) else self.ttl
+        key = (farm_uuid, section, view)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (copy.deepcopy(value), size, self._clock() + ttl)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_farm(self, farm_uuid: str, sections: Optional[Iterable[str]] = None) -> None:
+        """Retire les sections d'un farm (toutes si sections est None), pour toutes les vues"""
+        targets = set(sections if sections is not None else SECTION_TABLES)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == farm_uuid and key[1] in targets]:
+                self._remove(key)
+
+    def invalidate_section(self, section: str) -> None:
+        """Retire une section pour tous les farms"""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == section]:
+                self._remove(key)
+
+    def invalidate_write(self, table: str, filters: Optional[dict], data: Optional[Any]) -> None:
+        """
+        Retire les entrées touchées par une écriture sur une table
+
+        Les uuid de farm sont lus dans les filtres et dans les données écrites
+        (dict ou liste de dicts). Pour une table partagée (farm_types, ...) ou
+        si les farms concernés ne peuvent pas être déterminés, la section est
+        retirée pour tous les farms.
+        """
+        sections = [section for section, tables in SECTION_TABLES.items() if table in tables]
+        if not sections:
+            return
+
+        key_column = FARM_KEY_COLUMNS.get(table)
+        rows = data if isinstance(data, list) else [data or {}]
+        farm_uuids: Optional[List[str]] = [] if key_column else None
+
+        if key_column:
+            candidates = [filters or {}] + [row for row in rows if isinstance(row, dict)]
+            found = False
+            for candidate in candidates:
+                if key_column in candidate:
+                    uuids = _farm_uuids_from(candidate[key_column])
+                    if uuids is None:
+                        farm_uuids = None
+                        break
+                    farm_uuids.extend(uuids)
+                    found = True
+            if not found:
+                farm_uuids = None
+
+        for section in sections:
+            if farm_uuids is None:
+                self.invalidate_section(section)
+            else:
+                for farm_uuid in farm_uuids:
+                    self.invalidate_farm(farm_uuid, [section])
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """Compteurs du cache (entrées, octets, hits, misses)"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _remove(self, key: Tuple[str, str, Optional[str]]) -> None:
+        """Retire une entrée (verrou déjà tenu)"""
+        entry = self._entries.pop(key)
+        self._size -= entry[1]
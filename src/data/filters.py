@@ -0,0 +1,130 @@
+"""
+Filter expressions for execute_query and the write functions
+
+A filters dict maps a column to either a plain value (equality), a
+list/tuple/set (membership) or a Condition built with the helpers below:
+
+    filters = {
+        "farm_uuid": in_(farm_uuids),
+        "year": between(2015, 2020),
+        "contract_end_date": lt("2026-01-01"),
+        "or": any_of({"region": ilike("hauts%")}, {"region": is_null()})
+    }
+
+Entries are combined with AND. An AnyOf value (its key is only a label)
+combines its groups with OR, each group being itself a filters dict.
+Each backend translates these expressions: parameterized SQL in sqlite_db,
+PostgREST operators in supabase_db.
+"""
+
+from typing import Any, Iterable
+
+# Comparison operators shared by both backends
+COMPARISON_OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte")
+
+
+class Condition:
+    """Opérateur de filtre appliqué à une colonne"""
+
+    __slots__ = ("op", "value")
+
+    def __init__(self, op: str, value: Any = None):
+        self.op = op
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Condition) and (self.op, self.value) == (other.op, other.value)
+
+    def __hash__(self) -> int:
+        return hash((self.op, repr(self.value)))
+
+    def __repr__(self) -> str:
+        return f"Condition({self.op!r}, {self.value!r})"
+
+
+class AnyOf:
+    """Groupe OR : chaque groupe est un dict de filtres combinés par AND"""
+
+    __slots__ = ("groups",)
+
+    def __init__(self, *groups: dict):
+        if not groups:
+            raise ValueError("any_of() requires at least one filter group")
+        self.groups = groups
+
+    def __repr__(self) -> str:
+        return f"AnyOf{self.groups!r}"
+
+
+def eq(value: Any) -> Condition:
+    """column = value"""
+    return Condition("eq", value)
+
+
+def neq(value: Any) -> Condition:
+    """column <> value"""
+    return Condition("neq", value)
+
+
+def gt(value: Any) -> Condition:
+    """column > value"""
+    return Condition("gt", value)
+
+
+def gte(value: Any) -> Condition:
+    """column >= value"""
+    return Condition("gte", value)
+
+
+def lt(value: Any) -> Condition:
+    """column < value"""
+    return Condition("lt", value)
+
+
+def lte(value: Any) -> Condition:
+    """column <= value"""
+    return Condition("lte", value)
+
+
+def between(low: Any, high: Any) -> Condition:
+    """low <= column <= high (bornes incluses, comme BETWEEN en SQL)"""
+    return Condition("between", (low, high))
+
+
+def in_(values: Iterable[Any]) -> Condition:
+    """column IN (values)"""
+    return Condition("in", list(values))
+
+
+def is_null() -> Condition:
+    """column IS NULL"""
+    return Condition("is_null")
+
+
+def not_null() -> Condition:
+    """column IS NOT NULL"""
+    return Condition("not_null")
+
+
+def like(pattern: str) -> Condition:
+    """Correspondance sensible à la casse (% et _ comme jokers)"""
+    return Condition("like", pattern)
+
+
+def ilike(pattern: str) -> Condition:
+    """Correspondance insensible à la casse (% et _ comme jokers)"""
+    return Condition("ilike", pattern)
+
+
+def any_of(*groups: dict) -> AnyOf:
+    """Combine plusieurs groupes de filtres par OR"""
+    return AnyOf(*groups)
+
+
+def as_condition(value: Any) -> Condition:
+    """Normalise une valeur de filtre brute (égalité ou liste) en Condition"""
+    if isinstance(value, Condition):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return in_(value)
+    return eq(value)
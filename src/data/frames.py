@@ -0,0 +1,68 @@
+"""Typed pandas DataFrames built from query results"""
+
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# Columns parsed as dates when the caller does not list them (contract_end_date, created_at, ...)
+_DATE_COLUMN_PATTERN = re.compile(r"(_date|_at)$")
+
+
+def _is_number(value: Any) -> bool:
+    """Vrai pour un int/float/Decimal (pas un booléen ni un texte)"""
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def date_columns(columns: List[str], parse_dates: Optional[List[str]] = None) -> List[str]:
+    """Colonnes à convertir en dates : celles demandées, sinon *_date et *_at"""
+    if parse_dates is not None:
+        return [column for column in parse_dates if column in columns]
+    return [column for column in columns if _DATE_COLUMN_PATTERN.search(column)]
+
+
+def typed_frame(frame: pd.DataFrame, parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Donne des types exploitables aux colonnes d'un DataFrame de résultats
+
+    Les colonnes de dates deviennent datetime64 (valeurs invalides -> NaT) ;
+    les colonnes objet dont toutes les valeurs non nulles sont des nombres
+    deviennent numériques (les NULL d'une colonne entière donnent un float).
+    Les textes ne sont jamais convertis : un SIRET ou un code garde ses zéros.
+
+    Args:
+        frame: DataFrame brut
+        parse_dates: Colonnes de dates (par défaut : *_date et *_at)
+    """
+    dates = date_columns(list(frame.columns), parse_dates)
+    for column in dates:
+        frame[column] = pd.to_datetime(frame[column], errors="coerce")
+
+    for column in frame.columns:
+        if column in dates or frame[column].dtype != object:
+            continue
+        values = frame[column].dropna()
+        if len(values) and values.map(_is_number).all():
+            frame[column] = pd.to_numeric(frame[column])
+    return frame
+
+
+def frame_from_rows(rows: List[Dict[str, Any]], columns: str = "*",
+                    parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Construit un DataFrame typé colonne par colonne à partir de lignes JSON
+
+    Args:
+        rows: Lignes {colonne: valeur}
+        columns: Colonnes sélectionnées, pour nommer les colonnes d'un résultat vide
+        parse_dates: Colonnes de dates (par défaut : *_date et *_at)
+    """
+    if rows:
+        names = list(rows[0].keys())
+    elif columns.strip() != "*":
+        names = [column.strip() for column in columns.split(",")]
+    else:
+        names = []
+    return typed_frame(pd.DataFrame({name: [row.get(name) for row in rows] for name in names}, columns=names),
+                       parse_dates)
@@ -0,0 +1,277 @@
+"""In-process metrics for the data facade: call latency, rows and payload per (backend, table, operation)"""
+
+import bisect
+import functools
+import inspect
+import json
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Outcome of a call: rows returned/affected, nothing matched, or failure (None / exception)
+OUTCOMES = ("ok", "empty", "error")
+
+_LabelKey = Tuple[str, str, str]
+
+# Rows serialised to estimate the JSON size of a longer result (first, middle and last)
+_SAMPLE_ROWS = 3
+
+# Response sizes (Content-Length) reported by the backend during the instrumented call in progress
+_response_bytes: ContextVar[Optional[List[int]]] = ContextVar("metrics_response_bytes", default=None)
+
+
+class _Series:
+    """Compteurs d'une série (backend, table, opération)"""
+
+    __slots__ = ("bucket_counts", "latency_sum", "outcomes", "rows", "payload_bytes")
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * (bucket_count + 1)  # last slot: above the largest bound (+Inf)
+        self.latency_sum = 0.0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.rows = 0
+        self.payload_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Registre des mesures des appels de la façade, partagé par toutes les sessions
+
+    Chaque appel alimente l'histogramme de latence de sa série (backend,
+    table, opération), le compteur de son résultat (ok, empty, error), le
+    nombre de lignes et la taille des données échangées. Les erreurs sont
+    donc comptées à part des résultats vides.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Bornes supérieures (secondes, croissantes) de l'histogramme de latence
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[_LabelKey, _Series] = {}
+
+    def observe(self, backend: str, table: str, operation: str, seconds: float, outcome: str,
+                rows: int = 0, payload_bytes: int = 0) -> None:
+        """Enregistre un appel"""
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get((backend, table, operation))
+            if series is None:
+                series = self._series[(backend, table, operation)] = _Series(len(self.buckets))
+            series.bucket_counts[slot] += 1
+            series.latency_sum += seconds
+            series.outcomes[outcome] += 1
+            series.rows += rows
+            series.payload_bytes += payload_bytes
+
+    def snapshot(self) -> List[dict]:
+        """
+        Copie des séries enregistrées
+
+        Returns:
+            Liste de {backend, table, operation, count, latency_sum, buckets, ok, empty,
+            error, rows, payload_bytes} ; buckets est cumulatif {borne: appels <= borne}
+        """
+        with self._lock:
+            items = [(key, _copy(series)) for key, series in sorted(self._series.items())]
+
+        snapshot = []
+        for (backend, table, operation), series in items:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets + (float("inf"),), series.bucket_counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            snapshot.append({
+                'backend': backend,
+                'table': table,
+                'operation': operation,
+                'count': cumulative,
+                'latency_sum': series.latency_sum,
+                'buckets': buckets,
+                **series.outcomes,
+                'rows': series.rows,
+                'payload_bytes': series.payload_bytes
+            })
+        return snapshot
+
+    def reset(self) -> None:
+        """Oublie toutes les séries"""
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self) -> str:
+        """Exporte les séries au format texte de Prometheus (exposition 0.0.4)"""
+        lines = [
+            "# HELP wndmngr_db_call_duration_seconds Latency of data facade calls.",
+            "# TYPE wndmngr_db_call_duration_seconds histogram"
+        ]
+        snapshot = self.snapshot()
+        for series in snapshot:
+            labels = _labels(series)
+            for bound, count in series['buckets'].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'wndmngr_db_call_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"wndmngr_db_call_duration_seconds_sum{{{labels}}} {series['latency_sum']!r}")
+            lines.append(f"wndmngr_db_call_duration_seconds_count{{{labels}}} {series['count']}")
+
+        lines += [
+            "# HELP wndmngr_db_calls_total Data facade calls by outcome (ok, empty, error).",
+            "# TYPE wndmngr_db_calls_total counter"
+        ]
+        for series in snapshot:
+            for outcome in OUTCOMES:
+                lines.append(f'wndmngr_db_calls_total{{{_labels(series)},outcome="{outcome}"}} {series[outcome]}')
+
+        for name, key, help_text in (
+            ("wndmngr_db_rows_total", "rows", "Rows returned or affected by data facade calls."),
+            ("wndmngr_db_payload_bytes_total", "payload_bytes",
+             "Size of the data read (response bytes, else estimated JSON) or written (JSON).")
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{_labels(series)}}} {series[key]}" for series in snapshot]
+        return "\n".join(lines) + "\n"
+
+
+def _copy(series: _Series) -> _Series:
+    """Copie d'une série (lue hors du verrou)"""
+    copy = _Series(len(series.bucket_counts) - 1)
+    copy.bucket_counts = list(series.bucket_counts)
+    copy.latency_sum = series.latency_sum
+    copy.outcomes = dict(series.outcomes)
+    copy.rows = series.rows
+    copy.payload_bytes = series.payload_bytes
+    return copy
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur d'étiquette Prometheus"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(series: dict) -> str:
+    """Étiquettes backend/table/operation d'une série"""
+    return ",".join(f'{name}="{_escape(str(series[name]))}"' for name in ("backend", "table", "operation"))
+
+
+def _measure(result: Any) -> Tuple[str, int]:
+    """Résultat (ok, empty, error) et nombre de lignes d'une valeur retournée par la façade"""
+    if result is None:
+        return "error", 0
+    if isinstance(result, bool):
+        return ("ok", 1) if result else ("empty", 0)
+    if isinstance(result, int):
+        return ("ok", result) if result else ("empty", 0)
+    if isinstance(result, dict):
+        return "ok", 1
+    if hasattr(result, "__len__"):
+        return ("ok", len(result)) if len(result) else ("empty", 0)
+    return "ok", 1
+
+
+def _payload_bytes(value: Any) -> int:
+    """
+    Taille JSON des données échangées, estimée sur un échantillon de lignes pour les listes longues
+
+    Sérialiser un résultat complet coûte autant que le lire (~8 % d'un
+    get_all_farms de 20 000 lignes) : seules les lignes de l'échantillon le sont.
+    """
+    if value is None:
+        return 0
+    try:
+        if isinstance(value, list) and len(value) > _SAMPLE_ROWS:
+            sample = [value[0], value[len(value) // 2], value[-1]]
+            return len(json.dumps(sample, default=str)) * len(value) // _SAMPLE_ROWS
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def record_response_bytes(size: int) -> None:
+    """Note la taille d'une réponse reçue par le backend pendant l'appel mesuré en cours (sinon sans effet)"""
+    sizes = _response_bytes.get()
+    if sizes is not None:
+        sizes.append(size)
+
+
+def instrumented(registry: MetricsRegistry, backend: Callable[[], str], operation: str,
+                 payload_arg: Optional[str] = None) -> Callable:
+    """
+    Décorateur mesurant une fonction de la façade (synchrone ou async)
+
+    La table est le premier argument de la fonction (nom de la fonction pour
+    les RPC). Un retour None ou une exception compte comme une erreur ;
+    l'exception est propagée.
+
+    Args:
+        registry: Registre alimenté
+        backend: Fonction retournant le nom du backend (sqlite, supabase)
+        operation: Nom de l'opération (select, insert, update, delete, rpc)
+        payload_arg: Argument dont la taille est mesurée (données écrites) ;
+            par défaut, la taille des réponses notées par record_response_bytes
+            (Content-Length PostgREST), sinon la taille estimée du résultat
+    """
+    def decorator(func: Callable) -> Callable:
+        parameters = list(inspect.signature(func).parameters)
+
+        def argument(args: tuple, kwargs: dict, name: str) -> Any:
+            if name in kwargs:
+                return kwargs[name]
+            position = parameters.index(name)
+            return args[position] if position < len(args) else None
+
+        def record(args: tuple, kwargs: dict, started: float, result: Any, failed: bool,
+                   responses: List[int]) -> None:
+            seconds = time.perf_counter() - started
+            outcome, rows = ("error", 0) if failed else _measure(result)
+            if failed:
+                payload_bytes = 0
+            elif payload_arg:
+                payload_bytes = _payload_bytes(argument(args, kwargs, payload_arg))
+            else:
+                payload_bytes = sum(responses) if responses else _payload_bytes(result)
+            registry.observe(backend(), str(argument(args, kwargs, parameters[0])), operation, seconds, outcome,
+                             rows, payload_bytes)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                responses: List[int] = []
+                token = _response_bytes.set(responses)
+                started = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException:
+                    record(args, kwargs, started, None, True, responses)
+                    raise
+                finally:
+                    _response_bytes.reset(token)
+                record(args, kwargs, started, result, False, responses)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            responses: List[int] = []
+            token = _response_bytes.set(responses)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(args, kwargs, started, None, True, responses)
+                raise
+            finally:
+                _response_bytes.reset(token)
+            record(args, kwargs, started, result, False, responses)
+            return result
+        return wrapper
+    return decorator
+
+
+# Process-wide registry used by src/database.py and exported by the /metrics endpoint
+registry = MetricsRegistry()
@@ -0,0 +1,27 @@
+-- Indexes for the per-farm lookups of the facade (see src/database.py).
+--
+-- Composite indexes put the farm key first and the column the facade filters
+-- or orders on second, so one index SEARCH returns the rows already sorted.
+
+create index if not exists idx_farms_code on farms (code);
+
+create index if not exists idx_farm_referents_farm_role
+    on farm_referents (farm_uuid, person_role_id);
+create index if not exists idx_farm_company_roles_farm_role
+    on farm_company_roles (farm_uuid, company_role_id);
+
+create index if not exists idx_substations_farm on substations (farm_uuid);
+create index if not exists idx_wind_turbine_generators_farm on wind_turbine_generators (farm_uuid);
+-- Covering: the bundle resolves the ice systems of a farm from this index alone
+create index if not exists idx_farm_ice_detection_systems_farm_system
+    on farm_ice_detection_systems (farm_uuid, ice_detection_system_uuid);
+
+create index if not exists idx_farm_actual_performances_farm_year
+    on farm_actual_performances (farm_uuid, year);
+create index if not exists idx_farm_target_performances_farm_year
+    on farm_target_performances (farm_uuid, year);
+create index if not exists idx_farm_tariffs_farm_start
+    on farm_tariffs (farm_uuid, tariff_start_date);
+
+-- get_expiring_om_contracts: range on the end date
+create index if not exists idx_farm_om_contracts_end_date on farm_om_contracts (contract_end_date);
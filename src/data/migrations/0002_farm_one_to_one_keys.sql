@@ -0,0 +1,18 @@
+-- Unique farm keys for the 1:1 farm tables (src/data/schema.py, FARM_ONE_TO_ONE_TABLES).
+--
+-- Besides the lookups, they let upsert_one use INSERT ... ON CONFLICT. This
+-- migration fails, and the schema stays at version 1, if a farm already has
+-- several rows in one of these tables: remove the duplicates, then rerun.
+
+create unique index if not exists uq_farm_statuses_farm on farm_statuses (farm_uuid);
+create unique index if not exists uq_farm_locations_farm on farm_locations (farm_uuid);
+create unique index if not exists uq_farm_turbine_details_farm on farm_turbine_details (wind_farm_uuid);
+
+create unique index if not exists uq_farm_administrations_farm on farm_administrations (farm_uuid);
+create unique index if not exists uq_farm_om_contracts_farm on farm_om_contracts (farm_uuid);
+create unique index if not exists uq_farm_tcma_contracts_farm on farm_tcma_contracts (farm_uuid);
+create unique index if not exists uq_farm_electrical_delegations_farm on farm_electrical_delegations (farm_uuid);
+create unique index if not exists uq_farm_environmental_installations_farm
+    on farm_environmental_installations (farm_uuid);
+create unique index if not exists uq_farm_financial_guarantees_farm on farm_financial_guarantees (farm_uuid);
+create unique index if not exists uq_farm_substation_details_farm on farm_substation_details (farm_uuid);
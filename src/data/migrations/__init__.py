@@ -0,0 +1,96 @@
+"""Versioned SQLite migrations, tracked with PRAGMA user_version
+
+Each NNNN_name.sql file of this package is one migration. migrate() applies,
+in order and each in its own transaction, the files whose number is above the
+database's user_version, then refreshes the planner statistics (ANALYZE).
+"""
+
+import os
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+_MIGRATIONS_DIR = os.path.dirname(__file__)
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+def load_migrations() -> List[Tuple[int, str, List[str]]]:
+    """
+    Lit les migrations du package, triées par numéro
+
+    Returns:
+        Liste de (version, nom, [instructions SQL])
+    """
+    migrations = []
+    for file_name in os.listdir(_MIGRATIONS_DIR):
+        match = _FILE_NAME.match(file_name)
+        if not match:
+            continue
+        with open(os.path.join(_MIGRATIONS_DIR, file_name), encoding="utf-8") as sql_file:
+            script = "\n".join(line for line in sql_file.read().splitlines() if not line.lstrip().startswith("--"))
+        statements = [statement.strip() for statement in script.split(";") if statement.strip()]
+        migrations.append((int(match.group(1)), match.group(2), statements))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration numbers: {versions}")
+    return migrations
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Version de schéma de la base (PRAGMA user_version, 0 pour une base jamais migrée)"""
+    return int(conn.execute(text("PRAGMA user_version")).scalar() or 0)
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Applique les migrations en attente puis lance ANALYZE
+
+    Chaque migration et la mise à jour de user_version sont validées ensemble :
+    une migration en échec est annulée et les suivantes ne sont pas tentées.
+
+    Args:
+        engine: Engine SQLite en lecture-écriture
+
+    Returns:
+        Version de schéma atteinte
+
+    Raises:
+        Exception: erreur SQL de la migration en échec (la base reste à la version précédente)
+    """
+    with engine.connect() as conn:
+        version = start_version = get_schema_version(conn)
+
+    pending = [migration for migration in load_migrations() if migration[0] > version]
+    try:
+        for number, _, statements in pending:
+            version = _apply(engine, number, statements)
+    finally:
+        if version > start_version:
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+    return version
+
+
+def _apply(engine: Engine, number: int, statements: List[str]) -> int:
+    """Applique une migration et sa version dans une seule transaction"""
+    # pysqlite does not open a transaction before DDL: BEGIN explicitly
+    # so the migration and its version number commit (or fail) together
+    dbapi_connection = engine.raw_connection()
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {number}")
+        except Exception:
+            dbapi_connection.rollback()
+            raise
+        dbapi_connection.commit()
+    finally:
+        dbapi_connection.close()
+    return number
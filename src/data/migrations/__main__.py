@@ -0,0 +1,27 @@
+"""python -m src.data.migrations : migre la base SQLite locale puis vérifie les plans de requête
+
+Code de sortie 1 si une migration échoue ou si une requête de la façade
+parcourt une table entière (SCAN) au lieu d'utiliser un index.
+"""
+
+import sys
+
+from src.data import sqlite_db
+from src.data.migrations.plans import check_query_plans
+
+
+def main() -> int:
+    engine = sqlite_db.get_sqlite_engine()
+    version = sqlite_db.apply_migrations(engine)
+    if version is None:
+        return 1
+    print(f"Schema version: {version}")
+
+    violations = check_query_plans(engine)
+    for violation in violations:
+        print(f"Full table scan - {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Query plan check: the facade's per-farm reads must be served by an index"""
+
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.data import sqlite_db
+from src.data.farm_cache import FARM_KEY_COLUMNS
+from src.data.filters import between, lte
+from src.data.reference_cache import REFERENCE_TABLES
+from src.data.schema import FARM_PERFORMANCE_TABLES, ROLE_LINKS
+
+# Lookup tables read whole by the ReferenceCache: a few rows, scanning them is fine
+_SCAN_ALLOWED = set(REFERENCE_TABLES)
+
+# "SCAN farms" / "SCAN l" (alias), but not "SCAN CONSTANT ROW" or subquery pseudo-tables
+_SCAN = re.compile(r"^SCAN (\w+)(?: AS (\w+))?")
+
+_FARM = "00000000-0000-0000-0000-000000000000"
+
+
+def facade_queries() -> List[Tuple[str, str, dict, dict]]:
+    """
+    Les SELECT émis par la façade pour un farm (ou une liste de farms)
+
+    Les statements sont construits par les mêmes fonctions que sqlite_db,
+    seules les valeurs liées sont factices.
+
+    Returns:
+        Liste de (libellé, SQL, paramètres, {alias: table})
+    """
+    queries = []
+
+    def select(label: str, table: str, filters: dict, order_by: str = None) -> None:
+        statement = sqlite_db._select_statement(table, "*", filters, order_by, paged=False)
+        queries.append((label, statement.text, sqlite_db._select_params(filters, None, 0), {}))
+
+    # Section loaders and batch loaders (one farm, then a list of farms)
+    for table, key_column in FARM_KEY_COLUMNS.items():
+        order_by = FARM_PERFORMANCE_TABLES.get(table)
+        select(f"{table} by {key_column}", table, {key_column: _FARM}, order_by)
+        select(f"{table} by {key_column} list", table, {key_column: [_FARM, _FARM]}, order_by)
+
+    select("farms by code", "farms", {"code": "F001"})
+    select("ice_detection_systems by uuid list", "ice_detection_systems", {"uuid": [_FARM, _FARM]})
+    select("farm_actual_performances by farm list and years", "farm_actual_performances",
+           {"farm_uuid": [_FARM, _FARM], "year": between(2020, 2024)}, "year")
+    select("farm_om_contracts by end date", "farm_om_contracts",
+           {"contract_end_date": lte("2030-12-31")}, "contract_end_date")
+
+    # Role resolution (referents, companies)
+    for link_table, (role_table, _, entity_table, _) in ROLE_LINKS.items():
+        sql_query, params = sqlite_db._role_assignments_sql(link_table, [_FARM, _FARM])
+        aliases = {"l": link_table, "r": role_table, "e": entity_table}
+        queries.append((f"{link_table} roles", sql_query, params, aliases))
+
+    # Farm bundle, one branch of the UNION ALL per table
+    for table, where_clause in sqlite_db._farm_bundle_plan():
+        queries.append((f"bundle {table}", f"SELECT * FROM {table} WHERE {where_clause}", {"farm_uuid": _FARM}, {}))
+    return queries
+
+
+def check_query_plans(engine: Engine) -> List[str]:
+    """
+    Cherche les parcours complets de table (SCAN) dans les plans des requêtes de la façade
+
+    À lancer sur une base migrée (voir migrate) : chaque lecture par farm doit
+    passer par un index (SEARCH ... USING INDEX).
+
+    Args:
+        engine: Engine SQLite de la base à vérifier
+
+    Returns:
+        Liste des requêtes fautives ("libellé: détail du plan"), vide si tout est indexé
+    """
+    with engine.connect() as conn:
+        existing = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+        violations = []
+        for label, sql_query, params, aliases in facade_queries():
+            for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql_query}"), params):
+                match = _SCAN.match(row.detail)
+                if not match:
+                    continue
+                table = aliases.get(match.group(1), match.group(1))
+                if table in existing and table not in _SCAN_ALLOWED:
+                    violations.append(f"{label}: {row.detail}")
+        return violations
@@ -0,0 +1,62 @@
+"""Named column projections: the columns each view of the app renders"""
+
+from typing import Dict, List, Optional
+
+# view -> {table: columns}. A table missing from a view is read in full.
+# Keys needed to assemble the sections (farm_uuid, farm_type_id, sort columns)
+# are kept even when they are not displayed.
+VIEW_PROJECTIONS: Dict[str, Dict[str, List[str]]] = {
+    "sidebar": {
+        "farms": ["uuid", "code", "project", "spv"]
+    },
+    "header": {
+        "farms": ["uuid", "code", "project", "spv", "farm_type_id"]
+    },
+    "general": {
+        "farm_types": ["id", "type_title"],
+        "farm_statuses": ["farm_uuid", "farm_status"]
+    },
+    "location": {
+        "farm_locations": [
+            "farm_uuid", "farm_code", "country", "region", "department", "municipality",
+            "map_reference", "arras_round_trip_distance_km"
+        ]
+    },
+    "contracts": {
+        "farm_administrations": ["farm_uuid", "account_number", "siret_number", "vat_number"],
+        "farm_om_contracts": ["farm_uuid", "service_contract_type", "contract_end_date"]
+    },
+    "performance": {
+        "farm_actual_performances": ["farm_uuid", "year"],
+        "farm_target_performances": ["farm_uuid", "year"],
+        "farm_tariffs": ["farm_uuid", "tariff_start_date"]
+    }
+}
+
+# Views made of several others (the farm page loads every tab at once)
+VIEW_GROUPS: Dict[str, List[str]] = {
+    "farm_page": ["header", "general", "location", "contracts", "performance"]
+}
+
+
+def view_projection(view: Optional[str]) -> Dict[str, List[str]]:
+    """
+    Projection {table: colonnes} d'une vue ou d'un groupe de vues
+
+    Args:
+        view: Nom de vue (VIEW_PROJECTIONS ou VIEW_GROUPS), None pour toutes les colonnes
+
+    Raises:
+        KeyError: vue inconnue
+    """
+    if view is None:
+        return {}
+    if view in VIEW_PROJECTIONS:
+        return {table: list(columns) for table, columns in VIEW_PROJECTIONS[view].items()}
+
+    projection: Dict[str, List[str]] = {}
+    for name in VIEW_GROUPS[view]:
+        for table, columns in VIEW_PROJECTIONS[name].items():
+            merged = projection.setdefault(table, [])
+            merged.extend(column for column in columns if column not in merged)
+    return projection
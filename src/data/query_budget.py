@@ -0,0 +1,216 @@
+"""Per-callback query budget: round trips and DB time of a Taipy callback, with N+1 detection
+
+The backends report every round trip (SQL statement on SQLite, HTTP request to
+PostgREST on Supabase) with its duration through track_statement(). Inside a
+track_queries() scope, or a callback decorated with query_budget(), they are
+counted per statement shape (values and IN lists stripped): a shape repeated
+n_plus_one_threshold times or more is the signature of a query issued in a loop.
+
+    @query_budget(max_queries=3)
+    def on_farm_selected(state, var_name, value): ...
+
+    with track_queries() as tracker:
+        get_farm_by_code("F001")
+    assert tracker.count <= 1
+
+A callback over its budget, or with an N+1 pattern, is logged (query_budget_mode
+= "warn"), raises QueryBudgetExceeded ("raise", for tests) or is ignored ("off").
+"""
+
+import functools
+import inspect
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from config import settings
+from src.data.slow_queries import current_callback, statement_shape
+
+
+def _n_plus_one_threshold() -> int:
+    """Seuil de répétition d'une forme à partir duquel elle est signalée (0 désactive)"""
+    return int(settings.get('n_plus_one_threshold', 5))
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un callback a dépassé son budget de requêtes, ou répète une même requête (N+1)"""
+
+
+class QueryTracker:
+    """
+    Requêtes envoyées pendant un callback : nombre, temps base de données et formes répétées
+
+    Un tracker imbriqué (callback appelant un autre callback) transmet aussi
+    ses requêtes au tracker englobant. Les requêtes des threads de
+    run_parallel sont comptées (le contexte est copié dans les workers).
+    """
+
+    def __init__(self, name: Optional[str] = None, parent: Optional["QueryTracker"] = None):
+        """
+        Args:
+            name: Nom du callback suivi
+            parent: Tracker englobant, qui reçoit aussi les requêtes
+        """
+        self.name = name
+        self.parent = parent
+        self._lock = threading.Lock()
+        self.statements: List[Tuple[str, float]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Enregistre une requête (forme, durée en secondes)"""
+        shape = statement_shape(statement)
+        tracker: Optional[QueryTracker] = self
+        while tracker is not None:
+            with tracker._lock:
+                tracker.statements.append((shape, seconds))
+            tracker = tracker.parent
+
+    @property
+    def count(self) -> int:
+        """Nombre d'allers-retours avec la base"""
+        return len(self.statements)
+
+    @property
+    def db_ms(self) -> float:
+        """Temps total passé dans la base, en millisecondes"""
+        return sum(seconds for _, seconds in self.statements) * 1000
+
+    def shapes(self) -> Counter:
+        """Nombre de requêtes par forme"""
+        return Counter(shape for shape, _ in self.statements)
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Formes envoyées au moins `threshold` fois (motif N+1)
+
+        Args:
+            threshold: Seuil de répétition (par défaut n_plus_one_threshold, 0 désactive)
+
+        Returns:
+            Liste de (forme, nombre), la plus répétée en premier
+        """
+        if threshold is None:
+            threshold = _n_plus_one_threshold()
+        if threshold <= 0:
+            return []
+        return [(shape, count) for shape, count in self.shapes().most_common() if count >= threshold]
+
+    def violations(self, max_queries: Optional[int] = None, max_db_ms: Optional[float] = None,
+                   n_plus_one: Optional[int] = None) -> List[str]:
+        """
+        Dépassements du budget
+
+        Args:
+            max_queries: Nombre maximal de requêtes (None : pas de limite)
+            max_db_ms: Temps base de données maximal en millisecondes (None : pas de limite)
+            n_plus_one: Seuil de répétition d'une forme (par défaut n_plus_one_threshold, 0 désactive)
+
+        Returns:
+            Messages décrivant chaque dépassement (liste vide si le budget est respecté)
+        """
+        problems = []
+        if max_queries is not None and self.count > max_queries:
+            problems.append(f"{self.count} queries (budget {max_queries})")
+        if max_db_ms is not None and self.db_ms > max_db_ms:
+            problems.append(f"{self.db_ms:.1f} ms in the database (budget {max_db_ms} ms)")
+        problems += [f"N+1: {count} x {shape}" for shape, count in self.repeated(n_plus_one)]
+        return problems
+
+    def summary(self) -> str:
+        """Résumé lisible : nombre de requêtes, temps et formes"""
+        lines = [f"{self.name or 'queries'}: {self.count} queries, {self.db_ms:.1f} ms"]
+        lines += [f"  {count} x {shape}" for shape, count in self.shapes().most_common()]
+        return "\n".join(lines)
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def tracking() -> bool:
+    """Vrai dans un scope suivi (les backends évitent sinon de chronométrer leurs requêtes)"""
+    return _tracker.get() is not None
+
+
+def track_statement(statement: str, seconds: float) -> None:
+    """Note un aller-retour avec la base dans le scope suivi en cours (sinon sans effet)"""
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(statement, seconds)
+
+
+@contextmanager
+def track_queries(name: Optional[str] = None) -> Iterator[QueryTracker]:
+    """
+    Suit les requêtes envoyées dans le bloc
+
+    Args:
+        name: Nom du scope (callback), repris par le journal des requêtes lentes
+
+    Yields:
+        Le QueryTracker du bloc
+    """
+    tracker = QueryTracker(name, parent=_tracker.get())
+    token = _tracker.set(tracker)
+    callback_token = current_callback.set(name) if name else None
+    try:
+        yield tracker
+    finally:
+        if callback_token is not None:
+            current_callback.reset(callback_token)
+        _tracker.reset(token)
+
+
+def _enforce(tracker: QueryTracker, max_queries: Optional[int], max_db_ms: Optional[float],
+             n_plus_one: Optional[int]) -> None:
+    """Signale les dépassements selon query_budget_mode"""
+    mode = settings.get('query_budget_mode', "warn")
+    if mode == "off":
+        return
+    problems = tracker.violations(max_queries, max_db_ms, n_plus_one)
+    if not problems:
+        return
+
+    message = f"Query budget exceeded by {tracker.name}: {'; '.join(problems)}\n{tracker.summary()}"
+    if mode == "raise":
+        raise QueryBudgetExceeded(message)
+    logging.warning(message)
+
+
+def query_budget(max_queries: Optional[int] = None, max_db_ms: Optional[float] = None,
+                 n_plus_one: Optional[int] = None, name: Optional[str] = None) -> Callable:
+    """
+    Décorateur déclarant le budget de requêtes d'un callback Taipy (synchrone ou async)
+
+    Le budget est vérifié à la sortie du callback, y compris pour les
+    requêtes d'un callback imbriqué ; une exception du callback est propagée
+    sans vérification.
+
+    Args:
+        max_queries: Nombre maximal d'allers-retours avec la base
+        max_db_ms: Temps base de données maximal en millisecondes
+        n_plus_one: Seuil de répétition d'une même forme (par défaut n_plus_one_threshold, 0 désactive)
+        name: Nom du callback (par défaut le nom de la fonction)
+    """
+    def decorator(func: Callable) -> Callable:
+        scope = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with track_queries(scope) as tracker:
+                    result = await func(*args, **kwargs)
+                _enforce(tracker, max_queries, max_db_ms, n_plus_one)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with track_queries(scope) as tracker:
+                result = func(*args, **kwargs)
+            _enforce(tracker, max_queries, max_db_ms, n_plus_one)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,76 @@
+"""Process-wide cache for small, rarely-changing lookup tables"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# Lookup tables served from memory: table -> (id column, name column)
+REFERENCE_TABLES: Dict[str, tuple] = {
+    "person_roles": ("id", "role_name"),
+    "company_roles": ("id", "role_name"),
+    "farm_types": ("id", "type_title")
+}
+
+
+class ReferenceCache:
+    """
+    Cache mémoire des tables de référence, partagé par toutes les sessions
+
+    Chaque table est chargée une fois (au premier accès) puis servie depuis
+    des dicts indexés par id et par nom. invalidate() force un rechargement
+    au prochain accès ; les écritures du facade l'appellent.
+    """
+
+    def __init__(self, loader: Callable[[str], Optional[List[dict]]]):
+        """
+        Args:
+            loader: Fonction chargeant toutes les lignes d'une table (None en cas d'erreur)
+        """
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+
+    def _entry(self, table: str) -> dict:
+        """Retourne l'entrée d'une table, en la chargeant si nécessaire"""
+        if table not in REFERENCE_TABLES:
+            raise KeyError(f"{table} is not a reference table")
+
+        entry = self._entries.get(table)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry is not None:
+                return entry
+
+            rows = self._loader(table)
+            id_column, name_column = REFERENCE_TABLES[table]
+            entry = {
+                'rows': rows or [],
+                'by_id': {row[id_column]: row for row in rows or []},
+                'by_name': {row[name_column]: row for row in rows or []}
+            }
+            # Ne pas mémoriser un échec de chargement
+            if rows is not None:
+                self._entries[table] = entry
+            return entry
+
+    def rows(self, table: str) -> List[dict]:
+        """Toutes les lignes d'une table de référence"""
+        return list(self._entry(table)['rows'])
+
+    def get_by_id(self, table: str, row_id: Any) -> Optional[dict]:
+        """Ligne d'une table de référence par identifiant, ou None"""
+        return self._entry(table)['by_id'].get(row_id)
+
+    def get_by_name(self, table: str, name: str) -> Optional[dict]:
+        """Ligne d'une table de référence par nom (role_name, type_title), ou None"""
+        return self._entry(table)['by_name'].get(name)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Oublie une table (ou toutes si table est None) ; sans effet hors tables de référence"""
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(table, None)
@@ -0,0 +1,88 @@
+"""Shared description of the farm-centric tables used by both backends"""
+
+from typing import Dict, List
+
+# 1:1 contract & administration tables keyed on farm_uuid
+FARM_CONTRACT_TABLES: List[str] = [
+    "farm_administrations",
+    "farm_om_contracts",
+    "farm_tcma_contracts",
+    "farm_electrical_delegations",
+    "farm_environmental_installations",
+    "farm_financial_guarantees",
+    "farm_substation_details"
+]
+
+# 1:many performance tables with their ordering column
+FARM_PERFORMANCE_TABLES: Dict[str, str] = {
+    "farm_actual_performances": "year",
+    "farm_target_performances": "year",
+    "farm_tariffs": "tariff_start_date"
+}
+
+# Tables directly linked to a farm, with the column holding the farm uuid
+FARM_LINKED_TABLES: Dict[str, str] = {
+    "farm_statuses": "farm_uuid",
+    "farm_locations": "farm_uuid",
+    "farm_turbine_details": "wind_farm_uuid",
+    "substations": "farm_uuid",
+    "wind_turbine_generators": "farm_uuid",
+    "farm_ice_detection_systems": "farm_uuid",
+    **{table: "farm_uuid" for table in FARM_CONTRACT_TABLES},
+    **{table: "farm_uuid" for table in FARM_PERFORMANCE_TABLES}
+}
+
+# 1:1 farm tables (at most one row per farm), with the column holding the farm uuid
+FARM_ONE_TO_ONE_TABLES: Dict[str, str] = {
+    "farm_statuses": "farm_uuid",
+    "farm_locations": "farm_uuid",
+    "farm_turbine_details": "wind_farm_uuid",
+    **{table: "farm_uuid" for table in FARM_CONTRACT_TABLES}
+}
+
+# Every table returned by a farm bundle (see get_farm_bundle in the backends)
+FARM_BUNDLE_TABLES: List[str] = [
+    "farms",
+    "farm_types",
+    *FARM_LINKED_TABLES,
+    "ice_detection_systems"
+]
+
+# Role link tables: link_table -> (role_table, role_fk, entity_table, entity_fk)
+ROLE_LINKS: Dict[str, tuple] = {
+    "farm_referents": ("person_roles", "person_role_id", "persons", "person_uuid"),
+    "farm_company_roles": ("company_roles", "company_role_id", "companies", "company_uuid")
+}
+
+# Reduced SQLite mirror of the windmanager tables above (not the production DDL),
+# shared by the test fixtures (TESTS/conftest.py) and the synthetic benchmark databases
+MIRROR_SCHEMA: List[str] = [
+    "CREATE TABLE farm_types (id INTEGER PRIMARY KEY, type_title TEXT)",
+    "CREATE TABLE farms (uuid TEXT PRIMARY KEY, code TEXT, project TEXT, spv TEXT, farm_type_id INTEGER)",
+    "CREATE TABLE farm_statuses (farm_uuid TEXT, farm_code TEXT, farm_status TEXT)",
+    "CREATE TABLE farm_locations (farm_uuid TEXT, farm_code TEXT, country TEXT, region TEXT, department TEXT,"
+    " municipality TEXT, map_reference TEXT, arras_round_trip_distance_km REAL)",
+    "CREATE TABLE farm_turbine_details (wind_farm_uuid TEXT, wind_farm_code TEXT, turbine_count INTEGER)",
+    "CREATE TABLE substations (uuid TEXT PRIMARY KEY, farm_uuid TEXT, name TEXT)",
+    "CREATE TABLE wind_turbine_generators (uuid TEXT PRIMARY KEY, farm_uuid TEXT, name TEXT)",
+    "CREATE TABLE ice_detection_systems (uuid TEXT PRIMARY KEY, name TEXT)",
+    "CREATE TABLE farm_ice_detection_systems (farm_uuid TEXT, ice_detection_system_uuid TEXT)",
+    "CREATE TABLE farm_administrations (farm_uuid TEXT, farm_code TEXT, account_number TEXT,"
+    " siret_number TEXT, vat_number TEXT)",
+    "CREATE TABLE farm_om_contracts (farm_uuid TEXT, farm_code TEXT, service_contract_type TEXT,"
+    " contract_end_date TEXT)",
+    "CREATE TABLE farm_tcma_contracts (farm_uuid TEXT, farm_code TEXT, tcma_status TEXT)",
+    "CREATE TABLE farm_electrical_delegations (farm_uuid TEXT, farm_code TEXT, dt_number TEXT)",
+    "CREATE TABLE farm_environmental_installations (farm_uuid TEXT, farm_code TEXT, aip_number TEXT)",
+    "CREATE TABLE farm_financial_guarantees (farm_uuid TEXT, farm_code TEXT, amount REAL)",
+    "CREATE TABLE farm_substation_details (farm_uuid TEXT, farm_code TEXT, station_type TEXT)",
+    "CREATE TABLE farm_actual_performances (farm_uuid TEXT, farm_code TEXT, year INTEGER, energy_mwh REAL)",
+    "CREATE TABLE farm_target_performances (farm_uuid TEXT, farm_code TEXT, year INTEGER, energy_mwh REAL)",
+    "CREATE TABLE farm_tariffs (farm_uuid TEXT, farm_code TEXT, tariff_start_date TEXT, price REAL)",
+    "CREATE TABLE person_roles (id INTEGER PRIMARY KEY, role_name TEXT)",
+    "CREATE TABLE persons (uuid TEXT PRIMARY KEY, first_name TEXT, last_name TEXT)",
+    "CREATE TABLE farm_referents (farm_uuid TEXT, farm_code TEXT, person_role_id INTEGER, person_uuid TEXT)",
+    "CREATE TABLE company_roles (id INTEGER PRIMARY KEY, role_name TEXT)",
+    "CREATE TABLE companies (uuid TEXT PRIMARY KEY, name TEXT)",
+    "CREATE TABLE farm_company_roles (farm_uuid TEXT, farm_code TEXT, company_role_id INTEGER, company_uuid TEXT)"
+]
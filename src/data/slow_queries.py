@@ -0,0 +1,443 @@
+"""Slow-query log: facade calls above a latency threshold, with their SQL/URL, parameters and plan
+
+The backends report each statement they send (SQL with its named parameters
+on SQLite, method and URL on Supabase) through record_statement(). When a
+watched facade call exceeds slow_query_threshold_ms, one JSON line is written
+to a rotating file: duration, backend, operation, table, rows, the Taipy
+callback that issued the call, the statements with secrets redacted and, on
+SQLite, their EXPLAIN QUERY PLAN. The plans and the file are handled by a
+background thread, so the slow call itself does not wait for them.
+
+    python -m src.data.slow_queries [--top N] [--file PATH]
+
+summarises the worst offenders of the log.
+"""
+
+import argparse
+import functools
+import glob
+import inspect
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import settings
+
+# Statements sent during the current watched call (None outside of one)
+_statements: ContextVar[Optional[List[Tuple[str, Any]]]] = ContextVar("slow_query_statements", default=None)
+
+# Name of the Taipy callback being served, when known (see caller_name)
+current_callback: ContextVar[Optional[str]] = ContextVar("current_callback", default=None)
+
+# Statements kept per call (a runaway loop must not grow the record without bound)
+_MAX_STATEMENTS = 20
+
+# Slow calls waiting for the writer thread; beyond this, new ones are dropped
+_MAX_PENDING = 1000
+
+# Column or parameter names whose values never reach the log
+_SECRET_NAME = re.compile(r"pass|secret|token|api_?key|authorization|credential|private", re.IGNORECASE)
+# Values that look like a JWT, whatever their column
+_JWT = re.compile(r"^eyJ[\w-]+\.[\w-]+\.[\w-]*$")
+_REDACTED = "***"
+
+# "column <op> :bind" (also "column IN (:b_0, :b_1)"), to find the column a bind parameter filters
+_BIND_COLUMN = re.compile(
+    r"""([A-Za-z_]\w*)"?\s*(?:=|<>|!=|<=|>=|<|>|\bLIKE|\bGLOB|\bIN)\s*\(?(?:\s*:\w+\s*,)*\s*$""",
+    re.IGNORECASE
+)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_SRC_DIR = os.path.join(_PROJECT_ROOT, "src") + os.sep
+
+_logger = logging.getLogger("wndmngr.slow_queries")
+_logger.propagate = False
+_logger.setLevel(logging.INFO)
+_handler_lock = threading.Lock()
+
+
+def capturing() -> bool:
+    """Vrai pendant un appel surveillé (les backends évitent alors de formater leurs instructions pour rien)"""
+    return _statements.get() is not None
+
+
+def record_statement(statement: str, params: Any = None) -> None:
+    """Note une instruction envoyée par un backend pendant l'appel surveillé en cours (sinon sans effet)"""
+    statements = _statements.get()
+    if statements is not None and len(statements) < _MAX_STATEMENTS:
+        statements.append((statement, params))
+
+
+def _is_secret(name: Optional[str], value: Any) -> bool:
+    """Vrai si une valeur doit être masquée (nom sensible ou jeton JWT)"""
+    if name and _SECRET_NAME.search(name):
+        return True
+    return isinstance(value, str) and bool(_JWT.match(value))
+
+
+def redact_params(statement: str, params: Any) -> Any:
+    """
+    Masque les paramètres sensibles d'une instruction SQL
+
+    Un paramètre est masqué si son nom, ou la colonne qu'il filtre dans le
+    SQL (ex. password = :param_0), désigne un secret, ou si sa valeur
+    ressemble à un jeton.
+    """
+    if isinstance(params, (list, tuple)):
+        return [redact_params(statement, item) for item in params]
+    if not isinstance(params, dict):
+        return params
+
+    redacted = {}
+    for name, value in params.items():
+        column = None
+        position = statement.find(f":{name}")
+        if position >= 0:
+            match = _BIND_COLUMN.search(statement[:position])
+            column = match.group(1) if match else None
+        secret = _is_secret(str(name), value) or _is_secret(column, value)
+        redacted[name] = _REDACTED if secret else value
+    return redacted
+
+
+def redact_url(url: str) -> str:
+    """Masque les paramètres sensibles (apikey, filtres sur des colonnes secrètes) d'une URL PostgREST"""
+    parts = urlsplit(url)
+    query = [
+        (name, _REDACTED if _is_secret(name, value.split(".", 1)[-1]) else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe=",.()*:@")))
+
+
+def _redact_body(body: Any) -> Any:
+    """Masque les champs sensibles d'un corps JSON (écritures PostgREST)"""
+    if isinstance(body, list):
+        return [_redact_body(item) for item in body]
+    if isinstance(body, dict):
+        return {key: _REDACTED if _is_secret(key, value) else _redact_body(value) for key, value in body.items()}
+    return body
+
+
+def record_request(method: str, url: str, body: Optional[bytes] = None) -> None:
+    """Note une requête PostgREST (URL et corps JSON masqués) pendant l'appel surveillé en cours"""
+    if _statements.get() is None:
+        return
+    params = None
+    if body:
+        try:
+            params = _redact_body(json.loads(body))
+        except ValueError:
+            params = f"<{len(body)} bytes>"
+    record_statement(f"{method} {redact_url(url)}", params)
+
+
+def caller_name() -> Optional[str]:
+    """
+    Nom du callback Taipy à l'origine de l'appel
+
+    current_callback s'il est renseigné, sinon la fonction la plus externe de
+    la pile définie dans le projet hors de src/ (app.py, pages/...).
+    """
+    name = current_callback.get()
+    if name:
+        return name
+
+    frame = sys._getframe(1)
+    outermost = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        # "<frozen runpy>" and friends are not files of the project
+        if (not filename.startswith("<") and filename.startswith(_PROJECT_ROOT)
+                and not filename.startswith(_SRC_DIR) and frame.f_code.co_name != "<module>"):
+            outermost = f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return outermost
+
+
+def _log_path() -> str:
+    """Chemin absolu du fichier de log (slow_query_log_file, relatif à la racine du projet)"""
+    path = settings.get('slow_query_log_file', "logs/slow_queries.log")
+    return path if os.path.isabs(path) else os.path.join(_PROJECT_ROOT, path)
+
+
+def _get_logger() -> logging.Logger:
+    """Logger du journal, relié au fichier tournant au premier usage"""
+    if not _logger.handlers:
+        with _handler_lock:
+            if not _logger.handlers:
+                path = _log_path()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                handler = RotatingFileHandler(
+                    path,
+                    maxBytes=int(settings.get('slow_query_log_max_bytes', 5 * 1024 * 1024)),
+                    backupCount=int(settings.get('slow_query_log_backup_count', 3)),
+                    encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                _logger.addHandler(handler)
+    return _logger
+
+
+def _row_count(result: Any) -> Optional[int]:
+    """Lignes retournées ou affectées par un appel de la façade"""
+    if result is None or isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, dict):
+        return 1
+    return len(result) if hasattr(result, "__len__") else None
+
+
+class SlowQueryLog:
+    """Journal des appels de la façade plus lents que le seuil configuré"""
+
+    def __init__(self, backend: Callable[[], str],
+                 explain: Optional[Callable[[str, Any], Optional[List[str]]]] = None,
+                 threshold_ms: Optional[float] = None, background: bool = True):
+        """
+        Args:
+            backend: Fonction retournant le nom du backend (sqlite, supabase)
+            explain: Fonction (sql, paramètres) -> lignes du plan, None si indisponible
+            threshold_ms: Seuil en millisecondes (par défaut slow_query_threshold_ms ; <= 0 désactive)
+            background: Plans et écriture dans un thread dédié (False : sur place, à la fin de l'appel)
+        """
+        self._backend = backend
+        self._explain = explain
+        self._threshold_ms = threshold_ms
+        self._background = background
+        self._pending: "queue.Queue[dict]" = queue.Queue(maxsize=_MAX_PENDING)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    @property
+    def threshold_ms(self) -> float:
+        """Seuil courant (relu dans les settings s'il n'est pas fixé)"""
+        if self._threshold_ms is not None:
+            return self._threshold_ms
+        return float(settings.get('slow_query_threshold_ms', 250))
+
+    def watched(self, operation: str) -> Callable:
+        """
+        Décorateur journalisant les appels lents d'une fonction de la façade (synchrone ou async)
+
+        La table est le premier argument de la fonction (nom de la fonction pour les RPC).
+        """
+        def decorator(func: Callable) -> Callable:
+            def finish(args: tuple, kwargs: dict, started: float, statements: list, result: Any,
+                       error: Optional[BaseException]) -> None:
+                duration_ms = (time.perf_counter() - started) * 1000
+                threshold = self.threshold_ms
+                if 0 < threshold <= duration_ms:
+                    table = args[0] if args else next(iter(kwargs.values()), None)
+                    # Only what depends on the caller is taken here: its frames, its result
+                    self._submit({
+                        'time': datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                        'duration_ms': round(duration_ms, 3),
+                        'operation': operation,
+                        'table': str(table),
+                        'rows': _row_count(result),
+                        'error': repr(error) if error is not None else ("no result" if result is None else None),
+                        'callback': caller_name(),
+                        'statements': statements
+                    })
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    statements: List[Tuple[str, Any]] = []
+                    token = _statements.set(statements)
+                    started = time.perf_counter()
+                    result, error = None, None
+                    try:
+                        result = await func(*args, **kwargs)
+                        return result
+                    except BaseException as e:
+                        error = e
+                        raise
+                    finally:
+                        _statements.reset(token)
+                        finish(args, kwargs, started, statements, result, error)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                statements: List[Tuple[str, Any]] = []
+                token = _statements.set(statements)
+                started = time.perf_counter()
+                result, error = None, None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    _statements.reset(token)
+                    finish(args, kwargs, started, statements, result, error)
+            return wrapper
+        return decorator
+
+    def flush(self) -> None:
+        """Attend que les appels lents en attente soient écrits (tests, arrêt propre)"""
+        self._pending.join()
+
+    def _submit(self, call: dict) -> None:
+        """Confie un appel lent au thread d'écriture (démarré au premier appel lent)"""
+        if not self._background:
+            self._write(call)
+            return
+
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_pending, name="slow-query-log", daemon=True)
+                self._writer.start()
+        try:
+            self._pending.put_nowait(call)
+        except queue.Full:
+            logging.warning(f"Slow query log backlog full, dropping a slow {call['operation']} on {call['table']}")
+
+    def _write_pending(self) -> None:
+        """Boucle du thread d'écriture"""
+        while True:
+            call = self._pending.get()
+            try:
+                self._write(call)
+            finally:
+                self._pending.task_done()
+
+    def _write(self, call: dict) -> None:
+        """
+        Écrit l'entrée JSON d'un appel lent : paramètres masqués, plans (une
+        erreur d'écriture du journal n'interrompt rien)
+        """
+        # The EXPLAIN statements must not be recorded into an enclosing watched call
+        token = _statements.set(None)
+        try:
+            entries = []
+            for statement, params in call['statements']:
+                entry: Dict[str, Any] = {
+                    'statement': statement,
+                    'params': redact_params(statement, params) if not statement.startswith(("GET ", "HEAD "))
+                    else params
+                }
+                if self._explain and re.match(r"\s*(SELECT|WITH|UPDATE|DELETE)\b", statement, re.IGNORECASE):
+                    entry['plan'] = self._explain(statement, params)
+                entries.append(entry)
+
+            record = {
+                'time': call['time'],
+                'duration_ms': call['duration_ms'],
+                'backend': self._backend(),
+                'operation': call['operation'],
+                'table': call['table'],
+                'rows': call['rows'],
+                'error': call['error'],
+                'callback': call['callback'],
+                'statements': entries
+            }
+            _get_logger().info(json.dumps(record, default=str))
+        except Exception as e:
+            logging.error(f"Could not write the slow query log: {e}")
+        finally:
+            _statements.reset(token)
+
+
+# ==================== CLI ====================
+
+_IN_LIST = re.compile(r"\(\s*(?::\w+|\?)(?:\s*,\s*(?::\w+|\?))*\s*\)")
+_BIND = re.compile(r":\w+")
+_URL_VALUE = re.compile(r"=([a-z]+\.)?[^&]*")
+
+
+def statement_shape(statement: str) -> str:
+    """Forme d'une instruction, sans valeurs : les variantes d'une même requête sont regroupées"""
+    if statement.startswith(("GET ", "HEAD ", "POST ", "PATCH ", "DELETE ")):
+        return _URL_VALUE.sub(lambda match: f"={match.group(1) or ''}?", statement)
+    return re.sub(r"\s+", " ", _BIND.sub("?", _IN_LIST.sub("(...)", statement))).strip()
+
+
+def read_log(paths: List[str]) -> List[dict]:
+    """Lit les entrées JSON des fichiers du journal (les lignes illisibles sont ignorées)"""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as log_file:
+            for line in log_file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def summarize(records: List[dict], top: int = 10) -> List[dict]:
+    """
+    Regroupe les appels lents par (opération, table, forme de la première instruction)
+
+    Returns:
+        Les `top` groupes au temps cumulé le plus élevé : {operation, table, shape,
+        count, total_ms, max_ms, p95_ms, scans, callbacks}
+    """
+    groups: Dict[tuple, List[dict]] = defaultdict(list)
+    for record in records:
+        statements = record.get('statements') or [{}]
+        shape = statement_shape(statements[0].get('statement', ""))
+        groups[(record.get('operation'), record.get('table'), shape)].append(record)
+
+    summary = []
+    for (operation, table, shape), items in groups.items():
+        durations = sorted(item['duration_ms'] for item in items)
+        plans = [line for item in items for entry in item.get('statements', []) for line in entry.get('plan') or []]
+        summary.append({
+            'operation': operation,
+            'table': table,
+            'shape': shape,
+            'count': len(items),
+            'total_ms': round(sum(durations), 3),
+            'max_ms': durations[-1],
+            'p95_ms': durations[min(len(durations) - 1, int(0.95 * len(durations)))],
+            'scans': sorted({line for line in plans if line.startswith("SCAN ")}),
+            'callbacks': sorted({item['callback'] for item in items if item.get('callback')})
+        })
+    summary.sort(key=lambda group: group['total_ms'], reverse=True)
+    return summary[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarise the slow query log (worst offenders first)")
+    parser.add_argument("--file", default=_log_path(), help="log file (rotated files are read too)")
+    parser.add_argument("--top", type=int, default=10, help="number of query shapes to show")
+    options = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(f"{options.file}.*")) + [options.file]
+    records = read_log([path for path in paths if os.path.isfile(path)])
+    if not records:
+        print(f"No slow queries logged in {options.file}")
+        return 0
+
+    for group in summarize(records, options.top):
+        print(f"{group['total_ms']:>10.1f} ms total  {group['count']:>5} calls  "
+              f"max {group['max_ms']:.1f} ms  p95 {group['p95_ms']:.1f} ms  "
+              f"{group['operation']} {group['table']}")
+        print(f"    {group['shape']}")
+        for scan in group['scans']:
+            print(f"    plan: {scan}")
+        if group['callbacks']:
+            print(f"    callbacks: {', '.join(group['callbacks'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+-- Applies a batch of writes sent by supabase_db.UnitOfWork in one transaction.
+--
+-- ops: [{"op": "insert" | "update" | "delete", "table": text,
+--        "filters": {column: value}, "data": {column: value}}, ...]
+-- Filters are equalities combined with AND; an update or delete without filters
+-- is rejected rather than applied to the whole table. Returns the affected row
+-- count of each operation. Any error aborts the whole batch. Runs with the
+-- caller's privileges, so row level security still applies.
+
+create or replace function public.apply_unit_of_work(ops jsonb)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    op jsonb;
+    target text;
+    column_list text;
+    set_list text;
+    where_sql text;
+    affected integer;
+    counts jsonb := '[]'::jsonb;
+begin
+    for op in select value from jsonb_array_elements(ops) loop
+        target := op->>'table';
+
+        select string_agg(format('t.%I = %L', key, value #>> '{}'), ' and ')
+          into where_sql
+          from jsonb_each(coalesce(op->'filters', '{}'::jsonb));
+        if where_sql is null and op->>'op' in ('update', 'delete') then
+            raise exception 'Unit of work % on % has no filters', op->>'op', target;
+        end if;
+
+        if op->>'op' = 'insert' then
+            select string_agg(format('%I', key), ', ')
+              into column_list
+              from jsonb_object_keys(op->'data') as key;
+            execute format(
+                'insert into public.%I (%s) select %s from jsonb_populate_record(null::public.%I, $1)',
+                target, column_list, column_list, target
+            ) using op->'data';
+        elsif op->>'op' = 'update' then
+            select string_agg(format('%I = r.%I', key, key), ', ')
+              into set_list
+              from jsonb_object_keys(op->'data') as key;
+            execute format(
+                'update public.%I as t set %s from jsonb_populate_record(null::public.%I, $1) as r where %s',
+                target, set_list, target, where_sql
+            ) using op->'data';
+        elsif op->>'op' = 'delete' then
+            execute format('delete from public.%I as t where %s', target, where_sql);
+        else
+            raise exception 'Unsupported unit of work operation: %', op->>'op';
+        end if;
+
+        get diagnostics affected = row_count;
+        counts := counts || to_jsonb(affected);
+    end loop;
+
+    return counts;
+end;
+$$;
@@ -0,0 +1,21 @@
+-- Unique farm keys for the 1:1 farm tables (src/data/schema.py, FARM_ONE_TO_ONE_TABLES),
+-- the Postgres counterpart of the SQLite migration 0002_farm_one_to_one_keys.sql.
+--
+-- supabase_db.upsert_one sends upsert(..., on_conflict="farm_uuid"): PostgREST
+-- turns it into INSERT ... ON CONFLICT (farm_uuid), which needs one of these
+-- indexes (without it, upsert_one falls back to an update then an insert).
+-- Creating an index fails if a farm already has several rows in that table:
+-- remove the duplicates, then rerun. The script can be run again safely.
+
+create unique index if not exists uq_farm_statuses_farm on public.farm_statuses (farm_uuid);
+create unique index if not exists uq_farm_locations_farm on public.farm_locations (farm_uuid);
+create unique index if not exists uq_farm_turbine_details_farm on public.farm_turbine_details (wind_farm_uuid);
+
+create unique index if not exists uq_farm_administrations_farm on public.farm_administrations (farm_uuid);
+create unique index if not exists uq_farm_om_contracts_farm on public.farm_om_contracts (farm_uuid);
+create unique index if not exists uq_farm_tcma_contracts_farm on public.farm_tcma_contracts (farm_uuid);
+create unique index if not exists uq_farm_electrical_delegations_farm on public.farm_electrical_delegations (farm_uuid);
+create unique index if not exists uq_farm_environmental_installations_farm
+    on public.farm_environmental_installations (farm_uuid);
+create unique index if not exists uq_farm_financial_guarantees_farm on public.farm_financial_guarantees (farm_uuid);
+create unique index if not exists uq_farm_substation_details_farm on public.farm_substation_details (farm_uuid);
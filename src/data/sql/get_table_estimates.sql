@@ -0,0 +1,25 @@
+-- Planner row estimates for the public tables, read by supabase_db.get_table_stats.
+--
+-- pg_class.reltuples is maintained by VACUUM/ANALYZE (and autovacuum): reading
+-- it costs nothing, unlike count(*). It is -1 for a table never analyzed,
+-- returned as a null row_count so the caller can count that table instead.
+
+create or replace function public.get_table_estimates()
+returns table (table_name text, column_count integer, row_count bigint)
+language sql
+stable
+security invoker
+as $$
+    select
+        c.relname::text as table_name,
+        (
+            select count(*)::integer
+              from pg_attribute a
+             where a.attrelid = c.oid and a.attnum > 0 and not a.attisdropped
+        ) as column_count,
+        case when c.reltuples < 0 then null else c.reltuples::bigint end as row_count
+    from pg_class c
+    join pg_namespace n on n.oid = c.relnamespace
+    where n.nspname = 'public' and c.relkind in ('r', 'p')
+    order by c.relname;
+$$;
@@ -1,23 +1,162 @@
 """SQLite database implementation"""
 
+import itertools
+import json
 import os
 import logging
-from typing import Any, List, Optional
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional
 
-from sqlalchemy import create_engine, text
+import pandas as pd
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 
 from config import settings
-
-# Global engine instance for singleton pattern
+from src.data.fanout import run_parallel
+from src.data.filters import AnyOf, Condition, as_condition
+from src.data.frames import typed_frame
+from src.data.migrations import migrate
+from src.data.query_budget import track_statement, tracking
+from src.data.schema import FARM_BUNDLE_TABLES, FARM_LINKED_TABLES, FARM_PERFORMANCE_TABLES, ROLE_LINKS
+from src.data.slow_queries import capturing, record_statement
+from src.data.statement_cache import StatementCache
+
+# Global engine instances for singleton pattern (read-write and read-only)
 _engine: Optional[Engine] = None
+_read_engine: Optional[Engine] = None
+
+# Resolved engine profile, computed once from settings
+_engine_profile: Optional[dict] = None
+
+# Column names per table, read once from PRAGMA table_info
+_table_columns: Dict[str, List[str]] = {}
+
+# Whether (table, key columns) is covered by a primary key or unique index, see upsert_one
+_unique_keys: Dict[tuple, bool] = {}
+
+# RETURNING clauses need SQLite 3.35+
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Rowids per re-select of the RETURNING fallback (SQLite < 3.32 binds at most 999 variables)
+_ROWID_BATCH = 500
+
+# Compiled statements for the dynamically built CRUD queries
+_statement_cache = StatementCache(max_size=256)
+
+# Filter operators translated to a plain SQL comparison
+_SQL_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+# Engine profile defaults, overridden by the [sqlite] table of settings.toml
+_ENGINE_DEFAULTS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout_ms": 5000,
+    "mmap_size": 268435456,
+    "cache_size": -20000,
+    "temp_store": "MEMORY",
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "statement_cache_size": 256,
+    "read_only_queries": False,
+    "auto_migrate": True
+}
+
+# Accepted values for the textual pragmas
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"}
+}
+
+
+def get_engine_profile() -> dict:
+    """Retourne le profil de l'engine SQLite (défauts + section [sqlite] de settings.toml)"""
+    global _engine_profile
+    if _engine_profile is not None:
+        return _engine_profile
+
+    profile = dict(_ENGINE_DEFAULTS)
+    profile.update({key.lower(): value for key, value in (settings.get('sqlite') or {}).items()})
+
+    for pragma, choices in _PRAGMA_CHOICES.items():
+        profile[pragma] = str(profile[pragma]).upper()
+        if profile[pragma] not in choices:
+            raise ValueError(f"Invalid sqlite.{pragma} setting: {profile[pragma]}")
+
+    _engine_profile = profile
+    return profile
+
+
+def _apply_pragmas(dbapi_connection: Any, profile: dict, read_only: bool) -> None:
+    """Applique les pragmas du profil à chaque nouvelle connexion DBAPI"""
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={profile['synchronous']}")
+        cursor.execute(f"PRAGMA busy_timeout={int(profile['busy_timeout_ms'])}")
+        cursor.execute(f"PRAGMA mmap_size={int(profile['mmap_size'])}")
+        cursor.execute(f"PRAGMA cache_size={int(profile['cache_size'])}")
+        cursor.execute(f"PRAGMA temp_store={profile['temp_store']}")
+    finally:
+        cursor.close()
+
+
+def _create_tuned_engine(db_path: str, read_only: bool = False) -> Engine:
+    """Crée un engine SQLite poolé dont les connexions reçoivent les pragmas du profil"""
+    profile = get_engine_profile()
+
+    if read_only:
+        connection_string = f"sqlite:///file:{db_path}?mode=ro&uri=true"
+    else:
+        connection_string = f"sqlite:///{db_path}"
+
+    engine = create_engine(
+        connection_string,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": int(profile['busy_timeout_ms']) / 1000,
+            "cached_statements": int(profile['statement_cache_size'])
+        },
+        poolclass=QueuePool,
+        pool_size=int(profile['pool_size']),
+        max_overflow=int(profile['max_overflow']),
+        pool_timeout=float(profile['pool_timeout'])
+    )
+    event.listen(
+        engine, "connect",
+        lambda dbapi_connection, connection_record: _apply_pragmas(dbapi_connection, profile, read_only)
+    )
+    event.listen(engine, "before_execute", _record_for_slow_log)
+    event.listen(engine, "before_cursor_execute", _start_tracked_statement)
+    event.listen(engine, "after_cursor_execute", _end_tracked_statement)
+    return engine
+
+
+def _record_for_slow_log(conn, clauseelement, multiparams, params, execution_options) -> None:
+    """Transmet le SQL et les paramètres nommés au journal des requêtes lentes pendant un appel surveillé"""
+    if capturing():
+        record_statement(str(clauseelement), params or (list(multiparams[:3]) if multiparams else None))
+
+
+def _start_tracked_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Chronomètre une instruction envoyée dans un scope suivi (budget de requêtes)"""
+    if tracking() and context is not None:
+        context.query_started = time.perf_counter()
+
 
-def get_sqlite_engine() -> Engine:
-    """Crée un engine SQLAlchemy pour SQLite local"""
-    global _engine
-    if _engine is not None:
-        return _engine
+def _end_tracked_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Transmet l'instruction et sa durée au budget de requêtes du callback en cours"""
+    started = getattr(context, "query_started", None)
+    if started is not None:
+        track_statement(statement, time.perf_counter() - started)
 
+
+def _get_db_path() -> str:
+    """Chemin absolu de la base SQLite locale"""
     # Calculate path relative to project root
     # src/data/sqlite_db.py -> src/data -> src -> root
     root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -25,157 +164,796 @@ def get_sqlite_engine() -> Engine:
 
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Local database not found: {db_path}")
+    return db_path
 
-    connection_string = f"sqlite:///{db_path}"
-    _engine = create_engine(
-        connection_string,
-        connect_args={"check_same_thread": False}
-    )
+
+def get_sqlite_engine(read_only: bool = False) -> Engine:
+    """
+    Crée un engine SQLAlchemy pour SQLite local
+
+    Args:
+        read_only: Retourne l'engine en lecture seule (mode=ro) plutôt que l'engine principal
+    """
+    global _engine, _read_engine
+    if read_only:
+        if _read_engine is None:
+            _read_engine = _create_tuned_engine(_get_db_path(), read_only=True)
+        return _read_engine
+
+    if _engine is None:
+        _engine = _create_tuned_engine(_get_db_path())
+        if get_engine_profile()['auto_migrate']:
+            apply_migrations(_engine)
     return _engine
 
 
+def apply_migrations(engine: Optional[Engine] = None) -> Optional[int]:
+    """
+    Applique les migrations de schéma en attente (index, voir src/data/migrations)
+
+    Args:
+        engine: Engine à migrer (par défaut : l'engine principal)
+
+    Returns:
+        Version de schéma atteinte, ou None en cas d'erreur
+    """
+    try:
+        return migrate(engine or get_sqlite_engine())
+    except Exception as e:
+        logging.error(f"Error migrating SQLite schema: {e}")
+        return None
+    finally:
+        # New unique indexes change how upsert_one writes
+        _unique_keys.clear()
+
+
+def _get_query_engine() -> Engine:
+    """Engine utilisé par les lectures : lecture seule si sqlite.read_only_queries est activé"""
+    return get_sqlite_engine(read_only=bool(get_engine_profile()['read_only_queries']))
+
+
 def execute_rpc(function_name: str) -> List[dict]:
     """Simule un appel RPC pour SQLite en exécutant des requêtes SQL natives"""
     if function_name == "get_table_stats":
-        engine = get_sqlite_engine()
+        stats = get_table_stats(exact=True)
+        if stats is None:
+            raise RuntimeError("Could not count the SQLite tables")
+        return stats
+    else:
+        raise NotImplementedError(f"RPC function '{function_name}' not implemented for SQLite")
+
+
+def get_table_stats(exact: bool = False) -> Optional[List[dict]]:
+    """
+    Statistiques des tables : nombre de colonnes et de lignes
 
+    En mode estimé, une seule requête lit MAX(rowid) de chaque table : une
+    recherche dans son b-tree, qui suit les écritures sans dépendre d'ANALYZE
+    (sqlite_stat1 n'est recalculé que par les migrations). L'estimation est
+    exacte tant qu'aucune ligne n'a été supprimée avant la dernière, et
+    surestime sinon. Les tables WITHOUT ROWID, et toutes les tables en mode
+    exact, sont comptées (COUNT(*)) en parallèle.
+
+    Args:
+        exact: Compter les lignes plutôt que les estimer
+
+    Returns:
+        Liste de {table_name, column_count, row_count, estimated} triée par nom,
+        ou None en cas d'erreur
+    """
+    try:
+        engine = _get_query_engine()
         with engine.connect() as conn:
-            # Requête pour obtenir les stats des tables
-            query = text("""
-                SELECT
-                    m.name as table_name,
-                    COUNT(p.name) as column_count,
-                    0 as row_count
+            tables = [dict(row._mapping) for row in conn.execute(text("""
+                SELECT m.name AS table_name, COUNT(p.name) AS column_count,
+                    UPPER(m.sql) LIKE '%WITHOUT ROWID%' AS without_rowid
                 FROM sqlite_master m
                 LEFT JOIN pragma_table_info(m.name) p ON 1=1
                 WHERE m.type = 'table'
                     AND m.name NOT LIKE 'sqlite_%'
                 GROUP BY m.name
                 ORDER BY m.name
-            """)
+            """))]
+            estimates = {} if exact else _estimated_row_counts(
+                conn, [table['table_name'] for table in tables if not table['without_rowid']]
+            )
+
+        to_count = [table['table_name'] for table in tables if table['table_name'] not in estimates]
+        counts = run_parallel(
+            {table: (lambda table=table: _count_rows(table)) for table in to_count},
+            width=int(settings.get('db_stats_count_width', 4)),
+            timeout=float(settings.get('db_fanout_timeout', 10)),
+            pool="stats"
+        )
+        for table in tables:
+            name = table['table_name']
+            del table['without_rowid']
+            table['estimated'] = name in estimates
+            table['row_count'] = estimates[name] if name in estimates else counts[name]
+            if table['row_count'] is None:
+                raise RuntimeError(f"Could not count rows of {name}")
+        return tables
+    except Exception as e:
+        logging.error(f"Error reading SQLite table statistics: {e}")
+        return None
 
-            result = conn.execute(query)
-            tables_info = [dict(row._mapping) for row in result]
 
-            # Pour chaque table, compter les lignes
-            for table_info in tables_info:
-                table_name = table_info['table_name']
-                count_query = text(f"SELECT COUNT(*) as cnt FROM {table_name}")
-                count_result = conn.execute(count_query)
-                table_info['row_count'] = count_result.scalar()
+def _estimated_row_counts(conn, tables: List[str]) -> Dict[str, int]:
+    """Nombres de lignes estimés {table: MAX(rowid)}, en une requête"""
+    if not tables:
+        return {}
+    statement = " UNION ALL ".join(
+        f'SELECT :table_{position} AS table_name, COALESCE(MAX(rowid), 0) AS row_count FROM "{table}"'
+        for position, table in enumerate(tables)
+    )
+    params = {f"table_{position}": table for position, table in enumerate(tables)}
+    return {row.table_name: int(row.row_count) for row in conn.execute(text(statement), params)}
+
+
+def _count_rows(table: str) -> int:
+    """COUNT(*) d'une table, sur sa propre connexion (pour les comptages parallèles)"""
+    with _get_query_engine().connect() as conn:
+        return int(conn.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar())
 
-            return tables_info
-    else:
-        raise NotImplementedError(f"RPC function '{function_name}' not implemented for SQLite")
 
+def _like_to_glob(pattern: str) -> str:
+    """Convertit un motif LIKE (% et _) en motif GLOB, sensible à la casse sous SQLite"""
+    special = {"%": "*", "_": "?", "*": "[*]", "?": "[?]", "[": "[[]"}
+    return "".join(special.get(char, char) for char in pattern)
 
-def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None) -> Any:
-    """Exécute une requête SELECT sur une table SQLite"""
+
+def _build_where(filters: Optional[dict], prefix: str) -> tuple:
+    """
+    Construit les clauses WHERE paramétrées à partir d'un dict de filtres
+
+    Voir src/data/filters.py : valeur simple (égalité), list/tuple/set (IN),
+    Condition (comparaisons, BETWEEN, IS NULL, LIKE/ILIKE) ou AnyOf (groupes OR).
+    LIKE est traduit en GLOB car le LIKE de SQLite ignore la casse.
+
+    Returns:
+        Tuple (liste de clauses, dict de paramètres)
+    """
+    params = {}
+    counter = itertools.count()
+
+    def bind(value: Any) -> str:
+        param_name = f"{prefix}_{next(counter)}"
+        params[param_name] = value
+        return f":{param_name}"
+
+    def condition_sql(column: str, condition: Condition) -> str:
+        op, value = condition.op, condition.value
+        if op in _SQL_OPERATORS:
+            return f"{column} {_SQL_OPERATORS[op]} {bind(value)}"
+        if op == "in":
+            return f"{column} IN ({', '.join(bind(item) for item in value)})"
+        if op == "between":
+            return f"{column} BETWEEN {bind(value[0])} AND {bind(value[1])}"
+        if op == "is_null":
+            return f"{column} IS NULL"
+        if op == "not_null":
+            return f"{column} IS NOT NULL"
+        if op == "like":
+            return f"{column} GLOB {bind(_like_to_glob(value))}"
+        if op == "ilike":
+            return f"{column} LIKE {bind(value)}"
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+    def clauses_for(group: dict) -> List[str]:
+        clauses = []
+        for column, value in group.items():
+            if isinstance(value, AnyOf):
+                alternatives = [" AND ".join(clauses_for(g)) or "1 = 1" for g in value.groups]
+                clauses.append("(" + " OR ".join(f"({alt})" for alt in alternatives) + ")")
+            else:
+                clauses.append(condition_sql(column, as_condition(value)))
+        return clauses
+
+    return clauses_for(filters or {}), params
+
+
+def _where_params(filters: Optional[dict], prefix: str) -> dict:
+    """
+    Paramètres de _build_where seuls, quand le texte SQL est déjà dans le cache de statements
+
+    Un seul parcours des filtres nomme les paramètres : le SQL mis en cache et
+    ses paramètres ne peuvent pas diverger.
+    """
+    return _build_where(filters, prefix)[1]
+
+
+def _filter_shape(filters: Optional[dict]) -> tuple:
+    """Forme hashable d'un dict de filtres : colonnes, opérateurs et tailles des IN"""
+    shape = []
+    for column, value in (filters or {}).items():
+        if isinstance(value, AnyOf):
+            shape.append((column, "or", tuple(_filter_shape(group) for group in value.groups)))
+        else:
+            condition = as_condition(value)
+            size = len(condition.value) if condition.op == "in" else None
+            shape.append((column, condition.op, size))
+    return tuple(shape)
+
+
+def _where_sql(where_clauses: List[str]) -> str:
+    """Suffixe WHERE (vide si aucun filtre)"""
+    return f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+
+
+def get_statement_cache_stats() -> dict:
+    """
+    Retourne les compteurs du cache de statements
+
+    Returns:
+        Dict with keys: size, hits, misses
+    """
+    return _statement_cache.stats()
+
+
+def _select_statement(table: str, columns: str, filters: Optional[dict], order_by: Optional[str],
+                      paged: bool) -> Any:
+    """SELECT mis en cache pour une forme de requête (LIMIT/OFFSET liés si paged)"""
+    def build_sql() -> str:
+        where_clauses, _ = _build_where(filters, "param")
+        sql_query = f"SELECT {columns} FROM {table}" + _where_sql(where_clauses)
+        if order_by:
+            sql_query += f" ORDER BY {order_by}"
+        if paged:
+            sql_query += " LIMIT :_limit OFFSET :_offset"
+        return sql_query
+
+    return _statement_cache.get(("select", table, columns, _filter_shape(filters), order_by, paged), build_sql)
+
+
+def _select_params(filters: Optional[dict], limit: Optional[int], offset: int) -> dict:
+    """Paramètres liés d'un SELECT de _select_statement"""
+    params = _where_params(filters, "param")
+    if limit is not None or offset > 0:
+        # LIMIT -1 : pas de limite, seulement un décalage
+        params.update({"_limit": -1 if limit is None else limit, "_offset": offset})
+    return params
+
+
+def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                  limit: Optional[int] = None, offset: int = 0) -> Any:
+    """
+    Exécute une requête SELECT sur une table SQLite
+
+    Args:
+        limit: Nombre maximal de lignes (None : toutes)
+        offset: Nombre de lignes à sauter
+    """
     try:
-        engine = get_sqlite_engine()
+        engine = _get_query_engine()
         with engine.connect() as conn:
-            # Build SQL query
-            sql_query = f"SELECT {columns} FROM {table}"
-
-            params = {}
-            if filters:
-                where_clauses = []
-                for i, (key, value) in enumerate(filters.items()):
-                    param_name = f"param_{i}"
-                    where_clauses.append(f"{key} = :{param_name}")
-                    params[param_name] = value
-                sql_query += " WHERE " + " AND ".join(where_clauses)
-
-            if order_by:
-                sql_query += f" ORDER BY {order_by}"
-
-            result = conn.execute(text(sql_query), params)
+            paged = limit is not None or offset > 0
+            statement = _select_statement(table, columns, filters, order_by, paged)
+            result = conn.execute(statement, _select_params(filters, limit, offset))
             return [dict(row._mapping) for row in result]
     except Exception as e:
         logging.error(f"Error querying table {table}: {e}")
         return None
 
 
-def update_record(table: str, filters: dict, data: dict) -> bool:
+def iter_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+               batch_size: int = 1000) -> Iterator[dict]:
     """
-    Met à jour un enregistrement dans une table SQLite
+    Parcourt le résultat d'un SELECT ligne par ligne sans le matérialiser
+
+    Le curseur est lu par lots de batch_size lignes (stream_results / yield_per) ;
+    la connexion reste ouverte tant que le générateur n'est pas épuisé ou fermé.
+    Une erreur est journalisée puis propagée, pour ne pas tronquer silencieusement
+    un parcours.
     """
     try:
-        engine = get_sqlite_engine()
+        engine = _get_query_engine()
         with engine.connect() as conn:
-            # Build UPDATE query
-            set_clauses = []
-            params = {}
-
-            for i, (key, value) in enumerate(data.items()):
-                param_name = f"set_{i}"
-                set_clauses.append(f"{key} = :{param_name}")
-                params[param_name] = value
-
-            where_clauses = []
-            for i, (key, value) in enumerate(filters.items()):
-                param_name = f"where_{i}"
-                where_clauses.append(f"{key} = :{param_name}")
-                params[param_name] = value
-
-            sql_query = f"UPDATE {table} SET {', '.join(set_clauses)}"
-            if where_clauses:
-                sql_query += f" WHERE {' AND '.join(where_clauses)}"
-
-            conn.execute(text(sql_query), params)
-            conn.commit()
-            return True
+            statement = _select_statement(table, columns, filters, order_by, paged=False)
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                statement, _where_params(filters, "param")
+            )
+            for row in result:
+                yield dict(row._mapping)
+    except Exception as e:
+        logging.error(f"Error streaming table {table}: {e}")
+        raise
+
+
+def query_frame(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                limit: Optional[int] = None, offset: int = 0,
+                parse_dates: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Exécute un SELECT SQLite et retourne un DataFrame typé (pd.read_sql, sans passer par des dicts)"""
+    try:
+        engine = _get_query_engine()
+        with engine.connect() as conn:
+            paged = limit is not None or offset > 0
+            statement = _select_statement(table, columns, filters, order_by, paged)
+            frame = pd.read_sql(statement, conn, params=_select_params(filters, limit, offset))
+            return typed_frame(frame, parse_dates)
+    except Exception as e:
+        logging.error(f"Error querying table {table}: {e}")
+        return None
+
+
+def _update_statement(table: str, filters: Optional[dict], data: dict) -> Any:
+    """UPDATE mis en cache pour une table, des colonnes modifiées et une forme de filtres"""
+    def build_sql() -> str:
+        set_clauses = [f"{key} = :set_{i}" for i, key in enumerate(data)]
+        where_clauses, _ = _build_where(filters, "where")
+        return f"UPDATE {table} SET {', '.join(set_clauses)}" + _where_sql(where_clauses)
+
+    return _statement_cache.get(("update", table, tuple(data), _filter_shape(filters)), build_sql)
+
+
+def _update_params(filters: Optional[dict], data: dict) -> dict:
+    """Paramètres liés d'un UPDATE de _update_statement"""
+    params = {f"set_{i}": value for i, value in enumerate(data.values())}
+    params.update(_where_params(filters, "where"))
+    return params
+
+
+def _delete_statement(table: str, filters: Optional[dict]) -> Any:
+    """DELETE mis en cache pour une table et une forme de filtres"""
+    def build_sql() -> str:
+        where_clauses, _ = _build_where(filters, "where")
+        return f"DELETE FROM {table}" + _where_sql(where_clauses)
+
+    return _statement_cache.get(("delete", table, _filter_shape(filters)), build_sql)
+
+
+def update_record(table: str, filters: dict, data: dict) -> Optional[List[dict]]:
+    """
+    Met à jour des enregistrements dans une table SQLite (UPDATE ... RETURNING *)
+
+    Returns:
+        Les lignes modifiées (après mise à jour), ou None en cas d'erreur
+    """
+    try:
+        engine = get_sqlite_engine()
+        with engine.begin() as conn:
+            return _execute_returning(
+                conn, _update_statement(table, filters, data), _update_params(filters, data), table, filters
+            )
     except Exception as e:
         logging.error(f"Error updating table {table}: {e}")
-        return False
+        return None
 
 
-def insert_record(table: str, data: dict) -> Optional[dict]:
+def _conflict_columns(on_conflict: Optional[str]) -> tuple:
+    """Colonnes d'une cible de conflit "a,b" (tuple vide : aucune cible)"""
+    return tuple(column.strip() for column in on_conflict.split(",")) if on_conflict else ()
+
+
+def _insert_statement(table: str, columns: tuple, upsert: bool = False, on_conflict: Optional[str] = None) -> Any:
     """
-    Insère un nouvel enregistrement dans une table SQLite
+    INSERT mis en cache pour une table et un ensemble de colonnes
+
+    Avec upsert, une ligne en conflit (sur on_conflict, ou sur n'importe quelle
+    contrainte d'unicité si None) met à jour ses autres colonnes.
     """
+    def build_sql() -> str:
+        placeholders = ', '.join(f":{column}" for column in columns)
+        sql_query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        if upsert:
+            target = _conflict_columns(on_conflict)
+            updates = [f"{column} = excluded.{column}" for column in columns if column not in target]
+            sql_query += f" ON CONFLICT ({', '.join(target)})" if target else " ON CONFLICT"
+            sql_query += f" DO UPDATE SET {', '.join(updates)}" if updates else " DO NOTHING"
+        return sql_query
+
+    key = ("upsert", table, columns, on_conflict) if upsert else ("insert", table, columns)
+    return _statement_cache.get(key, build_sql)
+
+
+def _write_many(table: str, rows: List[dict], upsert: bool, on_conflict: Optional[str]) -> Optional[int]:
+    """Insère (ou upsert) des lignes par executemany, dans une seule transaction"""
+    if not rows:
+        return 0
     try:
+        # One executemany per set of columns, so absent columns keep their defaults
+        shapes: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            shapes.setdefault(tuple(row), []).append(row)
+
         engine = get_sqlite_engine()
-        with engine.connect() as conn:
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join([f":{key}" for key in data.keys()])
+        with engine.begin() as conn:
+            for columns, shape_rows in shapes.items():
+                conn.execute(_insert_statement(table, columns, upsert, on_conflict), shape_rows)
+        return len(rows)
+    except Exception as e:
+        logging.error(f"Error {'upserting' if upsert else 'inserting'} rows into table {table}: {e}")
+        return None
+
+
+def insert_many(table: str, rows: List[dict]) -> Optional[int]:
+    """
+    Insère plusieurs enregistrements dans une table SQLite (executemany, un seul commit)
 
-            sql_query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    Returns:
+        Nombre de lignes insérées, ou None en cas d'erreur (aucune ligne insérée)
+    """
+    return _write_many(table, rows, upsert=False, on_conflict=None)
+
+
+def upsert(table: str, rows: List[dict], on_conflict: Optional[str] = None) -> Optional[int]:
+    """
+    Insère ou met à jour plusieurs enregistrements (INSERT ... ON CONFLICT DO UPDATE)
+
+    Args:
+        on_conflict: Colonnes ("a,b") d'une contrainte d'unicité ; None : toute contrainte
 
-            conn.execute(text(sql_query), data)
-            conn.commit()
+    Returns:
+        Nombre de lignes écrites, ou None en cas d'erreur (aucune ligne écrite)
+    """
+    return _write_many(table, rows, upsert=True, on_conflict=on_conflict)
 
-            # Return the inserted record
-            if 'uuid' in data:
-                return execute_query(table, filters={'uuid': data['uuid']})[0]
-            return data
+
+def insert_record(table: str, data: dict) -> Optional[dict]:
+    """
+    Insère un nouvel enregistrement dans une table SQLite (INSERT ... RETURNING *)
+
+    Returns:
+        La ligne insérée, valeurs par défaut comprises, ou None en cas d'erreur
+    """
+    try:
+        engine = get_sqlite_engine()
+        with engine.begin() as conn:
+            return _execute_returning(conn, _insert_statement(table, tuple(data)), data, table)[0]
     except Exception as e:
         logging.error(f"Error inserting into table {table}: {e}")
         return None
 
 
-def delete_record(table: str, filters: dict) -> bool:
+def delete_record(table: str, filters: dict) -> Optional[List[dict]]:
+    """
+    Supprime des enregistrements d'une table SQLite (DELETE ... RETURNING *)
+
+    Returns:
+        Les lignes supprimées, ou None en cas d'erreur
+    """
+    try:
+        engine = get_sqlite_engine()
+        with engine.begin() as conn:
+            return _execute_returning(
+                conn, _delete_statement(table, filters), _where_params(filters, "where"), table, filters
+            )
+    except Exception as e:
+        logging.error(f"Error deleting from table {table}: {e}")
+        return None
+
+
+def _execute_returning(conn, statement: Any, params: dict, table: str,
+                       filters: Optional[dict] = None) -> List[dict]:
+    """
+    Exécute un statement d'écriture et retourne les lignes touchées, telles qu'écrites
+
+    Avec SQLite >= 3.35, dans le même statement (RETURNING *). Sinon, dans la
+    même transaction : un DELETE retourne les lignes visées par les filtres,
+    lues avant l'écriture ; un UPDATE relit ses lignes par rowid après
+    l'écriture ; un INSERT relit la ligne de last_insert_rowid(), un upsert
+    celle de sa clé (filters).
+
+    Args:
+        table: Table écrite
+        filters: Filtres du DELETE / de l'UPDATE, clé d'un upsert (None pour un INSERT)
+    """
+    if _SUPPORTS_RETURNING:
+        return [dict(row) for row in conn.execute(_returning(statement), params).mappings()]
+
+    verb = statement.text.split(None, 1)[0].upper()
+    if verb in ("DELETE", "UPDATE"):
+        targeted = conn.execute(
+            _select_statement(table, "rowid AS _rowid, *", filters, None, paged=False),
+            _select_params(filters, None, 0)
+        )
+        rows = [dict(row._mapping) for row in targeted]
+        conn.execute(statement, params)
+        if verb == "UPDATE":
+            rows = _rows_by_rowid(conn, table, [row['_rowid'] for row in rows])
+        for row in rows:
+            row.pop('_rowid')
+        return rows
+
+    conn.execute(statement, params)
+    if filters is not None:
+        return [
+            dict(row._mapping) for row in conn.execute(
+                _select_statement(table, "*", filters, None, paged=False), _select_params(filters, None, 0)
+            )
+        ]
+    inserted = conn.execute(text(f"SELECT * FROM {table} WHERE rowid = last_insert_rowid()"))
+    return [dict(row._mapping) for row in inserted]
+
+
+def _rows_by_rowid(conn, table: str, rowids: List[int]) -> List[dict]:
+    """Relit des lignes par rowid (par lots de _ROWID_BATCH), dans l'ordre des rowid donnés"""
+    rows = []
+    for start in range(0, len(rowids), _ROWID_BATCH):
+        batch = {"rowid": rowids[start:start + _ROWID_BATCH]}
+        rows.extend(
+            dict(row._mapping) for row in conn.execute(
+                _select_statement(table, "rowid AS _rowid, *", batch, None, paged=False),
+                _select_params(batch, None, 0)
+            )
+        )
+    order = {rowid: position for position, rowid in enumerate(rowids)}
+    return sorted(rows, key=lambda row: order[row['_rowid']])
+
+
+def _returning(statement: Any) -> Any:
+    """Variante RETURNING * (mise en cache) d'un statement d'écriture"""
+    return _statement_cache.get(("returning", statement.text), lambda: f"{statement.text} RETURNING *")
+
+
+def _has_unique_key(conn, table: str, key_columns: tuple) -> bool:
+    """Vrai si une clé primaire ou un index unique porte exactement ces colonnes (mis en cache)"""
+    cache_key = (table, key_columns)
+    if cache_key not in _unique_keys:
+        keys = set()
+        primary = tuple(
+            row[1] for row in sorted(
+                (row for row in conn.execute(text(f"PRAGMA table_info({table})")) if row[5]),
+                key=lambda row: row[5]
+            )
+        )
+        if primary:
+            keys.add(tuple(sorted(primary)))
+        for index in conn.execute(text(f"PRAGMA index_list({table})")):
+            if index[2]:
+                columns = [row[2] for row in conn.execute(text(f"PRAGMA index_info('{index[1]}')"))]
+                keys.add(tuple(sorted(columns)))
+        _unique_keys[cache_key] = tuple(sorted(key_columns)) in keys
+    return _unique_keys[cache_key]
+
+
+def upsert_one(table: str, key: str, data: dict) -> Optional[dict]:
+    """
+    Insère ou met à jour l'unique ligne identifiée par une clé, en un seul statement
+
+    Utilise INSERT ... ON CONFLICT (key) DO UPDATE ... RETURNING * quand la clé
+    est couverte par une contrainte d'unicité ; sinon UPDATE puis, si aucune
+    ligne n'existe, INSERT, dans la même transaction.
+
+    Args:
+        key: Colonne(s) ("farm_uuid" ou "a,b") identifiant la ligne, présentes dans data
+
+    Returns:
+        La ligne écrite, ou None en cas d'erreur
+    """
+    try:
+        key_columns = _conflict_columns(key)
+        engine = get_sqlite_engine()
+        with engine.begin() as conn:
+            if _has_unique_key(conn, table, key_columns):
+                statement = _insert_statement(table, tuple(data), upsert=True, on_conflict=key)
+                # DO NOTHING (data holds only the key) returns no row
+                key_filters = {column: data[column] for column in key_columns}
+                rows = _execute_returning(conn, statement, data, table, key_filters)
+                return rows[0] if rows else dict(data)
+
+            filters = {column: data[column] for column in key_columns}
+            statement = _update_statement(table, filters, data)
+            updated = _execute_returning(conn, statement, _update_params(filters, data), table, filters)
+            if updated:
+                return updated[0]
+            return _execute_returning(conn, _insert_statement(table, tuple(data)), data, table)[0]
+    except Exception as e:
+        logging.error(f"Error upserting into table {table}: {e}")
+        return None
+
+
+class UnitOfWork:
+    """
+    Lectures et écritures sur une seule connexion SQLite, validées par un seul commit
+
+    Les écritures sont exécutées immédiatement dans la transaction, les lectures
+    suivantes les voient donc. Contrairement aux fonctions du module, les erreurs
+    sont propagées : elles doivent annuler toute la transaction.
+    """
+
+    def __init__(self):
+        # (table, filters, data) of each write, for cache invalidation after commit
+        self.writes: List[tuple] = []
+        self._conn = get_sqlite_engine().connect()
+        self._transaction = self._conn.begin()
+
+    def execute_query(self, table: str, columns: str = "*", filters: Optional[dict] = None,
+                      order_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """SELECT dans la transaction"""
+        statement = _select_statement(table, columns, filters, order_by, limit is not None or offset > 0)
+        result = self._conn.execute(statement, _select_params(filters, limit, offset))
+        return [dict(row._mapping) for row in result]
+
+    def insert_record(self, table: str, data: dict) -> None:
+        """INSERT dans la transaction"""
+        self._conn.execute(_insert_statement(table, tuple(data)), data)
+        self.writes.append((table, None, data))
+
+    def update_record(self, table: str, filters: dict, data: dict) -> None:
+        """UPDATE dans la transaction"""
+        self._conn.execute(_update_statement(table, filters, data), _update_params(filters, data))
+        self.writes.append((table, filters, data))
+
+    def delete_record(self, table: str, filters: dict) -> None:
+        """DELETE dans la transaction"""
+        self._conn.execute(_delete_statement(table, filters), _where_params(filters, "where"))
+        self.writes.append((table, filters, None))
+
+    def commit(self) -> None:
+        """Valide toutes les écritures et libère la connexion"""
+        try:
+            self._transaction.commit()
+        finally:
+            self._conn.close()
+
+    def rollback(self) -> None:
+        """Annule toutes les écritures et libère la connexion"""
+        try:
+            self._transaction.rollback()
+        finally:
+            self._conn.close()
+            self.writes = []
+
+
+def explain_query_plan(statement: str, params: Any = None) -> Optional[List[str]]:
+    """
+    Plan d'exécution (EXPLAIN QUERY PLAN) d'une instruction, pour le journal des requêtes lentes
+
+    Args:
+        statement: SQL avec paramètres nommés (:param)
+        params: Paramètres de l'instruction (pour un executemany, le premier jeu est utilisé)
+
+    Returns:
+        Lignes du plan (ex. "SEARCH farms USING INDEX ..."), ou None en cas d'erreur
+    """
+    if isinstance(params, list):
+        params = params[0] if params else None
+    try:
+        with get_sqlite_engine().connect() as conn:
+            result = conn.execute(text(f"EXPLAIN QUERY PLAN {statement}"), params or {})
+            return [row.detail for row in result]
+    except Exception as e:
+        logging.error(f"Error explaining SQLite statement: {e}")
+        return None
+
+
+def load_schema() -> Optional[Dict[str, List[str]]]:
     """
-    Supprime un enregistrement d'une table SQLite
+    Lit en une requête les colonnes de toutes les tables et vues (pragma_table_info)
+
+    Returns:
+        Dict {table: [colonnes dans l'ordre]}, ou None en cas d'erreur
     """
     try:
         engine = get_sqlite_engine()
         with engine.connect() as conn:
-            where_clauses = []
-            params = {}
+            return _read_schema(conn)
+    except Exception as e:
+        logging.error(f"Error reading SQLite schema: {e}")
+        return None
+
+
+def _read_schema(conn) -> Dict[str, List[str]]:
+    """Colonnes de toutes les tables et vues, en une requête ; mémorisées pour _get_table_columns"""
+    result = conn.execute(text("""
+        SELECT m.name AS table_name, p.name AS column_name
+        FROM sqlite_master m
+        JOIN pragma_table_info(m.name) p
+        WHERE m.type IN ('table', 'view')
+            AND m.name NOT LIKE 'sqlite_%'
+        ORDER BY m.name, p.cid
+    """))
+    schema: Dict[str, List[str]] = {}
+    for row in result:
+        schema.setdefault(row.table_name, []).append(row.column_name)
+    _table_columns.update(schema)
+    return schema
+
+
+def _get_table_columns(conn, table: str) -> List[str]:
+    """Retourne (et mémorise) la liste des colonnes d'une table"""
+    if table not in _table_columns:
+        # One query for every table rather than one per table of the bundle
+        _read_schema(conn)
+        _table_columns.setdefault(table, [])
+    return _table_columns[table]
+
+
+def _farm_bundle_plan() -> List[tuple]:
+    """Retourne les couples (table, clause WHERE) composant un bundle de farm"""
+    plan = [
+        ("farms", "uuid = :farm_uuid"),
+        ("farm_types", "id = (SELECT farm_type_id FROM farms WHERE uuid = :farm_uuid)")
+    ]
+    plan += [(table, f"{column} = :farm_uuid") for table, column in FARM_LINKED_TABLES.items()]
+    plan.append((
+        "ice_detection_systems",
+        "uuid IN (SELECT ice_detection_system_uuid FROM farm_ice_detection_systems WHERE farm_uuid = :farm_uuid)"
+    ))
+    return plan
+
+
+def get_farm_bundle(farm_uuid: str, columns: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, List[dict]]]:
+    """
+    Récupère toutes les lignes liées à un farm en une seule requête SQLite
 
-            for i, (key, value) in enumerate(filters.items()):
-                param_name = f"where_{i}"
-                where_clauses.append(f"{key} = :{param_name}")
-                params[param_name] = value
+    Chaque table est projetée en JSON (json_object) puis combinée par UNION ALL,
+    ce qui donne un seul aller-retour quelle que soit la structure des tables.
 
-            sql_query = f"DELETE FROM {table}"
-            if where_clauses:
-                sql_query += f" WHERE {' AND '.join(where_clauses)}"
+    Args:
+        columns: Projection {table: colonnes} ; les autres tables sont lues en entier
 
-            conn.execute(text(sql_query), params)
-            conn.commit()
-            return True
+    Returns:
+        Dict {table: [rows]} pour chaque table de FARM_BUNDLE_TABLES, ou None en cas d'erreur
+    """
+    try:
+        engine = _get_query_engine()
+        with engine.connect() as conn:
+            selects = []
+            for table, where_clause in _farm_bundle_plan():
+                table_columns = (columns or {}).get(table) or _get_table_columns(conn, table)
+                if not table_columns:
+                    continue
+                pairs = ", ".join(f"'{column}', \"{column}\"" for column in table_columns)
+                sort_column = FARM_PERFORMANCE_TABLES.get(table, "NULL")
+                selects.append(
+                    f"SELECT '{table}' AS _table, {sort_column} AS _sort, json_object({pairs}) AS _row "
+                    f"FROM {table} WHERE {where_clause}"
+                )
+
+            sql_query = " UNION ALL ".join(selects) + " ORDER BY _table, _sort"
+            result = conn.execute(text(sql_query), {"farm_uuid": farm_uuid})
+
+            bundle: Dict[str, List[dict]] = {table: [] for table in FARM_BUNDLE_TABLES}
+            for row in result:
+                bundle[row._table].append(json.loads(row._row))
+            return bundle
     except Exception as e:
-        logging.error(f"Error deleting from table {table}: {e}")
-        return False
\ No newline at end of file
+        logging.error(f"Error loading bundle for farm {farm_uuid}: {e}")
+        return None
+
+
+def _role_assignments_sql(link_table: str, farm_uuids: List[str]) -> tuple:
+    """Retourne (SQL, paramètres) de la jointure lien -> rôle -> entité de get_role_assignments"""
+    role_table, role_fk, entity_table, entity_fk = ROLE_LINKS[link_table]
+    where_clauses, params = _build_where({"l.farm_uuid": list(farm_uuids)}, "farm")
+
+    sql_query = (
+        f"SELECT l.farm_uuid AS _farm_uuid, r.id AS _role_id, r.role_name AS _role_name, e.* "
+        f"FROM {link_table} l "
+        f"JOIN {role_table} r ON r.id = l.{role_fk} "
+        f"LEFT JOIN {entity_table} e ON e.uuid = l.{entity_fk} "
+        f"WHERE {where_clauses[0]}"
+    )
+    return sql_query, params
+
+
+def get_role_assignments(link_table: str, farm_uuids: List[str]) -> Optional[List[dict]]:
+    """
+    Résout en une requête les rôles d'une table de liaison (farm_referents, ...)
+
+    Joint la table de liaison à sa table de rôles et à l'entité cible pour
+    tous les farms demandés.
+
+    Returns:
+        Liste de {farm_uuid, role_id, role_name, entity} (entity None si non renseignée),
+        ou None en cas d'erreur
+    """
+    try:
+        engine = _get_query_engine()
+        with engine.connect() as conn:
+            sql_query, params = _role_assignments_sql(link_table, farm_uuids)
+
+            assignments = []
+            for row in conn.execute(text(sql_query), params):
+                entity = dict(row._mapping)
+                assignments.append({
+                    'farm_uuid': entity.pop('_farm_uuid'),
+                    'role_id': entity.pop('_role_id'),
+                    'role_name': entity.pop('_role_name'),
+                    'entity': entity if entity.get('uuid') is not None else None
+                })
+            return assignments
+    except Exception as e:
+        logging.error(f"Error resolving roles from {link_table}: {e}")
+        return None
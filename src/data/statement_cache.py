@@ -0,0 +1,61 @@
+"""LRU cache of compiled SQL statements for dynamically built queries"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+
+class StatementCache:
+    """
+    Cache des TextClause construits dynamiquement, indexés par la forme de la requête
+
+    La clé décrit tout ce qui change le texte SQL (opération, table, colonnes,
+    forme des filtres, tri) mais pas les valeurs liées : réutiliser le même
+    TextClause permet à SQLAlchemy de réutiliser sa forme compilée et au
+    driver sqlite3 son statement préparé.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._statements: "OrderedDict[Hashable, TextClause]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build_sql: Callable[[], str]) -> TextClause:
+        """
+        Retourne le statement associé à une clé, en le construisant au premier appel
+
+        Args:
+            key: Forme de la requête
+            build_sql: Fonction produisant le texte SQL (appelée seulement en cas de miss)
+        """
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+
+        statement = text(build_sql())
+        with self._lock:
+            self._statements[key] = statement
+            while len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+        return statement
+
+    def stats(self) -> dict:
+        """Compteurs du cache (size, hits, misses)"""
+        with self._lock:
+            return {'size': len(self._statements), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._statements.clear()
+            self.hits = 0
+            self.misses = 0
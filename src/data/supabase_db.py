@@ -1,34 +1,165 @@
 """Supabase database implementation"""
 
+import heapq
+import itertools
 import logging
-from typing import Any, Optional, cast
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
 
+import httpx
+import pandas as pd
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
 from supabase import Client, create_client
 
 from config import settings
+from src.data.fanout import run_parallel
+from src.data.filters import COMPARISON_OPERATORS, AnyOf, as_condition
+from src.data.frames import frame_from_rows
+from src.data.metrics import record_response_bytes
+from src.data.query_budget import track_statement, tracking
+from src.data.schema import FARM_BUNDLE_TABLES, FARM_LINKED_TABLES, FARM_PERFORMANCE_TABLES, ROLE_LINKS
+from src.data.slow_queries import record_request
 
 # Global client instance for singleton pattern
 _client: Optional[Client] = None
 
-def init_supabase_connection() -> Client:
-    """Initialise la connexion au client Supabase"""
-    global _client
-    if _client is not None:
-        return _client
+# Columns giving the rows of each table a total order (primary key, or every column
+# without one), read with the schema from the OpenAPI description; None until then
+_row_keys: Optional[Dict[str, List[str]]] = None
 
+def get_supabase_credentials() -> tuple:
+    """Retourne (url, clé) Supabase depuis la configuration"""
     # Use Dynaconf settings directly
     supabase_url = settings.get('SUPABASE_URL')
     supabase_key = settings.get('SUPABASE_KEY') or settings.get('SUPABASE_API_KEY')
 
     if not supabase_url or not supabase_key:
         raise ValueError(f"Missing configuration: SUPABASE_URL={supabase_url}, SUPABASE_KEY={supabase_key}")
+    return supabase_url, supabase_key
+
+
+def init_supabase_connection() -> Client:
+    """Initialise la connexion au client Supabase"""
+    global _client
+    if _client is None:
+        supabase_url, supabase_key = get_supabase_credentials()
+        try:
+            _client = create_client(supabase_url, supabase_key)
+        except Exception as e:
+            logging.error(f"Error initializing Supabase client: {e}")
+            raise
+
+    watch_requests(_client.postgrest.session, _record_request, _record_response)
+    return _client
+
+
+def _record_request(request: httpx.Request) -> None:
+    """Hook httpx : transmet la requête PostgREST au journal des requêtes lentes et la chronomètre"""
+    record_request(request.method, str(request.url), request.content)
+    if tracking():
+        request.extensions['query_started'] = time.perf_counter()
+
+
+def _record_response(response: httpx.Response) -> None:
+    """Hook httpx : transmet la requête et sa durée au budget de requêtes du callback en cours"""
+    track_response(response)
+
+
+def track_response(response: httpx.Response) -> None:
+    """
+    Compte une requête PostgREST chronométrée par _record_request (durée jusqu'aux en-têtes)
+
+    La taille annoncée de la réponse (Content-Length) alimente aussi les mesures de la façade.
+    """
+    size = response.headers.get('content-length')
+    if size is not None and size.isdigit():
+        record_response_bytes(int(size))
+    started = response.request.extensions.get('query_started')
+    if started is not None:
+        request = response.request
+        track_statement(f"{request.method} {request.url.path}?{request.url.query.decode()}",
+                        time.perf_counter() - started)
+
+
+def watch_requests(session: Any, request_hook: Any, response_hook: Any) -> None:
+    """
+    Ajoute les hooks du journal des requêtes lentes et du budget de requêtes à la session httpx de PostgREST
+
+    Le client Supabase recrée sa session PostgREST à chaque changement de jeton :
+    les hooks sont donc vérifiés à chaque accès au client.
+    """
+    hooks = session.event_hooks
+    if request_hook not in hooks['request']:
+        session.event_hooks = {
+            **hooks,
+            'request': [*hooks['request'], request_hook],
+            'response': [*hooks['response'], response_hook]
+        }
+
+
+def explain_query_plan(statement: str, params: Any = None) -> Optional[List[str]]:
+    """PostgREST n'expose pas EXPLAIN sans configuration côté serveur : pas de plan pour Supabase"""
+    return None
+
 
+def load_schema() -> Optional[Dict[str, List[str]]]:
+    """
+    Lit les tables et colonnes exposées depuis la description OpenAPI de PostgREST
+
+    Retient aussi la clé primaire de chaque table (colonnes marquées <pk/>),
+    qui ordonne les lectures paginées (voir paging_order).
+
+    Returns:
+        Dict {table: [colonnes]}, ou None en cas d'erreur
+    """
+    global _row_keys
     try:
-        _client = create_client(supabase_url, supabase_key)
-        return _client
+        supabase_url, supabase_key = get_supabase_credentials()
+        response = httpx.get(
+            f"{supabase_url.rstrip('/')}/rest/v1/",
+            headers={
+                "apikey": supabase_key,
+                "Authorization": f"Bearer {supabase_key}",
+                "Accept": "application/openapi+json"
+            },
+            timeout=float(settings.get('db_fanout_timeout', 10))
+        )
+        response.raise_for_status()
+        definitions = response.json().get("definitions", {})
+        schema = {table: list(definition.get("properties", {})) for table, definition in definitions.items()}
+        _row_keys = {
+            table: [
+                column for column, description in definition.get("properties", {}).items()
+                if "<pk/>" in (description.get("description") or "")
+            ] or schema[table]
+            for table, definition in definitions.items()
+        }
+        return schema
     except Exception as e:
-        logging.error(f"Error initializing Supabase client: {e}")
-        raise
+        logging.error(f"Error reading Supabase schema: {e}")
+        return None
+
+
+def paging_order(table: str, order_by: Optional[str] = None) -> List[str]:
+    """
+    Colonnes de tri d'une lecture paginée : order_by, puis la clé de la table pour départager
+
+    Sans ordre total, PostgreSQL peut rendre les lignes dans un ordre différent
+    à chaque requête : des pages lues par range() se chevaucheraient ou
+    laisseraient des trous. La clé primaire départage les ex aequo ; une table
+    sans clé primaire est triée sur toutes ses colonnes (des lignes identiques
+    sont interchangeables). Le schéma est lu au premier appel.
+
+    Returns:
+        Colonnes de tri, order_by en premier (seulement order_by si la clé est inconnue)
+    """
+    global _row_keys
+    if _row_keys is None and load_schema() is None:
+        logging.warning("Supabase schema unavailable, paged reads are ordered by order_by only")
+        _row_keys = {}
+    keys = (_row_keys or {}).get(table, [])
+    return ([order_by] if order_by else []) + [key for key in keys if key != order_by]
 
 
 def execute_rpc(function_name: str) -> Any:
@@ -38,70 +169,732 @@ def execute_rpc(function_name: str) -> Any:
     return response.data
 
 
-def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None) -> Any:
-    """Exécute une requête SELECT sur une table Supabase"""
+# PostgREST error of an RPC whose function is not deployed (see src/data/sql/README.md)
+_NO_FUNCTION = "PGRST202"
+
+
+def get_table_stats(exact: bool = False) -> Optional[List[dict]]:
+    """
+    Statistiques des tables : nombre de colonnes et de lignes
+
+    En mode estimé, une seule RPC (get_table_estimates, voir
+    src/data/sql/get_table_estimates.sql) lit pg_class.reltuples. Les tables
+    jamais analysées, et toutes les tables en mode exact, sont comptées
+    (count=exact, sans lire de lignes) en parallèle. Si get_table_estimates
+    n'est pas déployée (PGRST202), la RPC get_table_stats du projet fournit
+    des comptages exacts.
+
+    Args:
+        exact: Compter les lignes plutôt que les estimer
+
+    Returns:
+        Liste de {table_name, column_count, row_count, estimated} triée par nom,
+        ou None en cas d'erreur
+    """
     try:
         client = init_supabase_connection()
-        query = client.table(table).select(columns)
+        try:
+            tables = [dict(row) for row in client.rpc("get_table_estimates").execute().data or []]
+        except APIError as e:
+            if e.code != _NO_FUNCTION:
+                raise
+            logging.warning("get_table_estimates is not deployed, reading get_table_stats")
+            return [{**row, 'estimated': False} for row in client.rpc("get_table_stats").execute().data or []]
 
-        if filters:
-            for key, value in filters.items():
-                query = query.eq(key, value)
+        to_count = [table['table_name'] for table in tables if exact or table['row_count'] is None]
+        counts = run_parallel(
+            {table: (lambda table=table: _count_rows(client, table)) for table in to_count},
+            width=int(settings.get('db_stats_count_width', 4)),
+            timeout=float(settings.get('db_fanout_timeout', 10)),
+            pool="stats"
+        )
+        for table in tables:
+            name = table['table_name']
+            table['estimated'] = name not in counts
+            if name in counts:
+                if counts[name] is None:
+                    raise RuntimeError(f"Could not count rows of {name}")
+                table['row_count'] = counts[name]
+        return tables
+    except Exception as e:
+        logging.error(f"Error reading Supabase table statistics: {e}")
+        return None
 
-        if order_by:
-            query = query.order(order_by)
 
-        response = query.execute()
-        return response.data
+def _count_rows(client: Client, table: str) -> int:
+    """Nombre exact de lignes d'une table (HEAD avec count=exact)"""
+    response = client.table(table).select("*", count=CountMethod.exact, head=True).execute()
+    return int(response.count or 0)
+
+
+def _postgrest_value(value: Any) -> str:
+    """Formate une valeur pour une expression or=(...), en la quotant si nécessaire"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    text_value = str(value)
+    if any(char in text_value for char in ',.:()" \\'):
+        return '"' + text_value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text_value
+
+
+def _postgrest_expression(column: str, value: Any) -> str:
+    """Traduit un filtre en expression PostgREST (column.op.value) pour or=(...)"""
+    if isinstance(value, AnyOf):
+        return "or(" + ",".join(_postgrest_group(group) for group in value.groups) + ")"
+
+    condition = as_condition(value)
+    op, operand = condition.op, condition.value
+    if op in COMPARISON_OPERATORS:
+        return f"{column}.{op}.{_postgrest_value(operand)}"
+    if op == "in":
+        return f"{column}.in.(" + ",".join(_postgrest_value(item) for item in operand) + ")"
+    if op == "between":
+        return f"and({column}.gte.{_postgrest_value(operand[0])},{column}.lte.{_postgrest_value(operand[1])})"
+    if op == "is_null":
+        return f"{column}.is.null"
+    if op == "not_null":
+        return f"{column}.not.is.null"
+    if op in ("like", "ilike"):
+        return f"{column}.{op}.{_postgrest_value(operand)}"
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _postgrest_group(group: dict) -> str:
+    """Traduit un groupe de filtres (AND) en expression PostgREST"""
+    expressions = [_postgrest_expression(column, value) for column, value in group.items()]
+    if len(expressions) == 1:
+        return expressions[0]
+    return "and(" + ",".join(expressions) + ")"
+
+
+def apply_filters(query: Any, filters: Optional[dict]) -> Any:
+    """
+    Applique un dict de filtres à une requête PostgREST
+
+    Voir src/data/filters.py : valeur simple (eq), list/tuple/set (in),
+    Condition (comparaisons, between, is null, like/ilike) ou AnyOf (or=(...)).
+    """
+    for column, value in (filters or {}).items():
+        if isinstance(value, AnyOf):
+            query = query.or_(",".join(_postgrest_group(group) for group in value.groups))
+            continue
+
+        condition = as_condition(value)
+        op, operand = condition.op, condition.value
+        if op in COMPARISON_OPERATORS:
+            query = getattr(query, op)(column, operand)
+        elif op == "in":
+            query = query.in_(column, operand)
+        elif op == "between":
+            query = query.gte(column, operand[0]).lte(column, operand[1])
+        elif op == "is_null":
+            query = query.is_(column, "null")
+        elif op == "not_null":
+            query = query.not_.is_(column, "null")
+        elif op == "like":
+            query = query.like(column, operand)
+        elif op == "ilike":
+            query = query.ilike(column, operand)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return query
+
+
+def _page_size() -> int:
+    """Taille des pages lues (ne doit pas dépasser le max-rows de PostgREST)"""
+    return int(settings.get('db_page_size', 1000))
+
+
+def select_query(client: Any, table: str, columns: str = "*", filters: Optional[dict] = None,
+                 order: Optional[List[str]] = None, count: Optional[CountMethod] = None) -> Any:
+    """Construit un select filtré et trié sur les colonnes de order, dans l'ordre (client sync ou async)"""
+    query = apply_filters(client.table(table).select(columns, count=count), filters)
+    for column in order or []:
+        query = query.order(column)
+    return query
+
+
+def _in_batch_size() -> int:
+    """Nombre maximal de valeurs d'un filtre IN par requête (la liste voyage dans l'URL)"""
+    return int(settings.get('db_in_batch_size', 100))
+
+
+def in_batches(filters: Optional[dict]) -> Optional[List[dict]]:
+    """
+    Découpe le plus long filtre IN trop long pour une URL en lots de db_in_batch_size valeurs
+
+    Returns:
+        Les filtres de chaque lot, ou None si les filtres tiennent en une requête
+    """
+    batch_size = _in_batch_size()
+    longest: Optional[Tuple[str, list]] = None
+    for column, value in (filters or {}).items():
+        if isinstance(value, AnyOf):
+            continue
+        condition = as_condition(value)
+        if condition.op == "in" and len(condition.value) > batch_size:
+            if longest is None or len(condition.value) > len(longest[1]):
+                longest = (column, list(condition.value))
+    if longest is None:
+        return None
+    column, values = longest
+    return [{**cast(dict, filters), column: values[start:start + batch_size]}
+            for start in range(0, len(values), batch_size)]
+
+
+def merge_batches(table: str, batches: List[List[dict]], order_by: Optional[str], limit: Optional[int],
+                  offset: int) -> List[dict]:
+    """
+    Réunit les lignes des lots d'un filtre IN découpé, dans l'ordre de la requête entière
+
+    Chaque lot a été lu avec limit = offset + limit depuis le début : le tri
+    sur paging_order (valeurs nulles en dernier, comme en ASC) puis la fenêtre
+    donnent le même résultat qu'une seule requête, tant que les colonnes de tri
+    sont sélectionnées.
+    """
+    rows = [row for batch in batches for row in batch]
+    if order_by is None and limit is None and not offset:
+        return rows
+    rows.sort(key=_row_order(paging_order(table, order_by)))
+    return rows[offset:] if limit is None else rows[offset:offset + limit]
+
+
+def _row_order(order: List[str]) -> Callable[[dict], tuple]:
+    """Clé de tri Python équivalente à ORDER BY order (ASC, valeurs nulles en dernier)"""
+    return lambda row: tuple((row.get(column) is None, row.get(column)) for column in order)
+
+
+def next_page_ranges(fetched: int, limit: Optional[int], offset: int,
+                     estimate: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Plages inclusives (début, fin) des prochaines pages à lire, toutes les pages reçues étant pleines
+
+    Sans estimation : la page suivante seule. Avec l'estimation du nombre de
+    lignes : toutes les pages jusqu'à l'estimation, et au moins une (elle peut
+    être inférieure au nombre réel).
+
+    Args:
+        fetched: Nombre de lignes déjà reçues
+        limit: Nombre maximal de lignes demandé (None : toutes)
+        offset: Position de la première ligne demandée
+        estimate: Nombre de lignes estimé (count=estimated), s'il est connu
+
+    Returns:
+        Liste vide une fois limit atteint
+    """
+    page_size = _page_size()
+    start = offset + fetched
+    stop = start + page_size if estimate is None else max(estimate, start + page_size)
+    if limit is not None:
+        stop = min(stop, offset + limit)
+    # Whole pages up to the estimate: a page cut at the estimate could not tell its end from a full page
+    last = offset + limit - 1 if limit is not None else None
+    return [
+        (page, page + page_size - 1 if last is None else min(page + page_size - 1, last))
+        for page in range(start, stop, page_size)
+    ]
+
+
+def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                  limit: Optional[int] = None, offset: int = 0) -> Any:
+    """
+    Exécute une requête SELECT sur une table Supabase, page par page
+
+    PostgREST tronque les réponses à son max-rows (db_page_size ne doit pas le
+    dépasser) : une page incomplète est la dernière, sans compter les lignes.
+    Si la première page est pleine, la deuxième demande une estimation du
+    nombre de lignes (count=estimated, sans COUNT(*) sur les grosses tables)
+    et les pages suivantes sont lues en parallèle (largeur db_page_fanout),
+    puis une à une si l'estimation était trop basse. Les lignes sont triées
+    sur order_by puis sur la clé de la table (paging_order) : sans ordre
+    total, des pages lues séparément pourraient se chevaucher. Un filtre IN de
+    plus de db_in_batch_size valeurs est découpé en requêtes parallèles, dont
+    les lignes sont réunies (merge_batches).
+
+    Args:
+        limit: Nombre maximal de lignes (None : toutes)
+        offset: Nombre de lignes à sauter
+    """
+    if limit is not None and limit <= 0:
+        return []
+    batches = in_batches(filters)
+    if batches is not None:
+        window = None if limit is None else offset + limit
+        results = run_parallel(
+            {
+                position: (lambda batch=batch: execute_query(table, columns, batch, order_by, window))
+                for position, batch in enumerate(batches)
+            },
+            width=int(settings.get('db_page_fanout', 4)),
+            timeout=float(settings.get('db_fanout_timeout', 10)),
+            pool="in_batches"
+        )
+        if any(rows is None for rows in results.values()):
+            logging.error(f"Error querying table {table}: an IN batch could not be read")
+            return None
+        return merge_batches(table, [results[position] for position in range(len(batches))], order_by, limit, offset)
+    try:
+        client = init_supabase_connection()
+        order = paging_order(table, order_by)
+        rows: List[dict] = []
+        estimate: Optional[int] = None
+        while True:
+            ranges = next_page_ranges(len(rows), limit, offset, estimate)
+            if not ranges:
+                return rows
+            if len(ranges) == 1:
+                # The page after a full first page also brings the estimated row count
+                count = CountMethod.estimated if rows and estimate is None else None
+                response = select_query(client, table, columns, filters, order, count).range(
+                    *ranges[0]
+                ).execute()
+                if count is not None:
+                    estimate = response.count
+                pages = {ranges[0]: response.data}
+            else:
+                pages = run_parallel(
+                    {
+                        page: (lambda page=page: select_query(client, table, columns, filters, order)
+                               .range(*page).execute().data)
+                        for page in ranges
+                    },
+                    width=int(settings.get('db_page_fanout', 4)),
+                    timeout=float(settings.get('db_fanout_timeout', 10)),
+                    pool="pages"
+                )
+            for start, end in ranges:
+                data = pages[(start, end)]
+                if data is None:
+                    raise RuntimeError(f"page {start}-{end} could not be read")
+                rows.extend(data)
+                if len(data) < end - start + 1:
+                    return rows
     except Exception as e:
         logging.error(f"Error querying table {table}: {e}")
         return None
 
 
-def update_record(table: str, filters: dict, data: dict) -> bool:
+def iter_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+               batch_size: Optional[int] = None) -> Iterator[dict]:
     """
-    Met à jour un enregistrement dans une table Supabase
+    Parcourt le résultat d'un SELECT Supabase page par page, sans le matérialiser
+
+    Une seule page (batch_size lignes, au plus db_page_size, qui ne dépasse pas
+    le max-rows de PostgREST) est en mémoire à la fois ; une page incomplète
+    est la dernière, sans compter les lignes. Les
+    pages sont triées sur order_by puis sur la clé de la table (paging_order),
+    pour ne rien dupliquer ni sauter. Un filtre IN de plus de db_in_batch_size
+    valeurs donne un parcours par lot, fusionnés dans l'ordre. Une erreur est
+    journalisée puis propagée, pour ne pas tronquer silencieusement un parcours.
     """
+    batches = in_batches(filters)
+    if batches is not None:
+        streams = [iter_query(table, columns, batch, order_by, batch_size) for batch in batches]
+        if order_by is None:
+            yield from itertools.chain.from_iterable(streams)
+        else:
+            yield from heapq.merge(*streams, key=_row_order(paging_order(table, order_by)))
+        return
+
+    page_size = min(batch_size or _page_size(), _page_size())
     try:
         client = init_supabase_connection()
-        query = client.table(table).update(data)
+        order = paging_order(table, order_by)
+        start = 0
+        while True:
+            data = select_query(client, table, columns, filters, order).range(
+                start, start + page_size - 1
+            ).execute().data
+            yield from data
+            start += len(data)
+            if len(data) < page_size:
+                break
+    except Exception as e:
+        logging.error(f"Error streaming table {table}: {e}")
+        raise
+
+
+def query_frame(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                limit: Optional[int] = None, offset: int = 0,
+                parse_dates: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Exécute un SELECT Supabase (paginé) et construit un DataFrame typé colonne par colonne"""
+    rows = execute_query(table, columns, filters, order_by, limit, offset)
+    if rows is None:
+        return None
+    try:
+        return frame_from_rows(rows, columns, parse_dates)
+    except Exception as e:
+        logging.error(f"Error building frame for table {table}: {e}")
+        return None
 
-        for key, value in filters.items():
-            query = query.eq(key, value)
+
+def update_record(table: str, filters: dict, data: dict) -> Optional[List[dict]]:
+    """
+    Met à jour des enregistrements dans une table Supabase (Prefer: return=representation)
+
+    Returns:
+        Les lignes modifiées, ou None en cas d'erreur
+    """
+    try:
+        client = init_supabase_connection()
+        query = apply_filters(client.table(table).update(data, returning=ReturnMethod.representation), filters)
 
         response = query.execute()
-        return True
+        return list(response.data or [])
     except Exception as e:
         logging.error(f"Error updating table {table}: {e}")
-        return False
+        return None
 
 
 def insert_record(table: str, data: dict) -> Optional[dict]:
     """
-    Insère un nouvel enregistrement dans une table Supabase
+    Insère un nouvel enregistrement dans une table Supabase (Prefer: return=representation)
     """
     try:
         client = init_supabase_connection()
-        response = client.table(table).insert(data).execute()
+        response = client.table(table).insert(data, returning=ReturnMethod.representation).execute()
         return cast(dict, response.data[0]) if response.data else None
     except Exception as e:
         logging.error(f"Error inserting into table {table}: {e}")
         return None
 
 
-def delete_record(table: str, filters: dict) -> bool:
+def _write_batches(table: str, rows: List[dict], upsert: bool, on_conflict: Optional[str]) -> Optional[int]:
+    """Envoie des lignes par POST groupés de db_write_batch_size lignes"""
+    if not rows:
+        return 0
+    batch_size = int(settings.get('db_write_batch_size', 500))
+    written = 0
+    try:
+        client = init_supabase_connection()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            if upsert:
+                # Prefer: resolution=merge-duplicates
+                query = client.table(table).upsert(
+                    batch, on_conflict=on_conflict or "", returning=ReturnMethod.minimal, default_to_null=False
+                )
+            else:
+                query = client.table(table).insert(batch, returning=ReturnMethod.minimal, default_to_null=False)
+            query.execute()
+            written += len(batch)
+        return written
+    except Exception as e:
+        logging.error(f"Error {'upserting' if upsert else 'inserting'} rows into table {table} "
+                      f"({written} of {len(rows)} written): {e}")
+        return None
+
+
+def insert_many(table: str, rows: List[dict]) -> Optional[int]:
     """
-    Supprime un enregistrement d'une table Supabase
+    Insère plusieurs enregistrements dans une table Supabase par POST groupés
+
+    Chaque lot est atomique ; en cas d'erreur, les lots précédents restent écrits.
+
+    Returns:
+        Nombre de lignes insérées, ou None en cas d'erreur
+    """
+    return _write_batches(table, rows, upsert=False, on_conflict=None)
+
+
+def upsert(table: str, rows: List[dict], on_conflict: Optional[str] = None) -> Optional[int]:
+    """
+    Insère ou met à jour plusieurs enregistrements Supabase (resolution=merge-duplicates)
+
+    Args:
+        on_conflict: Colonnes ("a,b") d'une contrainte d'unicité ; None : clé primaire
+
+    Returns:
+        Nombre de lignes écrites, ou None en cas d'erreur
+    """
+    return _write_batches(table, rows, upsert=True, on_conflict=on_conflict)
+
+
+# PostgreSQL error of an ON CONFLICT whose columns match no unique constraint or index
+_NO_UNIQUE_KEY = "42P10"
+
+
+def upsert_one(table: str, key: str, data: dict) -> Optional[dict]:
+    """
+    Insère ou met à jour l'unique ligne identifiée par une clé (upsert PostgREST on_conflict)
+
+    L'upsert demande une contrainte d'unicité sur la clé (tables 1:1 :
+    src/data/sql/farm_one_to_one_keys.sql). Sans elle, retombe sur un UPDATE
+    filtré sur la clé puis, si aucune ligne n'existe, un INSERT : deux requêtes
+    non atomiques, comme le ferait l'appelant.
+
+    Args:
+        key: Colonne(s) ("farm_uuid" ou "a,b") identifiant la ligne, présentes dans data
+
+    Returns:
+        La ligne écrite, ou None en cas d'erreur
     """
     try:
         client = init_supabase_connection()
-        query = client.table(table).delete()
+        try:
+            response = client.table(table).upsert(data, on_conflict=key).execute()
+        except APIError as e:
+            if e.code != _NO_UNIQUE_KEY:
+                raise
+            logging.warning(f"No unique key on {table} ({key}), saving with update then insert")
+            return _update_or_insert(client, table, key, data)
+        return cast(dict, response.data[0]) if response.data else None
+    except Exception as e:
+        logging.error(f"Error upserting into table {table}: {e}")
+        return None
 
-        for key, value in filters.items():
-            query = query.eq(key, value)
+
+def _update_or_insert(client: Client, table: str, key: str, data: dict) -> Optional[dict]:
+    """Met à jour la ligne de la clé, ou l'insère si elle n'existe pas ; retourne la ligne écrite"""
+    filters = {column.strip(): data[column.strip()] for column in key.split(",")}
+    query = apply_filters(client.table(table).update(data, returning=ReturnMethod.representation), filters)
+    updated = query.execute().data
+    if updated:
+        return cast(dict, updated[0])
+    response = client.table(table).insert(data, returning=ReturnMethod.representation).execute()
+    return cast(dict, response.data[0]) if response.data else None
+
+
+def delete_record(table: str, filters: dict) -> Optional[List[dict]]:
+    """
+    Supprime des enregistrements d'une table Supabase (Prefer: return=representation)
+
+    Returns:
+        Les lignes supprimées, ou None en cas d'erreur
+    """
+    try:
+        client = init_supabase_connection()
+        query = apply_filters(client.table(table).delete(returning=ReturnMethod.representation), filters)
 
         response = query.execute()
-        return True
+        return list(response.data or [])
     except Exception as e:
         logging.error(f"Error deleting from table {table}: {e}")
-        return False
\ No newline at end of file
+        return None
+
+
+def _as_rows(value: Any) -> List[dict]:
+    """Normalise une ressource embarquée PostgREST (objet, liste ou null) en liste"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def farm_bundle_query(client: Any, farm_uuid: str, columns: Optional[Dict[str, List[str]]] = None) -> Any:
+    """
+    Construit le select PostgREST d'un bundle de farm (client sync ou async)
+
+    Args:
+        columns: Projection {table: colonnes} ; les autres tables sont lues en entier
+    """
+    def select_list(table: str) -> str:
+        return ",".join((columns or {}).get(table) or ["*"])
+
+    embeds = [f"farm_types({select_list('farm_types')})"]
+    for table in FARM_LINKED_TABLES:
+        if table == "farm_ice_detection_systems":
+            embeds.append(
+                f"farm_ice_detection_systems({select_list(table)}, "
+                f"ice_detection_systems({select_list('ice_detection_systems')}))"
+            )
+        else:
+            embeds.append(f"{table}({select_list(table)})")
+
+    query = client.table("farms").select(", ".join([select_list("farms")] + embeds)).eq("uuid", farm_uuid)
+    for table, order_column in FARM_PERFORMANCE_TABLES.items():
+        query = query.order(order_column, foreign_table=table)
+    return query
+
+
+def parse_farm_bundle(data: Optional[List[dict]]) -> Dict[str, List[dict]]:
+    """Découpe la réponse d'un bundle de farm en {table: [rows]}"""
+    bundle: Dict[str, List[dict]] = {table: [] for table in FARM_BUNDLE_TABLES}
+    if not data:
+        return bundle
+
+    farm = dict(data[0])
+    for table in FARM_BUNDLE_TABLES:
+        if table not in ("farms", "ice_detection_systems"):
+            bundle[table] = _as_rows(farm.pop(table, None))
+
+    for link in bundle["farm_ice_detection_systems"]:
+        bundle["ice_detection_systems"] += _as_rows(link.pop("ice_detection_systems", None))
+
+    bundle["farms"] = [farm]
+    return bundle
+
+
+def get_farm_bundle(farm_uuid: str, columns: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, List[dict]]]:
+    """
+    Récupère toutes les lignes liées à un farm en une seule requête Supabase
+
+    Utilise les ressources embarquées PostgREST (select=*,farm_types(*),...)
+    en s'appuyant sur les clés étrangères vers farms.
+
+    Returns:
+        Dict {table: [rows]} pour chaque table de FARM_BUNDLE_TABLES, ou None en cas d'erreur
+    """
+    try:
+        client = init_supabase_connection()
+        response = farm_bundle_query(client, farm_uuid, columns).execute()
+        return parse_farm_bundle(response.data)
+    except Exception as e:
+        logging.error(f"Error loading bundle for farm {farm_uuid}: {e}")
+        return None
+
+
+def role_assignments_query(client: Any, link_table: str, farm_uuids: List[str]) -> Any:
+    """Construit le select PostgREST résolvant les rôles d'une table de liaison"""
+    role_table, role_fk, entity_table, entity_fk = ROLE_LINKS[link_table]
+    return (
+        client.table(link_table)
+        .select(f"farm_uuid, {role_fk}, {role_table}(id, role_name), {entity_table}(*)")
+        .in_("farm_uuid", farm_uuids)
+    )
+
+
+def parse_role_assignments(link_table: str, data: Optional[List[dict]]) -> List[dict]:
+    """Convertit la réponse de role_assignments_query en {farm_uuid, role_id, role_name, entity}"""
+    role_table, role_fk, entity_table, entity_fk = ROLE_LINKS[link_table]
+    assignments = []
+    for row in data or []:
+        roles = _as_rows(row.get(role_table))
+        if not roles:
+            continue
+        entities = _as_rows(row.get(entity_table))
+        assignments.append({
+            'farm_uuid': row['farm_uuid'],
+            'role_id': roles[0]['id'],
+            'role_name': roles[0]['role_name'],
+            'entity': entities[0] if entities else None
+        })
+    return assignments
+
+
+def get_role_assignments(link_table: str, farm_uuids: List[str]) -> Optional[List[dict]]:
+    """
+    Résout en une requête les rôles d'une table de liaison (farm_referents, ...)
+
+    Embarque la table de rôles et l'entité cible dans un select PostgREST
+    filtré sur farm_uuid=in.(...) ; au-delà de db_in_batch_size farms, une
+    requête par lot, en parallèle.
+
+    Returns:
+        Liste de {farm_uuid, role_id, role_name, entity} (entity None si non renseignée),
+        ou None en cas d'erreur
+    """
+    try:
+        client = init_supabase_connection()
+        batch_size = _in_batch_size()
+        batches = [farm_uuids[start:start + batch_size] for start in range(0, len(farm_uuids), batch_size)]
+        responses = run_parallel(
+            {
+                position: (lambda batch=batch: role_assignments_query(client, link_table, batch).execute().data)
+                for position, batch in enumerate(batches)
+            },
+            width=int(settings.get('db_page_fanout', 4)),
+            timeout=float(settings.get('db_fanout_timeout', 10)),
+            pool="in_batches"
+        )
+        if any(data is None for data in responses.values()):
+            raise RuntimeError("a batch of farms could not be read")
+        return parse_role_assignments(link_table, [row for data in responses.values() for row in data])
+    except Exception as e:
+        logging.error(f"Error resolving roles from {link_table}: {e}")
+        return None
+
+
+def _rpc_filters(filters: Optional[dict]) -> dict:
+    """
+    Filtres d'égalité {colonne: valeur} acceptés par apply_unit_of_work
+
+    Raises:
+        ValueError: Filtres vides (la fonction appliquerait l'écriture à toute la table) ou non d'égalité
+    """
+    if not filters:
+        raise ValueError("Unit of work updates and deletes need at least one filter")
+    rpc_filters = {}
+    for column, value in (filters or {}).items():
+        condition = as_condition(value)
+        if isinstance(value, AnyOf) or condition.op != "eq" or condition.value is None:
+            raise ValueError(f"Unit of work filters must be equalities, got {column}={value!r}")
+        rpc_filters[column] = condition.value
+    return rpc_filters
+
+
+class UnitOfWork:
+    """
+    Écritures Supabase regroupées en un seul appel RPC transactionnel
+
+    Les écritures sont mises en file puis envoyées ensemble au commit à la
+    fonction apply_unit_of_work (src/data/sql/apply_unit_of_work.sql), qui les
+    applique dans une seule transaction PostgreSQL. Les lectures sont
+    exécutées immédiatement et ne voient pas les écritures en file. Seuls les
+    filtres d'égalité, non vides, sont acceptés pour update/delete.
+
+    Si la fonction n'est pas déployée (PGRST202), les écritures sont envoyées
+    une à une, sans transaction : une erreur laisse les précédentes écrites.
+    """
+
+    def __init__(self):
+        # (table, filters, data) of each write, for cache invalidation after commit
+        self.writes: List[tuple] = []
+        self._ops: List[dict] = []
+
+    def execute_query(self, table: str, columns: str = "*", filters: Optional[dict] = None,
+                      order_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """SELECT immédiat (hors transaction)"""
+        rows = execute_query(table, columns, filters, order_by, limit, offset)
+        if rows is None:
+            raise RuntimeError(f"Error querying table {table}")
+        return rows
+
+    def insert_record(self, table: str, data: dict) -> None:
+        """Met un INSERT en file"""
+        self._ops.append({"op": "insert", "table": table, "data": data})
+        self.writes.append((table, None, data))
+
+    def update_record(self, table: str, filters: dict, data: dict) -> None:
+        """Met un UPDATE en file"""
+        self._ops.append({"op": "update", "table": table, "filters": _rpc_filters(filters), "data": data})
+        self.writes.append((table, filters, data))
+
+    def delete_record(self, table: str, filters: dict) -> None:
+        """Met un DELETE en file"""
+        self._ops.append({"op": "delete", "table": table, "filters": _rpc_filters(filters)})
+        self.writes.append((table, filters, None))
+
+    def commit(self) -> None:
+        """Envoie toutes les écritures en file en un seul appel"""
+        if self._ops:
+            client = init_supabase_connection()
+            try:
+                client.rpc("apply_unit_of_work", {"ops": self._ops}).execute()
+            except APIError as e:
+                if e.code != _NO_FUNCTION:
+                    raise
+                logging.warning("apply_unit_of_work is not deployed, sending the writes one by one")
+                self._apply_one_by_one()
+        self._ops = []
+
+    def _apply_one_by_one(self) -> None:
+        """Envoie les écritures en file une à une (sans transaction) ; s'arrête à la première erreur"""
+        for op in self._ops:
+            table = op["table"]
+            if op["op"] == "insert":
+                result = insert_record(table, op["data"])
+            elif op["op"] == "update":
+                result = update_record(table, op["filters"], op["data"])
+            else:
+                result = delete_record(table, op["filters"])
+            if result is None:
+                raise RuntimeError(f"Could not apply {op['op']} on {table}")
+
+    def rollback(self) -> None:
+        """Abandonne les écritures en file (rien n'a été envoyé)"""
+        self._ops = []
+        self.writes = []
@@ -0,0 +1,104 @@
+"""Cached snapshot of per-table statistics (column and row counts)"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class TableStatsCache:
+    """
+    Instantané {mode: lignes de statistiques} partagé par toutes les sessions
+
+    Deux modes : "estimate" (statistiques du planificateur, une requête) et
+    "exact" (COUNT(*) par table). Un instantané est servi tel quel tant qu'il
+    a moins de ttl secondes et qu'aucune écriture ne l'a marqué périmé. Un
+    instantané périmé est encore servi pendant qu'un thread le recalcule :
+    seul le tout premier chargement d'un mode fait attendre l'appelant.
+    """
+
+    def __init__(self, loader: Callable[[bool], Optional[List[dict]]], ttl: float,
+                 clock: Callable[[], float] = time.monotonic, background: bool = True):
+        """
+        Args:
+            loader: Fonction (exact) -> lignes {table_name, column_count, row_count, estimated},
+                None en cas d'erreur
+            ttl: Durée de vie (secondes) d'un instantané
+            clock: Horloge monotone (injectable pour les tests)
+            background: Recalculer les instantanés périmés dans un thread (False : sur place)
+        """
+        self._loader = loader
+        self._ttl = ttl
+        self._clock = clock
+        self._background = background
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, dict] = {}
+        self._refreshing: set = set()
+        # Bumped by every write, so a load that overlaps a write is kept stale
+        self._generation = 0
+
+    def get(self, exact: bool = False) -> Optional[List[dict]]:
+        """
+        Statistiques de toutes les tables
+
+        Args:
+            exact: Comptages exacts plutôt qu'estimés
+
+        Returns:
+            Copie des lignes de l'instantané, ou None si le premier chargement échoue
+        """
+        mode = "exact" if exact else "estimate"
+        with self._lock:
+            snapshot = self._snapshots.get(mode)
+        if snapshot is None:
+            rows = self._refresh(mode)
+            return [dict(row) for row in rows] if rows is not None else None
+
+        if snapshot['stale'] or self._clock() - snapshot['loaded_at'] >= self._ttl:
+            self._schedule_refresh(mode)
+        return [dict(row) for row in snapshot['rows']]
+
+    def invalidate(self) -> None:
+        """Marque les instantanés périmés (après une écriture) ; ils seront recalculés au prochain accès"""
+        with self._lock:
+            self._generation += 1
+            for snapshot in self._snapshots.values():
+                snapshot['stale'] = True
+
+    def clear(self) -> None:
+        """Oublie tous les instantanés"""
+        with self._lock:
+            self._snapshots.clear()
+
+    def _refresh(self, mode: str) -> Optional[List[dict]]:
+        """Recalcule un instantané ; un échec conserve l'instantané précédent"""
+        with self._lock:
+            generation = self._generation
+        loaded_at = self._clock()
+        rows = self._loader(mode == "exact")
+        with self._lock:
+            self._refreshing.discard(mode)
+            if rows is not None:
+                self._snapshots[mode] = {
+                    'rows': rows,
+                    'loaded_at': loaded_at,
+                    'stale': generation != self._generation
+                }
+        return rows
+
+    def _schedule_refresh(self, mode: str) -> None:
+        """Lance un seul recalcul à la fois par mode"""
+        with self._lock:
+            if mode in self._refreshing:
+                return
+            self._refreshing.add(mode)
+
+        if not self._background:
+            self._refresh(mode)
+            return
+        try:
+            threading.Thread(target=self._refresh, args=(mode,), name=f"table-stats-{mode}", daemon=True).start()
+        except RuntimeError as e:
+            logging.error(f"Could not refresh table statistics: {e}")
+            with self._lock:
+                self._refreshing.discard(mode)
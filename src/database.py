@@ -1,43 +1,256 @@
 """Unified database interface - routes to SQLite or Supabase implementation"""
 
+import asyncio
 import logging
-from typing import Any, List, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+import pandas as pd
 
 from config import settings
+from src.data.catalog import SchemaCatalog, parse_columns
+from src.data.fanout import run_parallel
+from src.data.farm_cache import SECTION_TABLES, FarmCache
+from src.data.filters import AnyOf, any_of, between, gt, gte, lte
+from src.data.metrics import instrumented
+from src.data.metrics import registry as _metrics
+from src.data.projections import view_projection
+from src.data.reference_cache import ReferenceCache
+from src.data.slow_queries import SlowQueryLog
+from src.data.schema import FARM_CONTRACT_TABLES, FARM_PERFORMANCE_TABLES
+from src.data.table_stats import TableStatsCache
 
 # Import dynamique selon l'environnement
 if settings.db_type == "sqlite":
+    from src.data import async_sqlite_db as adb
     from src.data import sqlite_db as db
 elif settings.db_type == "supabase":
+    from src.data import async_supabase_db as adb
     from src.data import supabase_db as db
 else:
     raise ValueError(f"Unsupported database type: {settings.db_type}")
 
+# Process-wide cache of the lookup tables (person_roles, company_roles, farm_types)
+_reference_cache = ReferenceCache(loader=lambda table: db.execute_query(table))
+
+# Process-wide LRU cache of per-farm sections, keyed by (farm_uuid, section, view)
+_farm_cache = FarmCache(
+    max_bytes=int(settings.get('farm_cache_max_bytes', 8 * 1024 * 1024)),
+    ttl=float(settings.get('farm_cache_ttl', 300)),
+    negative_ttl=float(settings.get('farm_cache_negative_ttl', 30))
+)
+
+# Table/column names of the backend, read once (PRAGMA table_info / PostgREST OpenAPI)
+_schema_catalog = SchemaCatalog(loader=db.load_schema)
+
+# Snapshot of the table statistics shown by the admin overview, refreshed after writes
+_table_stats = TableStatsCache(
+    loader=lambda exact: db.get_table_stats(exact),
+    ttl=float(settings.get('table_stats_ttl', 600))
+)
+
+
+
+def _backend() -> str:
+    """Nom du backend, étiquette des mesures"""
+    return settings.db_type
+
+
+# Facade calls slower than slow_query_threshold_ms, with their statements and plans
+_slow_queries = SlowQueryLog(backend=_backend, explain=db.explain_query_plan)
+
+
+def _facade_call(operation: str, payload_arg: Optional[str] = None) -> Callable:
+    """Décorateur des points d'entrée de la façade : mesures et journal des appels lents"""
+    def decorator(func: Callable) -> Callable:
+        return instrumented(_metrics, _backend, operation, payload_arg)(_slow_queries.watched(operation)(func))
+    return decorator
+
 
 # ==================== Exported Functions ====================
 
+@_facade_call("rpc")
 def execute_rpc(function_name: str) -> Any:
     """
     Interface unifiée pour exécuter des fonctions RPC
     Route automatiquement vers SQLite ou Supabase selon la configuration
+
+    "get_table_stats" est servi depuis l'instantané de get_table_stats.
     """
+    if function_name == "get_table_stats":
+        return get_table_stats()
     return db.execute_rpc(function_name)
 
 
-def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None) -> Any:
+def get_table_stats(exact: bool = False) -> List[dict]:
+    """
+    Statistiques de toutes les tables (nombre de colonnes et de lignes), depuis un instantané
+
+    Les estimations viennent des statistiques du planificateur sur Supabase
+    (pg_class.reltuples), de MAX(rowid) sur SQLite, en une requête ;
+    exact=True compte chaque table, en parallèle. L'instantané est recalculé
+    en arrière-plan après une écriture ou au bout de table_stats_ttl secondes.
+
+    Args:
+        exact: Comptages exacts (plus lents sur les grosses tables Supabase)
+
+    Returns:
+        Liste de {table_name, column_count, row_count, estimated} ([] en cas d'erreur)
+    """
+    return _table_stats.get(exact) or []
+
+
+@_facade_call("select")
+def execute_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                  limit: Optional[int] = None, offset: int = 0) -> Any:
     """
     Exécute une requête SELECT sur une table
 
+    Sur Supabase, les résultats dépassant le max-rows de PostgREST sont lus
+    page par page (db_page_size) : la liste retournée est toujours complète.
+
     Args:
         table: Table name
         columns: Columns to select (default: "*")
-        filters: Dictionary of filters {column: value}
+        filters: Dictionary of filters {column: value}; a list/tuple/set value filters with IN,
+            see src/data/filters.py for ranges, IS NULL, LIKE/ILIKE and OR groups
+        order_by: Column name to order by (required for stable limit/offset pages)
+        limit: Maximum number of rows (default: all)
+        offset: Number of rows to skip
+
+    Returns:
+        Query results or None on error (including unknown table/column names)
+    """
+    try:
+        _check_query(table, columns, filters, order_by)
+    except ValueError as e:
+        logging.error(f"Rejected query on {table}: {e}")
+        return None
+    return db.execute_query(table, columns, filters, order_by, limit, offset)
+
+
+def iter_query(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+               batch_size: Optional[int] = None) -> Iterator[dict]:
+    """
+    Parcourt le résultat d'un SELECT ligne par ligne, en mémoire constante
+
+    Sur SQLite le curseur est lu par lots (stream_results / yield_per), sur
+    Supabase page par page. À réserver aux parcours volumineux (exports,
+    contrôles qualité, historiques de performance) : contrairement à
+    execute_query, une erreur est propagée au lieu de renvoyer None.
+
+    Args:
+        table: Table name
+        columns: Columns to select (default: "*")
+        filters: Filtres, voir execute_query
         order_by: Column name to order by
+        batch_size: Lignes lues par aller-retour (default: db_page_size)
+
+    Yields:
+        Rows as dicts
+
+    Raises:
+        ValueError: unknown table/column names
+    """
+    _check_query(table, columns, filters, order_by)
+    return db.iter_query(table, columns, filters, order_by, batch_size or int(settings.get('db_page_size', 1000)))
+
+
+def query_frame(table: str, columns: str = "*", filters: Optional[dict] = None, order_by: Optional[str] = None,
+                limit: Optional[int] = None, offset: int = 0,
+                parse_dates: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Exécute une requête SELECT et retourne directement un DataFrame typé
+
+    Pour les analyses (performances, tarifs, portefeuille) : pd.read_sql sur
+    SQLite, construction colonne par colonne depuis le JSON sur Supabase. Les
+    dates sont converties en datetime64 et les colonnes numériques typées,
+    voir src/data/frames.py.
+
+    Args:
+        table, columns, filters, order_by, limit, offset: voir execute_query
+        parse_dates: Colonnes de dates (par défaut : *_date et *_at)
+
+    Returns:
+        DataFrame or None on error (including unknown table/column names)
+    """
+    try:
+        _check_query(table, columns, filters, order_by)
+    except ValueError as e:
+        logging.error(f"Rejected query on {table}: {e}")
+        return None
+    return db.query_frame(table, columns, filters, order_by, limit, offset, parse_dates)
+
+
+def execute_keyset_page(table: str, key_column: str, after: Any = None, limit: int = 100,
+                        columns: str = "*", filters: Optional[dict] = None) -> Any:
+    """
+    Lit une page de lignes triées par une colonne unique, à partir d'un curseur
+
+    Contrairement à offset, le coût ne dépend pas de la position de la page :
+    la page suivante s'obtient avec after=rows[-1][key_column] tant que la page
+    reçue est pleine.
+
+    Args:
+        table: Table name
+        key_column: Colonne unique et triable servant de curseur (doit figurer dans columns)
+        after: Valeur du curseur de la page précédente (None : première page)
+        limit: Taille de la page
+        columns: Columns to select (default: "*")
+        filters: Filtres supplémentaires, voir execute_query
 
     Returns:
-        Query results or None on error
+        Rows with key_column > after, ordered by key_column, or None on error
+    """
+    page_filters = dict(filters or {})
+    if after is not None:
+        cursor = gt(after)
+        if key_column in page_filters:
+            # Keep the caller's condition on the key: AND it through a one-group OR
+            page_filters[f"_after_{key_column}"] = any_of({key_column: cursor})
+        else:
+            page_filters[key_column] = cursor
+    return execute_query(table, columns, page_filters, order_by=key_column, limit=limit)
+
+
+def _check_query(table: str, columns: str, filters: Optional[dict], order_by: Optional[str]) -> None:
     """
-    return db.execute_query(table, columns, filters, order_by)
+    Valide les noms de table et de colonnes d'un SELECT avant qu'ils n'entrent dans le SQL
+
+    Les clés de filtres portant un groupe any_of sont des libellés : ce sont les
+    colonnes de leurs groupes qui sont vérifiées.
+
+    Raises:
+        ValueError: identifiant invalide, table ou colonne inconnue
+    """
+    names = parse_columns(columns)
+    for key, value in (filters or {}).items():
+        if isinstance(value, AnyOf):
+            names.extend(column for group in value.groups for column in group)
+        else:
+            names.append(key)
+    if order_by:
+        names.append(order_by)
+    _schema_catalog.validate(table, names)
+
+
+def _projection(view: Optional[str]) -> Dict[str, List[str]]:
+    """
+    Projection {table: colonnes} d'une vue, restreinte aux colonnes existantes
+
+    Les tables absentes de la vue (ou dont aucune colonne n'existe) sont lues en entier.
+    """
+    projection = {}
+    for table, columns in view_projection(view).items():
+        columns = _schema_catalog.restrict(table, columns)
+        if columns:
+            projection[table] = columns
+    return projection
+
+
+def _select(projection: Dict[str, List[str]], table: str) -> str:
+    """Liste de colonnes d'une table pour execute_query ("*" si non projetée)"""
+    return ", ".join(projection.get(table) or ["*"])
 
 
 def get_all_farms() -> List[dict]:
@@ -45,11 +258,11 @@ def get_all_farms() -> List[dict]:
     Récupère la liste de tous les parcs éoliens
 
     Returns:
-        List of farms with uuid, code, project, spv
+        List of farms with the "sidebar" projection (uuid, code, project, spv)
     """
     return execute_query(
         table="farms",
-        columns="uuid, code, project, spv",
+        columns=_select(_projection("sidebar"), "farms"),
         order_by="code"
     ) or []
 
@@ -72,9 +285,13 @@ def get_farm_by_code(farm_code: str) -> Optional[dict]:
     return results[0] if results else None
 
 
-def update_record(table: str, filters: dict, data: dict) -> bool:
+@_facade_call("update", payload_arg="data")
+def update_record(table: str, filters: dict, data: dict) -> Optional[int]:
     """
-    Met à jour un enregistrement dans une table
+    Met à jour les enregistrements d'une table correspondant aux filtres
+
+    Les lignes modifiées reviennent dans le même aller-retour (RETURNING * /
+    return=representation) et servent à invalider précisément les caches.
 
     Args:
         table: Nom de la table
@@ -82,11 +299,14 @@ def update_record(table: str, filters: dict, data: dict) -> bool:
         data: Dictionnaire des données à mettre à jour {column: new_value}
 
     Returns:
-        True si la mise à jour a réussi, False sinon
+        Nombre de lignes modifiées (0 si aucune ne correspond), ou None en cas d'erreur
     """
-    return db.update_record(table, filters, data)
+    rows = db.update_record(table, filters, data)
+    _after_write(table, filters, data, rows)
+    return len(rows) if rows is not None else None
 
 
+@_facade_call("insert", payload_arg="data")
 def insert_record(table: str, data: dict) -> Optional[dict]:
     """
     Insère un nouvel enregistrement dans une table
@@ -96,161 +316,885 @@ def insert_record(table: str, data: dict) -> Optional[dict]:
         data: Dictionnaire des données à insérer {column: value}
 
     Returns:
-        L'enregistrement inséré ou None en cas d'erreur
+        L'enregistrement inséré (valeurs par défaut comprises) ou None en cas d'erreur
+    """
+    result = db.insert_record(table, data)
+    _after_write(table, None, data)
+    return result
+
+
+def insert_many(table: str, rows: List[dict]) -> Optional[int]:
+    """
+    Insère plusieurs enregistrements en une seule opération
+
+    SQLite : executemany dans une seule transaction (tout ou rien).
+    Supabase : POST groupés de db_write_batch_size lignes (chaque lot est atomique).
+
+    Args:
+        table: Nom de la table
+        rows: Liste des enregistrements {column: value} ; une colonne absente prend sa valeur par défaut
+
+    Returns:
+        Nombre de lignes insérées, ou None en cas d'erreur
     """
-    return db.insert_record(table, data)
+    result = db.insert_many(table, rows)
+    _after_write(table, None, rows)
+    return result
 
 
-def delete_record(table: str, filters: dict) -> bool:
+def upsert(table: str, rows: List[dict], on_conflict: Optional[str] = None) -> Optional[int]:
     """
-    Supprime un enregistrement d'une table
+    Insère ou met à jour plusieurs enregistrements selon une contrainte d'unicité
+
+    SQLite : INSERT ... ON CONFLICT DO UPDATE en executemany.
+    Supabase : POST groupés avec Prefer: resolution=merge-duplicates.
+
+    Args:
+        table: Nom de la table
+        rows: Liste des enregistrements {column: value}
+        on_conflict: Colonnes ("farm_uuid" ou "a,b") d'une contrainte d'unicité
+            (défaut : clé primaire / toute contrainte)
+
+    Returns:
+        Nombre de lignes écrites, ou None en cas d'erreur
+    """
+    result = db.upsert(table, rows, on_conflict)
+    _after_write(table, None, rows)
+    return result
+
+
+def upsert_one(table: str, key: str, data: dict) -> Optional[dict]:
+    """
+    Insère ou met à jour une ligne identifiée par une clé, en une seule requête
+
+    Pensé pour les tables 1:1 d'un farm (FARM_ONE_TO_ONE_TABLES : farm_locations,
+    farm_statuses, tables contractuelles...) : plus besoin de lire la ligne pour
+    choisir entre insert_record et update_record. SQLite : INSERT ... ON CONFLICT
+    DO UPDATE ; Supabase : upsert PostgREST (on_conflict).
+
+    Args:
+        table: Nom de la table
+        key: Colonne(s) identifiant la ligne ("farm_uuid", "wind_farm_uuid"...), présentes dans data
+        data: Dictionnaire complet des données {column: value}
+
+    Returns:
+        La ligne écrite, ou None en cas d'erreur
+    """
+    result = db.upsert_one(table, key, data)
+    _after_write(table, None, data)
+    return result
+
+
+@_facade_call("delete", payload_arg="filters")
+def delete_record(table: str, filters: dict) -> Optional[int]:
+    """
+    Supprime les enregistrements d'une table correspondant aux filtres
 
     Args:
         table: Nom de la table
         filters: Dictionnaire des filtres pour identifier l'enregistrement {column: value}
 
     Returns:
-        True si la suppression a réussi, False sinon
+        Nombre de lignes supprimées (0 si aucune ne correspond), ou None en cas d'erreur
     """
-    return db.delete_record(table, filters)
+    rows = db.delete_record(table, filters)
+    _after_write(table, filters, None, rows)
+    return len(rows) if rows is not None else None
 
 
-# ==================== Farm Data Retrieval Functions ====================
+@contextmanager
+def transaction() -> Iterator[Any]:
+    """
+    Unité de travail : regroupe lectures et écritures et les valide d'un bloc
+
+    SQLite : une seule connexion et un seul commit ; les lectures voient les
+    écritures précédentes. Supabase : les écritures sont envoyées ensemble en
+    un seul appel RPC transactionnel (apply_unit_of_work) à la sortie du bloc.
+    Une exception dans le bloc annule tout ; une erreur est propagée.
 
-def get_farm_general_info(farm_uuid: str) -> dict:
+    Usage:
+        with transaction() as tx:
+            persons = tx.execute_query("persons", filters={...})
+            tx.insert_record("farm_referents", {...})
+
+    Yields:
+        Unité de travail avec execute_query, insert_record, update_record, delete_record
     """
-    Récupère toutes les informations générales d'un farm
+    unit = db.UnitOfWork()
+    try:
+        yield unit
+    except BaseException as e:
+        unit.rollback()
+        logging.error(f"Transaction rolled back: {e}")
+        raise
+
+    try:
+        unit.commit()
+    except Exception as e:
+        logging.error(f"Transaction commit failed: {e}")
+        raise
+    finally:
+        for table, filters, data in unit.writes:
+            _after_write(table, filters, data)
+
+
+def _after_write(table: str, filters: Optional[dict], data: Any, rows: Optional[List[dict]] = None) -> None:
+    """
+    Invalide les caches dépendant d'une table après une écriture
+
+    Args:
+        rows: Lignes retournées par l'écriture, si connues : elles portent les
+            uuid de farm même quand les filtres ne les contiennent pas
+    """
+    _reference_cache.invalidate(table)
+    if rows is None:
+        _farm_cache.invalidate_write(table, filters, data)
+        _table_stats.invalidate()
+    elif rows:
+        _farm_cache.invalidate_write(table, filters, rows + ([data] if data else []))
+        _table_stats.invalidate()
+
+
+def get_query_metrics() -> List[dict]:
+    """
+    Retourne les mesures des appels de la façade (execute_query, écritures, RPC)
 
     Returns:
-        Dict with keys: farm, farm_type, status, location
+        Une entrée par (backend, table, operation), voir MetricsRegistry.snapshot
     """
-    data = {}
+    return _metrics.snapshot()
+
+
+def render_query_metrics() -> str:
+    """Mesures des appels de la façade au format texte de Prometheus (endpoint /metrics)"""
+    return _metrics.render_prometheus()
+
+
+def get_farm_cache_stats() -> dict:
+    """
+    Retourne les compteurs du cache par farm
+
+    Returns:
+        Dict with keys: entries, bytes, max_bytes, hits, misses
+    """
+    return _farm_cache.stats()
+
+
+def _parallel_queries(queries: Dict[str, dict]) -> Dict[str, Any]:
+    """
+    Exécute des execute_query indépendants en parallèle (largeur db_fanout_width)
+
+    Args:
+        queries: Dict {clé: arguments nommés de execute_query}
+
+    Returns:
+        Dict {clé: résultat de execute_query, None en cas d'erreur ou de délai dépassé}
+    """
+    return run_parallel(
+        {key: (lambda kwargs=kwargs: execute_query(**kwargs)) for key, kwargs in queries.items()},
+        width=int(settings.get('db_fanout_width', 1)),
+        timeout=float(settings.get('db_fanout_timeout', 10))
+    )
+
+
+# A section loader is a generator: it yields batches of independent reads
+# {key: execute_query arguments}, receives {key: rows, None on error} for each
+# batch and returns the built section. _load runs it on the sync backend and
+# _aload on the async one, so both facades share the same loading code.
+SectionReads = Generator[Dict[str, dict], Dict[str, Any], Any]
+
+
+def _advance(reads: SectionReads, results: Optional[Dict[str, Any]]) -> Tuple[bool, Any]:
+    """
+    Fait avancer un chargeur de section jusqu'à son prochain lot de lectures
+
+    Returns:
+        Tuple (terminé, section) ou (False, lot de lectures suivant)
+    """
+    try:
+        return False, reads.send(results)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def _complete(results: Dict[str, Any]) -> bool:
+    """Vrai si aucune lecture d'un lot n'a échoué (None : erreur du backend ou délai dépassé)"""
+    return all(rows is not None for rows in results.values())
+
+
+def _load(reads: SectionReads) -> Tuple[Any, bool]:
+    """
+    Exécute un chargeur de section sur le backend synchrone, chaque lot en parallèle
+
+    Returns:
+        Tuple (section, complète) ; une section incomplète (une lecture a
+        échoué, ses lignes y sont vides) ne doit pas être mise en cache
+    """
+    results, complete = None, True
+    while True:
+        done, step = _advance(reads, results)
+        if done:
+            return step, complete
+        results = _parallel_queries(step)
+        complete = complete and _complete(results)
+
+
+def _cached_section(farm_uuid: str, section: str, reads: Callable[[str, Optional[str]], SectionReads],
+                    view: Optional[str] = None) -> dict:
+    """Sert une section (projetée pour view) depuis le cache par farm, ou la charge et la mémorise"""
+    hit, value = _farm_cache.get(farm_uuid, section, view)
+    if hit:
+        return value
+
+    value, complete = _load(reads(farm_uuid, view))
+    if complete:
+        _farm_cache.put(farm_uuid, section, value, view)
+    return value
+
+
+# ==================== Reference Data Functions ====================
+
+def get_reference_rows(table: str) -> List[dict]:
+    """
+    Récupère toutes les lignes d'une table de référence depuis le cache mémoire
+
+    Args:
+        table: person_roles, company_roles ou farm_types
+
+    Returns:
+        List of rows
+    """
+    return _reference_cache.rows(table)
+
+
+def get_reference_by_id(table: str, row_id: Any) -> Optional[dict]:
+    """
+    Récupère une ligne d'une table de référence par identifiant, depuis le cache mémoire
+
+    Returns:
+        Row or None
+    """
+    return _reference_cache.get_by_id(table, row_id)
+
+
+def get_reference_by_name(table: str, name: str) -> Optional[dict]:
+    """
+    Récupère une ligne d'une table de référence par nom (role_name / type_title),
+    depuis le cache mémoire
+
+    Returns:
+        Row or None
+    """
+    return _reference_cache.get_by_name(table, name)
+
+
+# ==================== Role Resolution Functions ====================
+
+def _get_role_assignments(link_table: str, farm_uuids: List[str]) -> Dict[str, Dict[str, dict]]:
+    """
+    Résout toutes les affectations rôle -> entité d'une table de liaison
+
+    Returns:
+        Dict {farm_uuid: {role_name: entity}} ; une affectation sans entité vaut {}
+    """
+    if not farm_uuids:
+        return {}
+    return _role_mapping(farm_uuids, db.get_role_assignments(link_table, list(farm_uuids)))
+
+
+def _role_mapping(farm_uuids: List[str], assignments: Optional[List[dict]]) -> Dict[str, Dict[str, dict]]:
+    """Regroupe par farm les affectations {farm_uuid, role_name, entity} d'une table de liaison"""
+    mapping: Dict[str, Dict[str, dict]] = {farm_uuid: {} for farm_uuid in farm_uuids}
+    for assignment in assignments or []:
+        roles = mapping.setdefault(assignment['farm_uuid'], {})
+        roles[assignment['role_name']] = assignment['entity'] or {}
+    return mapping
+
+
+def get_farms_referents(farm_uuids: List[str]) -> Dict[str, Dict[str, dict]]:
+    """
+    Récupère les référents (rôle -> personne) de plusieurs farms en une requête
 
-    # Get main farm data
-    farm_results = execute_query("farms", filters={"uuid": farm_uuid})
-    data['farm'] = farm_results[0] if farm_results else None
+    Sur Supabase, une requête par lot de db_in_batch_size farms (la liste voyage dans l'URL).
+
+    Args:
+        farm_uuids: Liste des UUID de farms
+
+    Returns:
+        Dict {farm_uuid: {role_name: person}} ; un rôle affecté sans personne vaut {}
+    """
+    return _get_role_assignments("farm_referents", farm_uuids)
+
+
+def get_farm_referents(farm_uuid: str) -> Dict[str, dict]:
+    """
+    Récupère tous les référents (rôle -> personne) d'un farm en une requête
+
+    Returns:
+        Dict {role_name: person} ; un rôle affecté sans personne vaut {}
+    """
+    return get_farms_referents([farm_uuid])[farm_uuid]
+
+
+def get_farms_companies(farm_uuids: List[str]) -> Dict[str, Dict[str, dict]]:
+    """
+    Récupère les prestataires (rôle -> entreprise) de plusieurs farms en une requête
+
+    Sur Supabase, une requête par lot de db_in_batch_size farms (la liste voyage dans l'URL).
+
+    Args:
+        farm_uuids: Liste des UUID de farms
+
+    Returns:
+        Dict {farm_uuid: {role_name: company}} ; un rôle affecté sans entreprise vaut {}
+    """
+    return _get_role_assignments("farm_company_roles", farm_uuids)
+
+
+def get_farm_companies(farm_uuid: str) -> Dict[str, dict]:
+    """
+    Récupère tous les prestataires (rôle -> entreprise) d'un farm en une requête
+
+    Returns:
+        Dict {role_name: company} ; un rôle affecté sans entreprise vaut {}
+    """
+    return get_farms_companies([farm_uuid])[farm_uuid]
+
+
+# ==================== Farm Data Retrieval Functions ====================
+
+def _first(rows: Optional[List[dict]]) -> Optional[dict]:
+    """Retourne la première ligne d'un résultat ou None"""
+    return rows[0] if rows else None
+
+
+def _contract_key(table: str) -> str:
+    """Clé de section pour une table contractuelle (farm_om_contracts -> om_contracts)"""
+    return table.replace("farm_", "").replace("_", " ").title().replace(" ", "_").lower()
+
+
+def _build_general_info(tables: Dict[str, List[dict]]) -> dict:
+    """Construit la section general_info à partir des lignes {table: [rows]}"""
+    data = {}
+    data['farm'] = _first(tables.get("farms"))
 
     if not data['farm']:
         return data
 
-    # Get farm type
     if data['farm'].get('farm_type_id'):
-        type_results = execute_query("farm_types", filters={"id": data['farm']['farm_type_id']})
-        data['farm_type'] = type_results[0] if type_results else None
+        data['farm_type'] = _first(tables.get("farm_types"))
 
-    # Get farm status
-    status_results = execute_query("farm_statuses", filters={"farm_uuid": farm_uuid})
-    data['status'] = status_results[0] if status_results else None
+    data['status'] = _first(tables.get("farm_statuses"))
+    data['location'] = _first(tables.get("farm_locations"))
+    return data
 
-    # Get farm location
-    location_results = execute_query("farm_locations", filters={"farm_uuid": farm_uuid})
-    data['location'] = location_results[0] if location_results else None
 
-    return data
+def _build_technical_details(tables: Dict[str, List[dict]]) -> dict:
+    """Construit la section technical_details à partir des lignes {table: [rows]}"""
+    return {
+        'turbine_details': _first(tables.get("farm_turbine_details")),
+        'substations': tables.get("substations") or [],
+        'wtg_list': tables.get("wind_turbine_generators") or [],
+        'ice_systems': tables.get("ice_detection_systems") or []
+    }
 
 
-def get_farm_technical_details(farm_uuid: str) -> dict:
+def _build_contracts_admin(tables: Dict[str, List[dict]]) -> dict:
+    """Construit la section contracts_admin à partir des lignes {table: [rows]}"""
+    return {_contract_key(table): _first(tables.get(table)) for table in FARM_CONTRACT_TABLES}
+
+
+def _build_performance_data(tables: Dict[str, List[dict]]) -> dict:
+    """Construit la section performance_data à partir des lignes {table: [rows]}"""
+    return {
+        'actual_performances': tables.get("farm_actual_performances") or [],
+        'target_performances': tables.get("farm_target_performances") or [],
+        'tariffs': tables.get("farm_tariffs") or []
+    }
+
+
+def get_farm_general_info(farm_uuid: str, view: Optional[str] = None) -> dict:
     """
-    Récupère tous les détails techniques d'un farm
+    Récupère toutes les informations générales d'un farm (via le cache par farm)
+
+    Args:
+        farm_uuid: UUID du farm
+        view: Vue affichée (voir src/data/projections.py), None pour toutes les colonnes
 
     Returns:
-        Dict with keys: turbine_details, substations, wtg_list, ice_systems
+        Dict with keys: farm, farm_type, status, location
     """
-    data = {}
+    return _cached_section(farm_uuid, "general_info", _general_info_reads, view)
+
+
+def _general_info_reads(farm_uuid: str, view: Optional[str] = None) -> SectionReads:
+    """Chargeur de la section general_info : le farm, puis son statut et sa localisation"""
+    projection = _projection(view)
+    tables = yield {
+        "farms": {"table": "farms", "columns": _select(projection, "farms"), "filters": {"uuid": farm_uuid}}
+    }
+
+    farm = _first(tables["farms"])
+    if not farm:
+        return _build_general_info(tables)
+
+    # Get farm type (reference data, served from memory)
+    if farm.get('farm_type_id'):
+        farm_type = get_reference_by_id("farm_types", farm['farm_type_id'])
+        tables["farm_types"] = [farm_type] if farm_type else []
+
+    # Get farm status and location
+    tables.update((yield {
+        table: {"table": table, "columns": _select(projection, table), "filters": {"farm_uuid": farm_uuid}}
+        for table in ("farm_statuses", "farm_locations")
+    }))
+
+    return _build_general_info(tables)
+
+
+def get_farms_technical_details(farm_uuids: List[str], view: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Récupère les détails techniques de plusieurs farms en un nombre constant de requêtes
+
+    Les farms présents dans le cache par farm sont servis depuis la mémoire,
+    les autres sont chargés ensemble (sur Supabase, par lots de
+    db_in_batch_size farms par requête).
+
+    Args:
+        farm_uuids: Liste des UUID de farms
+        view: Vue affichée (voir src/data/projections.py), None pour toutes les colonnes
+
+    Returns:
+        Dict {farm_uuid: technical_details}, voir get_farm_technical_details
+    """
+    details: Dict[str, dict] = {}
+    missing = []
+    for farm_uuid in dict.fromkeys(farm_uuids):
+        hit, value = _farm_cache.get(farm_uuid, "technical_details", view)
+        if hit:
+            details[farm_uuid] = value
+        else:
+            missing.append(farm_uuid)
+
+    loaded, complete = _load(_technical_details_reads(missing, view))
+    for farm_uuid, value in loaded.items():
+        if complete:
+            _farm_cache.put(farm_uuid, "technical_details", value, view)
+        details[farm_uuid] = value
+    return details
+
+
+# Farm key column of the tables read by the technical_details section
+_TECHNICAL_FARM_COLUMNS = {
+    "farm_turbine_details": "wind_farm_uuid",
+    "substations": "farm_uuid",
+    "wind_turbine_generators": "farm_uuid",
+    "farm_ice_detection_systems": "farm_uuid"
+}
+
+
+def _technical_details_reads(farm_uuids: List[str], view: Optional[str] = None) -> SectionReads:
+    """Chargeur de la section technical_details de plusieurs farms (Dict {farm_uuid: section})"""
+    if not farm_uuids:
+        return {}
 
-    # Get turbine details (wind farms only)
-    turbine_results = execute_query("farm_turbine_details", filters={"wind_farm_uuid": farm_uuid})
-    data['turbine_details'] = turbine_results[0] if turbine_results else None
+    # Turbine details (wind farms only), substations, wind turbine generators and ice links
+    projection = _projection(view)
+    results = yield {
+        table: {"table": table, "columns": _select(projection, table), "filters": {farm_column: farm_uuids}}
+        for table, farm_column in _TECHNICAL_FARM_COLUMNS.items()
+    }
 
-    # Get substations
-    data['substations'] = execute_query("substations", filters={"farm_uuid": farm_uuid}) or []
+    # Ice detection systems: all systems referenced by the links in one IN fetch
+    system_uuids = _ice_system_uuids(results)
+    ice_systems = (yield {"ice_detection_systems": {
+        "table": "ice_detection_systems",
+        "columns": _select(projection, "ice_detection_systems"),
+        "filters": {"uuid": system_uuids}
+    }})["ice_detection_systems"] if system_uuids else []
+    return _group_technical_details(farm_uuids, results, ice_systems)
 
-    # Get wind turbine generators
-    data['wtg_list'] = execute_query("wind_turbine_generators", filters={"farm_uuid": farm_uuid}) or []
 
-    # Get ice detection systems
-    ice_farm_links = execute_query("farm_ice_detection_systems", filters={"farm_uuid": farm_uuid}) or []
-    data['ice_systems'] = []
-    for link in ice_farm_links:
-        ice_system = execute_query("ice_detection_systems", filters={"uuid": link['ice_detection_system_uuid']})
+def _farm_technical_details_reads(farm_uuid: str, view: Optional[str] = None) -> SectionReads:
+    """Chargeur de la section technical_details d'un seul farm"""
+    return (yield from _technical_details_reads([farm_uuid], view))[farm_uuid]
+
+
+def _ice_system_uuids(results: Dict[str, Any]) -> List[str]:
+    """UUID des systèmes de détection de glace référencés par les liens chargés"""
+    return list({link['ice_detection_system_uuid'] for link in results["farm_ice_detection_systems"] or []})
+
+
+def _group_technical_details(farm_uuids: List[str], results: Dict[str, Any],
+                             ice_systems: Optional[List[dict]]) -> Dict[str, dict]:
+    """Répartit par farm les lignes techniques chargées en lot et construit les sections"""
+    grouped: Dict[str, Dict[str, List[dict]]] = {farm_uuid: {} for farm_uuid in farm_uuids}
+    for table in ("farm_turbine_details", "substations", "wind_turbine_generators"):
+        for row in results[table] or []:
+            grouped[row[_TECHNICAL_FARM_COLUMNS[table]]].setdefault(table, []).append(row)
+
+    systems_by_uuid = {system['uuid']: system for system in ice_systems or []}
+    for link in results["farm_ice_detection_systems"] or []:
+        ice_system = systems_by_uuid.get(link['ice_detection_system_uuid'])
         if ice_system:
-            data['ice_systems'].append(ice_system[0])
+            grouped[link['farm_uuid']].setdefault("ice_detection_systems", []).append(ice_system)
 
-    return data
+    return {farm_uuid: _build_technical_details(tables) for farm_uuid, tables in grouped.items()}
+
+
+def get_farm_technical_details(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """
+    Récupère tous les détails techniques d'un farm
+
+    Returns:
+        Dict with keys: turbine_details, substations, wtg_list, ice_systems
+    """
+    return get_farms_technical_details([farm_uuid], view)[farm_uuid]
 
 
-def get_farm_contracts_admin(farm_uuid: str) -> dict:
+def get_farm_contracts_admin(farm_uuid: str, view: Optional[str] = None) -> dict:
     """
     Récupère toutes les informations contractuelles et administratives d'un farm
+    (via le cache par farm)
 
     Returns:
-        Dict with keys: administration, om_contract, tcma_contract, electrical_delegation,
-                       environmental_installation, financial_guarantee, substation_details
+        Dict with keys: administrations, om_contracts, tcma_contracts, electrical_delegations,
+                       environmental_installations, financial_guarantees, substation_details
     """
-    data = {}
+    return _cached_section(farm_uuid, "contracts_admin", _contracts_admin_reads, view)
 
-    # Get all 1:1 relationship tables
-    tables = [
-        "farm_administrations",
-        "farm_om_contracts",
-        "farm_tcma_contracts",
-        "farm_electrical_delegations",
-        "farm_environmental_installations",
-        "farm_financial_guarantees",
-        "farm_substation_details"
-    ]
-
-    for table in tables:
-        results = execute_query(table, filters={"farm_uuid": farm_uuid})
-        key = table.replace("farm_", "").replace("_", " ").title().replace(" ", "_").lower()
-        data[key] = results[0] if results else None
 
-    return data
+def _contracts_admin_reads(farm_uuid: str, view: Optional[str] = None) -> SectionReads:
+    """Chargeur de la section contracts_admin"""
+    # Get all 1:1 relationship tables (independent reads, fanned out)
+    projection = _projection(view)
+    tables = yield {
+        table: {"table": table, "columns": _select(projection, table), "filters": {"farm_uuid": farm_uuid}}
+        for table in FARM_CONTRACT_TABLES
+    }
+    return _build_contracts_admin(tables)
 
 
-def get_farm_performance_data(farm_uuid: str) -> dict:
+def get_farm_performance_data(farm_uuid: str, view: Optional[str] = None) -> dict:
     """
-    Récupère toutes les données de performance d'un farm
+    Récupère toutes les données de performance d'un farm (via le cache par farm)
 
     Returns:
         Dict with keys: actual_performances, target_performances, tariffs
     """
-    data = {}
+    return _cached_section(farm_uuid, "performance_data", _performance_data_reads, view)
 
-    # Get actual performances (by year)
-    data['actual_performances'] = execute_query(
-        "farm_actual_performances",
-        filters={"farm_uuid": farm_uuid},
-        order_by="year"
-    ) or []
 
-    # Get target performances (by year)
-    data['target_performances'] = execute_query(
-        "farm_target_performances",
-        filters={"farm_uuid": farm_uuid},
-        order_by="year"
-    ) or []
+def _performance_data_reads(farm_uuid: str, view: Optional[str] = None) -> SectionReads:
+    """Chargeur de la section performance_data"""
+    # Actual/target performances ordered by year, tariffs (1:many) by start date
+    projection = _projection(view)
+    tables = yield {
+        table: {
+            "table": table,
+            "columns": _select(projection, table),
+            "filters": {"farm_uuid": farm_uuid},
+            "order_by": order_column
+        }
+        for table, order_column in FARM_PERFORMANCE_TABLES.items()
+    }
+    return _build_performance_data(tables)
+
+
+def get_farms_actual_performances(farm_uuids: List[str], year_from: Optional[int] = None,
+                                  year_to: Optional[int] = None) -> Dict[str, List[dict]]:
+    """
+    Récupère les performances réelles de plusieurs farms sur une fenêtre d'années
+
+    Args:
+        farm_uuids: Liste des UUID de farms
+        year_from: Première année incluse (optionnelle)
+        year_to: Dernière année incluse (optionnelle)
+
+    Returns:
+        Dict {farm_uuid: [performances triées par année]}
+    """
+    filters: Dict[str, Any] = {"farm_uuid": list(farm_uuids)}
+    if year_from is not None and year_to is not None:
+        filters["year"] = between(year_from, year_to)
+    elif year_from is not None:
+        filters["year"] = gte(year_from)
+    elif year_to is not None:
+        filters["year"] = lte(year_to)
+
+    performances: Dict[str, List[dict]] = {farm_uuid: [] for farm_uuid in farm_uuids}
+    for row in execute_query("farm_actual_performances", filters=filters, order_by="year") or []:
+        performances[row['farm_uuid']].append(row)
+    return performances
+
+
+def get_expiring_om_contracts(end_until: str, end_from: Optional[str] = None) -> List[dict]:
+    """
+    Liste les contrats O&M arrivant à échéance au plus tard à une date donnée
+
+    Args:
+        end_until: Date de fin maximale incluse (YYYY-MM-DD)
+        end_from: Date de fin minimale incluse (YYYY-MM-DD, optionnelle)
 
-    # Get tariffs (1:many)
-    data['tariffs'] = execute_query(
-        "farm_tariffs",
-        filters={"farm_uuid": farm_uuid},
-        order_by="tariff_start_date"
+    Returns:
+        Contrats triés par date de fin
+    """
+    if end_from is not None:
+        window = between(end_from, end_until)
+    else:
+        window = lte(end_until)
+    return execute_query(
+        "farm_om_contracts",
+        filters={"contract_end_date": window},
+        order_by="contract_end_date"
     ) or []
 
+
+def get_all_farm_data(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """
+    Récupère TOUTES les données d'un farm en une seule fois
+
+    Passe par le bundle du backend (un seul aller-retour : UNION ALL sur SQLite,
+    ressources embarquées sur Supabase). En cas d'échec du bundle, retombe sur
+    les chargements section par section.
+
+    Args:
+        farm_uuid: UUID du farm
+        view: Vue ou groupe de vues affiché (ex. "farm_page"), None pour toutes les colonnes
+
+    Returns:
+        Dict with all farm data organized by category
+    """
+    cached = _all_cached_sections(farm_uuid, view)
+    if cached is not None:
+        return cached
+
+    bundle = db.get_farm_bundle(farm_uuid, _projection(view))
+    if bundle is None:
+        return {
+            'general_info': get_farm_general_info(farm_uuid, view),
+            'technical_details': get_farm_technical_details(farm_uuid, view),
+            'contracts_admin': get_farm_contracts_admin(farm_uuid, view),
+            'performance_data': get_farm_performance_data(farm_uuid, view)
+        }
+    return _cache_bundle_sections(farm_uuid, bundle, view)
+
+
+def _all_cached_sections(farm_uuid: str, view: Optional[str] = None) -> Optional[dict]:
+    """Retourne les 4 sections d'un farm si elles sont toutes en cache, None sinon"""
+    cached = {}
+    for section in SECTION_TABLES:
+        hit, value = _farm_cache.get(farm_uuid, section, view)
+        if not hit:
+            return None
+        cached[section] = value
+    return cached
+
+
+def _cache_bundle_sections(farm_uuid: str, bundle: Dict[str, List[dict]], view: Optional[str] = None) -> dict:
+    """Construit les 4 sections d'un farm à partir de son bundle et les met en cache"""
+    data = {
+        'general_info': _build_general_info(bundle),
+        'technical_details': _build_technical_details(bundle),
+        'contracts_admin': _build_contracts_admin(bundle),
+        'performance_data': _build_performance_data(bundle)
+    }
+    for section, value in data.items():
+        _farm_cache.put(farm_uuid, section, value, view)
     return data
 
 
-def get_all_farm_data(farm_uuid: str) -> dict:
+# ==================== Async Functions ====================
+# Versions asyncio de la façade, pour les appelants qui ont leur propre boucle
+# (callbacks async, scripts). Elles s'appuient sur le backend asynchrone adb
+# (client Supabase async, ou SQLite déporté dans des threads), partagent les
+# caches des fonctions synchrones et lancent les lectures indépendantes avec
+# asyncio.gather.
+
+async def _gather_queries(queries: Dict[str, dict]) -> Dict[str, Any]:
     """
-    Récupère TOUTES les données d'un farm en une seule fois
+    Exécute des aexecute_query indépendants simultanément
+
+    Args:
+        queries: Dict {clé: arguments nommés de execute_query}
+
+    Returns:
+        Dict {clé: résultat, None en cas d'erreur ou de délai dépassé (db_fanout_timeout)}
+    """
+    timeout = float(settings.get('db_fanout_timeout', 10))
+    keys = list(queries)
+    results = await asyncio.gather(
+        *(asyncio.wait_for(aexecute_query(**queries[key]), timeout) for key in keys),
+        return_exceptions=True
+    )
+
+    gathered = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logging.error(f"Async read {key} timed out after {timeout}s")
+            result = None
+        elif isinstance(result, Exception):
+            logging.error(f"Async read {key} failed: {result}")
+            result = None
+        gathered[key] = result
+    return gathered
+
+
+async def _aload(reads: SectionReads) -> Tuple[Any, bool]:
+    """
+    Exécute un chargeur de section sur le backend asynchrone
+
+    Le code du chargeur (projection, cache de référence, construction de la
+    section) peut lire le backend synchrone au premier appel : il avance dans
+    un thread, et chaque lot de lectures est lancé avec asyncio.gather.
+
+    Returns:
+        Tuple (section, complète), voir _load
+    """
+    results, complete = None, True
+    while True:
+        done, step = await asyncio.to_thread(_advance, reads, results)
+        if done:
+            return step, complete
+        results = await _gather_queries(step)
+        complete = complete and _complete(results)
+
+
+async def _acached_section(farm_uuid: str, section: str, reads: Callable[[str, Optional[str]], SectionReads],
+                           view: Optional[str] = None) -> dict:
+    """Sert une section depuis le cache par farm, ou la charge (async) et la mémorise"""
+    hit, value = _farm_cache.get(farm_uuid, section, view)
+    if hit:
+        return value
+
+    value, complete = await _aload(reads(farm_uuid, view))
+    if complete:
+        _farm_cache.put(farm_uuid, section, value, view)
+    return value
+
+
+@_facade_call("rpc")
+async def aexecute_rpc(function_name: str) -> Any:
+    """Version asynchrone de execute_rpc"""
+    if function_name == "get_table_stats":
+        return await asyncio.to_thread(get_table_stats)
+    return await adb.execute_rpc(function_name)
+
+
+@_facade_call("select")
+async def aexecute_query(table: str, columns: str = "*", filters: Optional[dict] = None,
+                         order_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> Any:
+    """
+    Version asynchrone de execute_query
+
+    Returns:
+        Query results or None on error (including unknown table/column names)
+    """
+    try:
+        # The first validation may load the catalogue from the backend
+        await asyncio.to_thread(_check_query, table, columns, filters, order_by)
+    except ValueError as e:
+        logging.error(f"Rejected query on {table}: {e}")
+        return None
+    return await adb.execute_query(table, columns, filters, order_by, limit, offset)
+
+
+async def aget_all_farms() -> List[dict]:
+    """Version asynchrone de get_all_farms"""
+    return await aexecute_query(
+        table="farms",
+        columns=_select(await asyncio.to_thread(_projection, "sidebar"), "farms"),
+        order_by="code"
+    ) or []
+
+
+async def aget_farm_by_code(farm_code: str) -> Optional[dict]:
+    """Version asynchrone de get_farm_by_code"""
+    return _first(await aexecute_query("farms", filters={"code": farm_code}))
+
+
+@_facade_call("update", payload_arg="data")
+async def aupdate_record(table: str, filters: dict, data: dict) -> Optional[int]:
+    """Version asynchrone de update_record (invalide les mêmes caches)"""
+    rows = await adb.update_record(table, filters, data)
+    _after_write(table, filters, data, rows)
+    return len(rows) if rows is not None else None
+
+
+@_facade_call("insert", payload_arg="data")
+async def ainsert_record(table: str, data: dict) -> Optional[dict]:
+    """Version asynchrone de insert_record (invalide les mêmes caches)"""
+    result = await adb.insert_record(table, data)
+    _after_write(table, None, data)
+    return result
+
+
+@_facade_call("delete", payload_arg="filters")
+async def adelete_record(table: str, filters: dict) -> Optional[int]:
+    """Version asynchrone de delete_record (invalide les mêmes caches)"""
+    rows = await adb.delete_record(table, filters)
+    _after_write(table, filters, None, rows)
+    return len(rows) if rows is not None else None
+
+
+async def _aget_role_assignments(link_table: str, farm_uuids: List[str]) -> Dict[str, Dict[str, dict]]:
+    """Version asynchrone de _get_role_assignments"""
+    if not farm_uuids:
+        return {}
+    return _role_mapping(farm_uuids, await adb.get_role_assignments(link_table, list(farm_uuids)))
+
+
+async def aget_farm_referents(farm_uuid: str) -> Dict[str, dict]:
+    """Version asynchrone de get_farm_referents"""
+    return (await _aget_role_assignments("farm_referents", [farm_uuid]))[farm_uuid]
+
+
+async def aget_farm_companies(farm_uuid: str) -> Dict[str, dict]:
+    """Version asynchrone de get_farm_companies"""
+    return (await _aget_role_assignments("farm_company_roles", [farm_uuid]))[farm_uuid]
+
+
+async def aget_farm_general_info(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """Version asynchrone de get_farm_general_info (via le cache par farm)"""
+    return await _acached_section(farm_uuid, "general_info", _general_info_reads, view)
+
+
+async def aget_farm_technical_details(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """Version asynchrone de get_farm_technical_details (via le cache par farm)"""
+    return await _acached_section(farm_uuid, "technical_details", _farm_technical_details_reads, view)
+
+
+async def aget_farm_contracts_admin(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """Version asynchrone de get_farm_contracts_admin (via le cache par farm)"""
+    return await _acached_section(farm_uuid, "contracts_admin", _contracts_admin_reads, view)
+
+
+async def aget_farm_performance_data(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """Version asynchrone de get_farm_performance_data (via le cache par farm)"""
+    return await _acached_section(farm_uuid, "performance_data", _performance_data_reads, view)
+
+
+async def aget_all_farm_data(farm_uuid: str, view: Optional[str] = None) -> dict:
+    """
+    Version asynchrone de get_all_farm_data
+
+    Un seul aller-retour via le bundle du backend ; en cas d'échec, les quatre
+    sections sont chargées simultanément.
 
     Returns:
         Dict with all farm data organized by category
     """
-    return {
-        'general_info': get_farm_general_info(farm_uuid),
-        'technical_details': get_farm_technical_details(farm_uuid),
-        'contracts_admin': get_farm_contracts_admin(farm_uuid),
-        'performance_data': get_farm_performance_data(farm_uuid)
-    }
\ No newline at end of file
+    cached = _all_cached_sections(farm_uuid, view)
+    if cached is not None:
+        return cached
+
+    bundle = await adb.get_farm_bundle(farm_uuid, await asyncio.to_thread(_projection, view))
+    if bundle is None:
+        sections = await asyncio.gather(
+            aget_farm_general_info(farm_uuid, view),
+            aget_farm_technical_details(farm_uuid, view),
+            aget_farm_contracts_admin(farm_uuid, view),
+            aget_farm_performance_data(farm_uuid, view)
+        )
+        return dict(zip(SECTION_TABLES, sections))
+    return _cache_bundle_sections(farm_uuid, bundle, view)